@@ -0,0 +1,121 @@
+import sqlite3
+from typing import List, Optional
+
+
+AIG_HASH_COLUMNS = [
+    ("benchmark", "TEXT NOT NULL"),
+    ("miter", "TEXT NOT NULL"),
+    ("structural_hash", "TEXT NOT NULL"),
+    ("aiger_path", "TEXT"),
+    ("inputs", "INTEGER"),
+    ("latches", "INTEGER"),
+    ("ands", "INTEGER"),
+    ("duplicate_of", "TEXT"),
+    ("dropped", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+
+class AigDedupeIndex:
+    """
+    sqlite index of the structural hashes of the miter AIGs, one row per
+    benchmark and miter in aig_hashes. The first miter registered with a
+    hash represents it, the later ones are its duplicates. The corpus
+    workers share one database file, writes wait for the lock.
+    """
+
+    def __init__(self, db_path:str, timeout_s:float = 60.0):
+        if not isinstance(db_path, str):
+            raise TypeError(f"expected str but got {type(db_path)}")
+        if db_path == "":
+            raise ValueError("db_path cannot be empty")
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, timeout=timeout_s)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS aig_hashes (" +
+                ", ".join(f"{name} {sql_type}" for name, sql_type in AIG_HASH_COLUMNS) +
+                ", PRIMARY KEY (benchmark, miter))")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS aig_hashes_by_hash ON aig_hashes (structural_hash)")
+
+    def close(self):
+        self.connection.close()
+
+    def register(self, structural_hash:str, benchmark:str, miter:str, aiger_path:Optional[str] = None,
+                 stats:Optional[dict] = None, drop_duplicate:bool = False) -> Optional[dict]:
+        """
+        Insert or update the hash of one miter and look up its representative.
+        A miter registered again keeps its place, so a re-run benchmark does
+        not become a duplicate of itself.
+
+        Args:
+            structural_hash: Aiger.structural_hash() of the miter
+            benchmark: Benchmark name, e.g. seed_7
+            miter: Miter name, e.g. miter_1_2
+            aiger_path: Path to the AIGER file
+            stats: Optional Aiger.get_stats() giving the size columns
+            drop_duplicate: Record that the miter is dropped when it is a duplicate
+
+        Returns:
+            dict: Row of the representative, None if the miter is the first with its hash
+        """
+        stats = stats or {}
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO aig_hashes (benchmark, miter, structural_hash, aiger_path, inputs, latches, ands) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (benchmark, miter) DO UPDATE SET "
+                "structural_hash = excluded.structural_hash, aiger_path = excluded.aiger_path, "
+                "inputs = excluded.inputs, latches = excluded.latches, ands = excluded.ands",
+                (benchmark, miter, structural_hash, aiger_path,
+                 stats.get("inputs"), stats.get("latches"), stats.get("ands")))
+            first = dict(self.connection.execute(
+                "SELECT * FROM aig_hashes WHERE structural_hash = ? ORDER BY rowid LIMIT 1",
+                (structural_hash,)).fetchone())
+            representative = None if (first["benchmark"], first["miter"]) == (benchmark, miter) else first
+            self.connection.execute(
+                "UPDATE aig_hashes SET duplicate_of = ?, dropped = ? WHERE benchmark = ? AND miter = ?",
+                (None if representative is None else f"{first['benchmark']}/{first['miter']}",
+                 int(representative is not None and drop_duplicate), benchmark, miter))
+        return representative
+
+    def query(self, where:str = "", params:tuple = ()) -> List[dict]:
+        """
+        Select aig_hashes rows in registration order.
+        """
+        sql = "SELECT * FROM aig_hashes"
+        if where != "":
+            sql += f" WHERE {where}"
+        return [dict(row) for row in self.connection.execute(sql + " ORDER BY rowid", params)]
+
+    def get_clusters(self) -> List[dict]:
+        """
+        Get the clusters of miters sharing a structural hash, largest first.
+
+        Returns:
+            list: One dict per hash with more than one miter: the hash, the
+                  member count and the member rows, representative first
+        """
+        clusters = []
+        for row in self.connection.execute(
+                "SELECT structural_hash, COUNT(*) AS count FROM aig_hashes GROUP BY structural_hash "
+                "HAVING COUNT(*) > 1 ORDER BY count DESC, MIN(rowid)"):
+            clusters.append({"structural_hash": row["structural_hash"], "count": row["count"],
+                             "members": self.query("structural_hash = ?", (row["structural_hash"],))})
+        return clusters
+
+    def get_report(self) -> dict:
+        """
+        Get the duplicate cluster report of the whole index.
+        """
+        clusters = self.get_clusters()
+        miter_count, hash_count = self.connection.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT structural_hash) FROM aig_hashes").fetchone()
+        return {
+            "miters": miter_count,
+            "unique": hash_count,
+            "duplicates": miter_count - hash_count,
+            "dropped": self.connection.execute("SELECT COUNT(*) FROM aig_hashes WHERE dropped = 1").fetchone()[0],
+            "clusters": clusters,
+        }
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Bit-parallel random simulation of an AIG, to pre-screen miters before the
+model checking: every bit of a uint64 word is one stimulus stream, and the
+ANDs are evaluated one logic level at a time with vectorized NumPy ops.
+
+    python aig_simulator.py miter_screen.aig --cycles 200 --unsafe unsafe_signal --valid both_valid
+"""
+
+import sys
+import json
+import argparse
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+import numpy as np
+
+from aiger import Aiger, LATCH_UNINITIALIZED, read_aiger
+
+
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+@dataclass
+class SimulationReport:
+    cycles : int
+    streams : int
+    # first cycle the unsafe literal is 1 in any stream, None if it never is
+    first_failing_cycle : Optional[int] = None
+    failing_streams : int = 0
+    # first cycle the valid literal is 1 in any stream and the fraction of
+    # streams where it was 1 at least once, None without a valid literal
+    first_valid_cycle : Optional[int] = None
+    valid_reached_fraction : Optional[float] = None
+
+    @property
+    def failed(self):
+        return self.first_failing_cycle is not None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+class AigSimulator:
+    """
+    Simulates 64 * word_count random stimulus streams of an AIG at once.
+    Inputs are drawn fresh every cycle, latches start at their init value,
+    or at a random value when uninitialized.
+    """
+
+    def __init__(self, aig:Aiger, word_count:int = 1, seed:int = 0):
+        if not isinstance(aig, Aiger):
+            raise TypeError(f"expected Aiger but got {type(aig)}")
+        if word_count < 1:
+            raise ValueError(f"illegal word count {word_count}")
+        self.aig = aig
+        self.word_count = word_count
+        self.seed = seed
+        self.level_list = self._levelize()
+
+    def _levelize(self):
+        # per logic level: lhs vars, rhs vars and their complement masks
+        and_count = len(self.aig.ands)
+        if and_count == 0:
+            return []
+        lhs_vars = (self.aig.ands[:, 0] >> 1).tolist()
+        rhs0 = self.aig.ands[:, 1].tolist()
+        rhs1 = self.aig.ands[:, 2].tolist()
+        level_by_var = [0] * (self.aig.max_var + 1)
+        and_levels = np.zeros(and_count, dtype=np.int64)
+        for i in self.aig._topological_and_order().tolist():
+            level = 1 + max(level_by_var[rhs0[i] >> 1], level_by_var[rhs1[i] >> 1])
+            level_by_var[lhs_vars[i]] = level
+            and_levels[i] = level
+        level_list = []
+        order = np.argsort(and_levels, kind="stable")
+        boundaries = np.flatnonzero(np.diff(and_levels[order])) + 1
+        for indices in np.split(order, boundaries):
+            ands = self.aig.ands[indices]
+            level_list.append((
+                ands[:, 0] >> 1,
+                ands[:, 1] >> 1, np.where(ands[:, 1] & 1, _ALL_ONES, np.uint64(0))[:, None],
+                ands[:, 2] >> 1, np.where(ands[:, 2] & 1, _ALL_ONES, np.uint64(0))[:, None],
+            ))
+        return level_list
+
+    def _literal_words(self, values, literal:int):
+        words = values[literal >> 1]
+        return ~words if literal & 1 else words
+
+    def run(self, cycles:int, unsafe_literal:int, valid_literal:Optional[int] = None,
+            stop_on_failure:bool = True) -> SimulationReport:
+        """
+        Simulate the streams for a number of cycles.
+
+        Args:
+            cycles: Number of clock cycles
+            unsafe_literal: Literal that must stay 0, the miter output
+            valid_literal: Optional literal whose reaching 1 is measured
+            stop_on_failure: Stop at the first cycle the unsafe literal is 1
+
+        Returns:
+            SimulationReport: First failing cycle and valid coverage
+        """
+        if cycles < 1:
+            raise ValueError(f"illegal cycle count {cycles}")
+        aig = self.aig
+        rng = np.random.default_rng(self.seed)
+        values = np.zeros((aig.max_var + 1, self.word_count), dtype=np.uint64)
+        latch_vars = aig.latches[:, 0] >> 1
+        init_words = np.where(aig.latch_init == 1, _ALL_ONES, np.uint64(0))[:, None]
+        values[latch_vars] = np.broadcast_to(init_words, (len(latch_vars), self.word_count))
+        uninitialized = aig.latch_init == LATCH_UNINITIALIZED
+        values[latch_vars[uninitialized]] = rng.integers(
+            0, 2 ** 64, size=(int(uninitialized.sum()), self.word_count), dtype=np.uint64)
+        input_vars = aig.inputs >> 1
+        next_literals = aig.latches[:, 1]
+        next_masks = np.where(next_literals & 1, _ALL_ONES, np.uint64(0))[:, None]
+
+        report = SimulationReport(cycles=0, streams=64 * self.word_count)
+        failing = np.zeros(self.word_count, dtype=np.uint64)
+        valid_seen = np.zeros(self.word_count, dtype=np.uint64)
+        for cycle in range(cycles):
+            values[input_vars] = rng.integers(0, 2 ** 64, size=(len(input_vars), self.word_count),
+                                              dtype=np.uint64)
+            for lhs_vars, rhs0_vars, rhs0_masks, rhs1_vars, rhs1_masks in self.level_list:
+                values[lhs_vars] = (values[rhs0_vars] ^ rhs0_masks) & (values[rhs1_vars] ^ rhs1_masks)
+            report.cycles = cycle + 1
+
+            unsafe_words = self._literal_words(values, unsafe_literal)
+            if report.first_failing_cycle is None and np.any(unsafe_words):
+                report.first_failing_cycle = cycle
+            failing |= unsafe_words
+            if valid_literal is not None:
+                valid_words = self._literal_words(values, valid_literal)
+                if report.first_valid_cycle is None and np.any(valid_words):
+                    report.first_valid_cycle = cycle
+                valid_seen |= valid_words
+            if stop_on_failure and report.failed:
+                break
+
+            values[latch_vars] = values[next_literals >> 1] ^ next_masks
+
+        report.failing_streams = int(sum(bin(int(word)).count("1") for word in failing))
+        if valid_literal is not None:
+            report.valid_reached_fraction = sum(bin(int(word)).count("1") for word in valid_seen) / report.streams
+        return report
+
+
+def find_output_literal(aig:Aiger, name:str) -> int:
+    """
+    Get the literal of the output named name in the symbol table.
+    """
+    for (section, position), symbol in aig.symbols.items():
+        if section == "o" and symbol == name:
+            return int(aig.outputs[position])
+    raise ValueError(f"no output named {name} in the AIGER symbols")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bit-parallel random simulation of an AIGER file")
+    parser.add_argument("aiger_file")
+    parser.add_argument("--cycles", type=int, default=100)
+    parser.add_argument("--words", type=int, default=1, help="Number of 64-stream words (default: 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--unsafe", type=str, default=None,
+                        help="Name of the output that must stay 0 (default: the first bad or output)")
+    parser.add_argument("--valid", type=str, default=None, help="Name of the output whose reaching 1 is measured")
+    args = parser.parse_args()
+
+    aig = read_aiger(args.aiger_file)
+    if args.unsafe is not None:
+        unsafe_literal = find_output_literal(aig, args.unsafe)
+    else:
+        unsafe_literal = int(aig.bad[0] if len(aig.bad) else aig.outputs[0])
+    valid_literal = None if args.valid is None else find_output_literal(aig, args.valid)
+    report = AigSimulator(aig, word_count=args.words, seed=args.seed).run(args.cycles, unsafe_literal, valid_literal)
+    print(json.dumps(report.to_dict(), sort_keys=True))
+    return 1 if report.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
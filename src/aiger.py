@@ -0,0 +1,695 @@
+#!/usr/bin/env python3
+"""
+Reading, writing and statistics of AIGER files (format 1.9, binary "aig"
+and ascii "aag"), without yosys or ABC.
+
+An AIG is held as NumPy literal arrays: literal 2*v is variable v, 2*v+1
+its negation, 0 and 1 are the constants. The AND gates of a binary file are
+decoded in one vectorized pass over a memory map of the file.
+
+    python aiger.py stats miter.aig
+    python aiger.py canonicalize miter.aig miter_canonical.aig
+    python aiger.py reduce miter.aig miter_reduced.aig
+    python aiger.py hash miter.aig --map miter.aig.map
+"""
+
+import os
+import sys
+import json
+import mmap
+import hashlib
+import argparse
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+# init value of a latch without a reset value, its own literal in the file
+LATCH_UNINITIALIZED = -1
+
+
+@dataclass
+class AigerHeader:
+    """
+    The header line of an AIGER file, "aig M I L O A [B C J F]" for the
+    binary format and "aag ..." for the ascii one.
+    """
+    is_ascii : bool
+    max_var : int
+    inputs : int
+    latches : int
+    outputs : int
+    ands : int
+    bad : int = 0
+    constraints : int = 0
+    justice : int = 0
+    fairness : int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _parse_header(header_line:str, file_path:str) -> AigerHeader:
+    tokens = header_line.split()
+    if len(tokens) < 6 or tokens[0] not in ("aig", "aag") or len(tokens) > 10:
+        raise ValueError(f"illegal AIGER header in {file_path}: {header_line.strip()!r}")
+    try:
+        counts = [int(token) for token in tokens[1:]]
+    except ValueError:
+        raise ValueError(f"illegal AIGER header in {file_path}: {header_line.strip()!r}")
+    if any(count < 0 for count in counts):
+        raise ValueError(f"illegal AIGER header in {file_path}: {header_line.strip()!r}")
+    return AigerHeader(tokens[0] == "aag", *counts)
+
+
+def read_aiger_header(file_path:str) -> AigerHeader:
+    """
+    Read the header of an AIGER file, without reading the graph.
+
+    Args:
+        file_path: Path to the .aig or .aag file
+
+    Returns:
+        AigerHeader: the counts of the header
+    """
+    with open(file_path, "rb") as f:
+        header_line = f.readline(1024).decode("ascii", errors="replace")
+    return _parse_header(header_line, file_path)
+
+
+@dataclass
+class Aiger:
+    """
+    An and-inverter graph with the sections of AIGER 1.9.
+
+    inputs, outputs, bad, constraints and fairness are literal arrays,
+    latches is (L, 2) of current and next literal with latch_init 0, 1 or
+    LATCH_UNINITIALIZED, ands is (A, 3) of lhs, rhs0 and rhs1 literals.
+    Symbols are keyed on (section, position), section one of i l o b c j f.
+    """
+    max_var : int
+    inputs : np.ndarray
+    latches : np.ndarray
+    latch_init : np.ndarray
+    outputs : np.ndarray
+    ands : np.ndarray
+    bad : np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    constraints : np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    justice : List[np.ndarray] = field(default_factory=list)
+    fairness : np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    symbols : Dict[Tuple[str, int], str] = field(default_factory=dict)
+    comments : List[str] = field(default_factory=list)
+
+    def get_root_literals(self) -> np.ndarray:
+        """
+        Literals the properties and latches depend on, in file order.
+        """
+        return np.concatenate([self.latches[:, 1], self.outputs, self.bad, self.constraints] +
+                              list(self.justice) + [self.fairness]).astype(np.int64)
+
+    def is_binary_ordered(self) -> bool:
+        """
+        Whether the numbering is the one of the binary format: inputs, then
+        latches, then ANDs with rising lhs and lhs > rhs0 >= rhs1.
+        """
+        input_count, latch_count, and_count = len(self.inputs), len(self.latches), len(self.ands)
+        if self.max_var != input_count + latch_count + and_count:
+            return False
+        expected = 2 * np.arange(1, self.max_var + 1, dtype=np.int64)
+        return bool(np.array_equal(self.inputs, expected[:input_count]) and
+                    np.array_equal(self.latches[:, 0], expected[input_count:input_count + latch_count]) and
+                    np.array_equal(self.ands[:, 0], expected[input_count + latch_count:]) and
+                    np.all(self.ands[:, 0] > self.ands[:, 1]) and
+                    np.all(self.ands[:, 1] >= self.ands[:, 2]))
+
+    def _topological_and_order(self) -> np.ndarray:
+        # AND indices with every AND after the ANDs it reads
+        if len(self.ands) == 0 or (np.all(np.diff(self.ands[:, 0]) > 0) and
+                                   np.all(self.ands[:, 0] > self.ands[:, 1]) and
+                                   np.all(self.ands[:, 0] > self.ands[:, 2])):
+            return np.arange(len(self.ands))
+        and_index_by_var = {int(lhs) >> 1: i for i, lhs in enumerate(self.ands[:, 0])}
+        and_rhs = self.ands[:, 1:].tolist()
+        order = []
+        # 0 not visited, 1 on the stack, 2 done
+        state = [0] * len(self.ands)
+        for start in range(len(self.ands)):
+            stack = [start]
+            while stack:
+                i = stack[-1]
+                if state[i] == 2:
+                    stack.pop()
+                    continue
+                if state[i] == 1:
+                    stack.pop()
+                    state[i] = 2
+                    order.append(i)
+                    continue
+                state[i] = 1
+                for rhs in and_rhs[i]:
+                    j = and_index_by_var.get(rhs >> 1)
+                    if j is not None and state[j] == 1:
+                        raise ValueError("the AIGER ANDs form a cycle")
+                    if j is not None and state[j] == 0:
+                        stack.append(j)
+        return np.array(order, dtype=np.int64)
+
+    def get_depth(self) -> int:
+        """
+        Number of ANDs on the longest path from an input, latch or constant
+        to a root.
+        """
+        if len(self.ands) == 0:
+            return 0
+        level = np.zeros(self.max_var + 1, dtype=np.int64)
+        lhs_vars = (self.ands[:, 0] >> 1).tolist()
+        rhs0_vars = (self.ands[:, 1] >> 1).tolist()
+        rhs1_vars = (self.ands[:, 2] >> 1).tolist()
+        level_list = level.tolist()
+        for i in self._topological_and_order().tolist():
+            level_list[lhs_vars[i]] = 1 + max(level_list[rhs0_vars[i]], level_list[rhs1_vars[i]])
+        level = np.array(level_list, dtype=np.int64)
+        root_vars = self.get_root_literals() >> 1
+        return int(level[root_vars].max()) if len(root_vars) else 0
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: Section sizes, logic depth and latch init value counts
+        """
+        return {
+            "max_var": int(self.max_var),
+            "inputs": len(self.inputs),
+            "latches": len(self.latches),
+            "outputs": len(self.outputs),
+            "ands": len(self.ands),
+            "bad": len(self.bad),
+            "constraints": len(self.constraints),
+            "justice": len(self.justice),
+            "fairness": len(self.fairness),
+            "depth": self.get_depth(),
+            "latch_init": {
+                "zero": int(np.count_nonzero(self.latch_init == 0)),
+                "one": int(np.count_nonzero(self.latch_init == 1)),
+                "uninitialized": int(np.count_nonzero(self.latch_init == LATCH_UNINITIALIZED)),
+            },
+        }
+
+    def canonical(self) -> "Aiger":
+        """
+        Re-encode in binary order: inputs and latches keep their positions,
+        the ANDs reachable from the roots are numbered in depth-first
+        post-order of the roots in file order, unreachable ANDs are dropped.
+        Symbols and comments are dropped, two files of the same graph
+        written by different tools or runs encode to the same bytes.
+
+        Returns:
+            Aiger: The re-encoded graph
+        """
+        input_count, latch_count = len(self.inputs), len(self.latches)
+        var_map = np.full(self.max_var + 1, -1, dtype=np.int64)
+        var_map[0] = 0
+        var_map[self.inputs >> 1] = np.arange(1, input_count + 1)
+        var_map[self.latches[:, 0] >> 1] = np.arange(input_count + 1, input_count + latch_count + 1)
+
+        and_index_by_var = {int(lhs) >> 1: i for i, lhs in enumerate(self.ands[:, 0])}
+        and_rhs = self.ands[:, 1:].tolist()
+        var_map_list = var_map.tolist()
+        next_var = input_count + latch_count + 1
+        new_ands = []
+        for root in self.get_root_literals().tolist():
+            if var_map_list[root >> 1] != -1:
+                continue
+            if root >> 1 not in and_index_by_var:
+                raise ValueError(f"literal {root} is not an input, latch or AND")
+            stack = [(and_index_by_var[root >> 1], False)]
+            while stack:
+                i, children_done = stack.pop()
+                lhs_var = int(self.ands[i, 0]) >> 1
+                if var_map_list[lhs_var] != -1:
+                    continue
+                if not children_done:
+                    stack.append((i, True))
+                    # the lower fanin first, so that re-encoding twice changes nothing
+                    for rhs in sorted(and_rhs[i], reverse=True):
+                        if var_map_list[rhs >> 1] == -1:
+                            if rhs >> 1 not in and_index_by_var:
+                                raise ValueError(f"literal {rhs} is not an input, latch or AND")
+                            stack.append((and_index_by_var[rhs >> 1], False))
+                    continue
+                var_map_list[lhs_var] = next_var
+                rhs0, rhs1 = [2 * var_map_list[rhs >> 1] | (rhs & 1) for rhs in and_rhs[i]]
+                new_ands.append((2 * next_var, max(rhs0, rhs1), min(rhs0, rhs1)))
+                next_var += 1
+        var_map = np.array(var_map_list, dtype=np.int64)
+
+        def remap(literals):
+            literals = np.asarray(literals, dtype=np.int64)
+            return 2 * var_map[literals >> 1] | (literals & 1)
+
+        return Aiger(
+            max_var=next_var - 1,
+            inputs=remap(self.inputs),
+            latches=np.stack([remap(self.latches[:, 0]), remap(self.latches[:, 1])], axis=1)
+            if latch_count else np.zeros((0, 2), dtype=np.int64),
+            latch_init=self.latch_init.copy(),
+            outputs=remap(self.outputs),
+            ands=np.array(new_ands, dtype=np.int64).reshape(-1, 3),
+            bad=remap(self.bad),
+            constraints=remap(self.constraints),
+            justice=[remap(j) for j in self.justice],
+            fairness=remap(self.fairness),
+        )
+
+
+    def get_size(self) -> dict:
+        return {"inputs": len(self.inputs), "latches": len(self.latches), "ands": len(self.ands),
+                "outputs": len(self.outputs), "bad": len(self.bad)}
+
+    def reduce(self, keep_inputs:bool = False):
+        """
+        Reduce the graph to what the outputs and properties depend on:
+        constants are propagated through the ANDs and through latches that
+        keep their init value, structurally equal ANDs are merged, ANDs,
+        latches and (unless keep_inputs) inputs outside the cone of influence
+        of the outputs, bad, constraint, justice and fairness literals are
+        removed and the result is re-encoded like canonical(). The symbols of
+        what is kept stay with it, the comments are dropped.
+
+        Args:
+            keep_inputs: Keep every input, so that input traces of the
+                         original graph stay valid
+
+        Returns:
+            tuple: (the reduced Aiger, report with the sizes before and after)
+        """
+        and_order = self._topological_and_order().tolist()
+        and_rows = self.ands.tolist()
+        latch_rows = self.latches.tolist()
+        latch_init = self.latch_init.tolist()
+
+        # latch var -> constant literal, found until nothing changes
+        constant_latches = {}
+        while True:
+            # var -> literal replacing it, fanins of the kept ANDs
+            replacement = [2 * var for var in range(self.max_var + 1)]
+            for var, literal in constant_latches.items():
+                replacement[var] = literal
+            and_fanins = {}
+            strash = {}
+            for i in and_order:
+                lhs, rhs0, rhs1 = and_rows[i]
+                a = replacement[rhs0 >> 1] ^ (rhs0 & 1)
+                b = replacement[rhs1 >> 1] ^ (rhs1 & 1)
+                if a > b:
+                    a, b = b, a
+                if a == 0 or a == b ^ 1:
+                    literal = 0
+                elif a == 1 or a == b:
+                    literal = b
+                elif (a, b) in strash:
+                    literal = strash[(a, b)]
+                else:
+                    literal = strash[(a, b)] = lhs
+                    and_fanins[lhs >> 1] = (a, b)
+                replacement[lhs >> 1] = literal
+            new_constants = {}
+            for (cur, nxt), init in zip(latch_rows, latch_init):
+                if init == LATCH_UNINITIALIZED or cur >> 1 in constant_latches:
+                    continue
+                next_literal = replacement[nxt >> 1] ^ (nxt & 1)
+                # the latch never leaves its init value
+                if next_literal in (init, cur):
+                    new_constants[cur >> 1] = init
+            if not new_constants:
+                break
+            constant_latches.update(new_constants)
+
+        def substitute(literals):
+            return np.array([replacement[literal >> 1] ^ (literal & 1) for literal in literals.tolist()],
+                            dtype=np.int64)
+
+        outputs, bad = substitute(self.outputs), substitute(self.bad)
+        constraints, fairness = substitute(self.constraints), substitute(self.fairness)
+        justice = [substitute(j) for j in self.justice]
+
+        # cone of influence, through the AND fanins and the next state of latches
+        latch_next_by_var = {cur >> 1: replacement[nxt >> 1] ^ (nxt & 1) for cur, nxt in latch_rows
+                             if cur >> 1 not in constant_latches}
+        reached = set()
+        stack = [int(literal) >> 1 for literal in np.concatenate([outputs, bad, constraints, fairness] + justice)]
+        while stack:
+            var = stack.pop()
+            if var in reached:
+                continue
+            reached.add(var)
+            if var in and_fanins:
+                stack.extend(literal >> 1 for literal in and_fanins[var])
+            elif var in latch_next_by_var:
+                stack.append(latch_next_by_var[var] >> 1)
+
+        kept_inputs = [i for i, literal in enumerate(self.inputs.tolist()) if keep_inputs or literal >> 1 in reached]
+        kept_latches = [i for i, (cur, _) in enumerate(latch_rows) if cur >> 1 in reached]
+        reduced = Aiger(
+            max_var=self.max_var,
+            inputs=self.inputs[kept_inputs],
+            latches=np.array([[latch_rows[i][0], latch_next_by_var[latch_rows[i][0] >> 1]] for i in kept_latches],
+                             dtype=np.int64).reshape(-1, 2),
+            latch_init=self.latch_init[kept_latches],
+            outputs=outputs,
+            ands=np.array([(2 * var, b, a) for var, (a, b) in and_fanins.items()], dtype=np.int64).reshape(-1, 3),
+            bad=bad,
+            constraints=constraints,
+            justice=justice,
+            fairness=fairness,
+        ).canonical()
+        position_maps = {"i": {old: new for new, old in enumerate(kept_inputs)},
+                         "l": {old: new for new, old in enumerate(kept_latches)}}
+        for (section, position), name in self.symbols.items():
+            if section not in position_maps:
+                reduced.symbols[(section, position)] = name
+            elif position in position_maps[section]:
+                reduced.symbols[(section, position_maps[section][position])] = name
+
+        report = {
+            "before": self.get_size(),
+            "after": reduced.get_size(),
+            "constant_latches": len(constant_latches),
+        }
+        return reduced, report
+
+    def structural_hash(self) -> str:
+        """
+        Hash of the structure of the reduced graph, the same for AIGs that
+        only differ in the numbering of their ANDs, inputs and latches, in
+        the order of the fanins of an AND, or in logic outside the cone of
+        influence. Inputs and latches are keyed by their symbol, so that two
+        miters are matched port by port, and by position when unnamed.
+
+        Returns:
+            str: Hex digest
+        """
+        reduced, _ = self.reduce()
+
+        def digest(*parts):
+            return hashlib.blake2b(b"\0".join(parts), digest_size=16).digest()
+
+        node_digests = [b""] * (reduced.max_var + 1)
+        node_digests[0] = digest(b"const")
+        for position, literal in enumerate(reduced.inputs.tolist()):
+            name = reduced.symbols.get(("i", position), f"#{position}")
+            node_digests[literal >> 1] = digest(b"i", name.encode())
+        for position, ((cur, _), init) in enumerate(zip(reduced.latches.tolist(), reduced.latch_init.tolist())):
+            name = reduced.symbols.get(("l", position), f"#{position}")
+            node_digests[cur >> 1] = digest(b"l", name.encode(), str(init).encode())
+
+        def literal_digest(literal):
+            return node_digests[literal >> 1] + (b"1" if literal & 1 else b"0")
+
+        # canonical() leaves the ANDs in topological order
+        for lhs, rhs0, rhs1 in reduced.ands.tolist():
+            node_digests[lhs >> 1] = digest(b"a", *sorted((literal_digest(rhs0), literal_digest(rhs1))))
+
+        graph = hashlib.blake2b(digest_size=16)
+        # the latches are matched by their own digest, not by their position
+        for latch in sorted(literal_digest(cur) + literal_digest(nxt) for cur, nxt in reduced.latches.tolist()):
+            graph.update(b"l" + latch)
+        sections = [("o", reduced.outputs), ("b", reduced.bad), ("c", reduced.constraints),
+                    ("f", reduced.fairness)] + [("j", j) for j in reduced.justice]
+        for section, literals in sections:
+            graph.update(f"{section}{len(literals)}".encode())
+            for literal in literals.tolist():
+                graph.update(literal_digest(literal))
+        return graph.hexdigest()
+
+
+def _decode_varints(data:np.ndarray, count:int):
+    # the first count LEB128 numbers of data and the number of bytes they use
+    if count == 0:
+        return np.zeros(0, dtype=np.int64), 0
+    end_positions = np.flatnonzero(data < 0x80)[:count]
+    if len(end_positions) < count:
+        raise ValueError("truncated AND section in binary AIGER")
+    used = int(end_positions[-1]) + 1
+    data = data[:used].astype(np.int64)
+    start_positions = np.concatenate([[0], end_positions[:-1] + 1])
+    shifts = 7 * (np.arange(used) - np.repeat(start_positions, end_positions - start_positions + 1))
+    return np.add.reduceat((data & 0x7f) << shifts, start_positions), used
+
+
+def _encode_varints(values:np.ndarray) -> bytes:
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) == 0:
+        return b""
+    byte_counts = np.ones(len(values), dtype=np.int64)
+    remaining = values >> 7
+    while np.any(remaining):
+        byte_counts += remaining > 0
+        remaining >>= 7
+    offsets = np.cumsum(byte_counts) - byte_counts
+    out = np.zeros(int(byte_counts.sum()), dtype=np.uint8)
+    for k in range(int(byte_counts.max())):
+        mask = byte_counts > k
+        chunk = (values[mask] >> (7 * k)) & 0x7f
+        out[offsets[mask] + k] = chunk | np.where(byte_counts[mask] > k + 1, 0x80, 0)
+    return out.tobytes()
+
+
+def _int_lines(lines:List[bytes], file_path:str, width:int = None):
+    try:
+        rows = [[int(token) for token in line.split()] for line in lines]
+    except ValueError:
+        raise ValueError(f"illegal literal line in {file_path}")
+    if width is not None and any(len(row) != width for row in rows):
+        raise ValueError(f"expected {width} literals per line in {file_path}")
+    return rows
+
+
+def _latch_arrays(latch_rows, file_path):
+    # rows of cur, next [, init] literals to the latch and latch_init arrays
+    latches = np.array([row[:2] for row in latch_rows], dtype=np.int64).reshape(-1, 2)
+    latch_init = np.zeros(len(latch_rows), dtype=np.int64)
+    for i, row in enumerate(latch_rows):
+        if len(row) not in (2, 3):
+            raise ValueError(f"illegal latch line in {file_path}")
+        if len(row) == 3:
+            if row[2] == row[0]:
+                latch_init[i] = LATCH_UNINITIALIZED
+            elif row[2] in (0, 1):
+                latch_init[i] = row[2]
+            else:
+                raise ValueError(f"illegal latch init {row[2]} in {file_path}")
+    return latches, latch_init
+
+
+def _parse_symbols(lines:List[bytes]):
+    symbols, comments = {}, []
+    for i, line in enumerate(lines):
+        text = line.decode("utf-8", errors="replace")
+        if text.rstrip("\r\n") == "c":
+            comments = [l.decode("utf-8", errors="replace").rstrip("\n") for l in lines[i + 1:]]
+            break
+        position, _, name = text.rstrip("\n").partition(" ")
+        if len(position) >= 2 and position[0] in "ilobcjf" and position[1:].isdigit():
+            symbols[(position[0], int(position[1:]))] = name
+    return symbols, comments
+
+
+def read_aiger_map(file_path:str) -> Dict[Tuple[str, int], str]:
+    """
+    Read the map file written by yosys "write_aiger -map", with lines
+    "<input|output|latch> <position> <bit> <wire>", as AIGER symbols
+    named "<wire>[<bit>]". The init inputs of -zinit, lines
+    "init <input position> <bit> <latch wire>", are named
+    "init:<wire>[<bit>]" after the latch they initialize, so that they are
+    matched by latch name and not by position.
+
+    Returns:
+        dict: (section, position) -> name, like Aiger.symbols
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"AIGER map file {file_path} does not exist")
+    symbols = {}
+    with open(file_path, "r") as f:
+        for line in f:
+            fields = line.strip().split(maxsplit=3)
+            if len(fields) != 4 or fields[0] not in ("input", "output", "latch", "init"):
+                continue
+            kind, position, bit, name = fields
+            if kind == "init":
+                symbols[("i", int(position))] = f"init:{name}[{bit}]"
+            else:
+                symbols[(kind[0], int(position))] = f"{name}[{bit}]"
+    return symbols
+
+
+def read_aiger(file_path:str) -> Aiger:
+    """
+    Read a binary or ascii AIGER file. A binary file is read through a
+    memory map and its ANDs are decoded without a Python loop.
+
+    Args:
+        file_path: Path to the .aig or .aag file
+
+    Returns:
+        Aiger: The graph
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"AIGER file not found: {file_path}")
+    header = read_aiger_header(file_path)
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mm.readline()
+
+        def read_lines(count):
+            lines = [mm.readline() for _ in range(count)]
+            if count and not lines[-1].endswith(b"\n"):
+                raise ValueError(f"truncated AIGER file {file_path}")
+            return lines
+
+        if header.is_ascii:
+            inputs = np.array([row[0] for row in _int_lines(read_lines(header.inputs), file_path, 1)],
+                              dtype=np.int64)
+            latches, latch_init = _latch_arrays(_int_lines(read_lines(header.latches), file_path), file_path)
+        else:
+            inputs = 2 * np.arange(1, header.inputs + 1, dtype=np.int64)
+            latch_rows = _int_lines(read_lines(header.latches), file_path)
+            latch_rows = [[2 * (header.inputs + i + 1)] + row for i, row in enumerate(latch_rows)]
+            latches, latch_init = _latch_arrays(latch_rows, file_path)
+
+        def read_literals(count):
+            return np.array([row[0] for row in _int_lines(read_lines(count), file_path, 1)], dtype=np.int64)
+
+        outputs = read_literals(header.outputs)
+        bad = read_literals(header.bad)
+        constraints = read_literals(header.constraints)
+        justice_sizes = read_literals(header.justice)
+        justice = [read_literals(int(size)) for size in justice_sizes]
+        fairness = read_literals(header.fairness)
+
+        if header.is_ascii:
+            ands = np.array(_int_lines(read_lines(header.ands), file_path, 3), dtype=np.int64).reshape(-1, 3)
+        else:
+            if header.max_var != header.inputs + header.latches + header.ands:
+                raise ValueError(f"binary AIGER {file_path} needs M = I + L + A")
+            start = mm.tell()
+            # a 64-bit delta takes at most 10 bytes
+            window = np.frombuffer(mm, dtype=np.uint8, count=min(len(mm) - start, 20 * header.ands),
+                                   offset=start).copy()
+            deltas, used = _decode_varints(window, 2 * header.ands)
+            del window
+            lhs = 2 * np.arange(header.inputs + header.latches + 1, header.max_var + 1, dtype=np.int64)
+            rhs0 = lhs - deltas[0::2]
+            rhs1 = rhs0 - deltas[1::2]
+            if np.any(rhs0 < 0) or np.any(rhs1 < 0):
+                raise ValueError(f"illegal AND delta in {file_path}")
+            ands = np.stack([lhs, rhs0, rhs1], axis=1).reshape(-1, 3)
+            mm.seek(start + used)
+
+        symbols, comments = _parse_symbols(mm[mm.tell():].splitlines(keepends=True))
+
+    aig = Aiger(max_var=header.max_var, inputs=inputs, latches=latches, latch_init=latch_init,
+                outputs=outputs, ands=ands, bad=bad, constraints=constraints, justice=justice,
+                fairness=fairness, symbols=symbols, comments=comments)
+    max_literal = 2 * header.max_var + 1
+    for literals in [aig.inputs, aig.latches, aig.outputs, aig.ands, aig.bad, aig.constraints,
+                     aig.fairness] + aig.justice:
+        if literals.size and (literals.min() < 0 or literals.max() > max_literal):
+            raise ValueError(f"literal out of range in {file_path}")
+    return aig
+
+
+def write_aiger(aig:Aiger, file_path:str, is_ascii:bool = None):
+    """
+    Write an AIGER file, binary unless the path ends with .aag. The binary
+    format needs the numbering of Aiger.is_binary_ordered, see
+    Aiger.canonical.
+
+    Args:
+        aig: The graph
+        file_path: Destination path
+        is_ascii: Format, from the file extension by default
+    """
+    if is_ascii is None:
+        is_ascii = file_path.endswith(".aag")
+    if not is_ascii and not aig.is_binary_ordered():
+        raise ValueError("the binary AIGER format needs ordered variables, re-encode with canonical() first")
+    counts = [aig.max_var, len(aig.inputs), len(aig.latches), len(aig.outputs), len(aig.ands)]
+    extra = [len(aig.bad), len(aig.constraints), len(aig.justice), len(aig.fairness)]
+    while extra and extra[-1] == 0:
+        extra.pop()
+
+    def literal_lines(literals):
+        return "".join(f"{int(literal)}\n" for literal in literals)
+
+    text = f"{'aag' if is_ascii else 'aig'} {' '.join(str(c) for c in counts + extra)}\n"
+    if is_ascii:
+        text += literal_lines(aig.inputs)
+    for (cur, nxt), init in zip(aig.latches.tolist(), aig.latch_init.tolist()):
+        init_literal = cur if init == LATCH_UNINITIALIZED else init
+        prefix = f"{cur} " if is_ascii else ""
+        text += f"{prefix}{nxt}\n" if init_literal == 0 else f"{prefix}{nxt} {init_literal}\n"
+    text += literal_lines(aig.outputs) + literal_lines(aig.bad) + literal_lines(aig.constraints)
+    text += literal_lines(len(j) for j in aig.justice) + "".join(literal_lines(j) for j in aig.justice)
+    text += literal_lines(aig.fairness)
+    if is_ascii:
+        text += "".join(f"{lhs} {rhs0} {rhs1}\n" for lhs, rhs0, rhs1 in aig.ands.tolist())
+        and_section = b""
+    else:
+        deltas = np.stack([aig.ands[:, 0] - aig.ands[:, 1], aig.ands[:, 1] - aig.ands[:, 2]], axis=1)
+        and_section = _encode_varints(deltas.reshape(-1))
+    tail = "".join(f"{section}{position} {name}\n" for (section, position), name in sorted(aig.symbols.items()))
+    if aig.comments:
+        tail += "c\n" + "".join(f"{comment}\n" for comment in aig.comments)
+
+    with open(file_path, "wb") as f:
+        f.write(text.encode("ascii"))
+        f.write(and_section)
+        f.write(tail.encode("utf-8"))
+    return file_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIGER statistics and canonical re-encoding")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats_parser = subparsers.add_parser("stats", help="Print the statistics of AIGER files as json")
+    stats_parser.add_argument("aiger_files", nargs="+")
+    canonical_parser = subparsers.add_parser("canonicalize", help="Re-encode an AIGER file canonically")
+    canonical_parser.add_argument("input_file")
+    canonical_parser.add_argument("output_file")
+    reduce_parser = subparsers.add_parser("reduce", help="Reduce an AIGER file to the cone of influence "
+                                                         "of its outputs and properties")
+    reduce_parser.add_argument("input_file")
+    reduce_parser.add_argument("output_file")
+    reduce_parser.add_argument("--keep-inputs", action="store_true", help="Keep the inputs outside the cone")
+    hash_parser = subparsers.add_parser("hash", help="Print the structural hash of AIGER files")
+    hash_parser.add_argument("aiger_files", nargs="+")
+    hash_parser.add_argument("--map", type=str, default=None,
+                             help="yosys map file naming the inputs and latches (one AIGER file only)")
+
+    args = parser.parse_args()
+    if args.command == "stats":
+        for file_path in args.aiger_files:
+            print(json.dumps(dict(read_aiger(file_path).get_stats(), file=file_path), sort_keys=True))
+        return 0
+    if args.command == "hash":
+        if args.map is not None and len(args.aiger_files) != 1:
+            parser.error("--map takes one AIGER file")
+        for file_path in args.aiger_files:
+            aig = read_aiger(file_path)
+            if args.map is not None:
+                aig.symbols.update(read_aiger_map(args.map))
+            print(f"{aig.structural_hash()}  {file_path}")
+        return 0
+    if args.command == "reduce":
+        reduced, report = read_aiger(args.input_file).reduce(keep_inputs=args.keep_inputs)
+        write_aiger(reduced, args.output_file)
+        print(json.dumps(report, sort_keys=True))
+        return 0
+    write_aiger(read_aiger(args.input_file).canonical(), args.output_file)
+    print(f"[INFO] canonical AIGER written to {args.output_file}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+def make_cache_key(key_parts:dict) -> str:
+    """
+    Get the cache key of a dict of json-serializable key parts.
+    """
+    if not isinstance(key_parts, dict):
+        raise TypeError(f"expected dict but got {type(key_parts)}")
+    key_str = json.dumps(key_parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(key_str.encode()).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    key : str
+    entry_dir : str
+    files : List[str]
+    metadata : dict = field(default_factory=dict)
+
+    def file_path(self, rel_path:str):
+        if rel_path not in self.files:
+            raise KeyError(f"{rel_path} is not stored in cache entry {self.key}")
+        return os.path.join(self.entry_dir, "files", rel_path)
+
+
+class ArtifactCache:
+    """
+    Content-addressed store of tool outputs on the local disk.
+
+    Every entry is a directory cache_dir/<key[:2]>/<key> holding the stored
+    files and a meta.json. Entries are written to a temporary directory and
+    renamed in place, so several processes can share one cache. The mtime of
+    meta.json is the last use of the entry, the least recently used entries
+    are evicted when the cache grows over max_bytes. The size is a running
+    total of this process, scanned once and when it crosses max_bytes, so a
+    store does not walk the whole cache.
+    """
+
+    def __init__(self, cache_dir:str, max_bytes:Optional[int] = None):
+        if not isinstance(cache_dir, str):
+            raise TypeError(f"expected str but got {type(cache_dir)}")
+        if cache_dir == "":
+            raise ValueError("cache_dir cannot be empty")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"illegal cache size {max_bytes}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(self.cache_dir, "tmp"), exist_ok=True)
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        # bytes of all entries as last scanned plus the entries stored since
+        self.total_bytes = None
+
+    def _entry_dir(self, key:str):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _entry_dir_list(self):
+        entry_dir_list = []
+        for prefix in sorted(os.listdir(self.cache_dir)):
+            prefix_dir = os.path.join(self.cache_dir, prefix)
+            if prefix == "tmp" or not os.path.isdir(prefix_dir):
+                continue
+            for key in sorted(os.listdir(prefix_dir)):
+                entry_dir_list.append(os.path.join(prefix_dir, key))
+        return entry_dir_list
+
+    def _dir_size(self, dir_path:str):
+        size = 0
+        for root, _, file_names in os.walk(dir_path):
+            for file_name in file_names:
+                size += os.path.getsize(os.path.join(root, file_name))
+        return size
+
+    def lookup(self, key:str):
+        """
+        Find an entry, counting a hit or a miss.
+
+        Returns:
+            CacheEntry: the entry, or None on a miss
+        """
+        meta_path = os.path.join(self._entry_dir(key), "meta.json")
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            # the mtime of meta.json is the last use of the entry
+            os.utime(meta_path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return CacheEntry(key=key, entry_dir=self._entry_dir(key),
+                          files=meta["files"], metadata=meta["metadata"])
+
+    def store(self, key:str, files:Dict[str, str], metadata:Optional[dict] = None):
+        """
+        Store files under a key, an existing entry is kept as it is.
+
+        Args:
+            key: Cache key, see make_cache_key
+            files: Relative path inside the entry -> path of the file to store
+            metadata: json-serializable data kept with the files
+
+        Returns:
+            CacheEntry: the stored entry
+        """
+        if not isinstance(files, dict):
+            raise TypeError(f"expected dict but got {type(files)}")
+        for rel_path, file_path in files.items():
+            if os.path.isabs(rel_path) or rel_path.startswith(".."):
+                raise ValueError(f"illegal relative path in cache entry: {rel_path}")
+            if not os.path.isfile(file_path):
+                raise FileNotFoundError(f"cannot store missing file: {file_path}")
+
+        tmp_dir = os.path.join(self.cache_dir, "tmp", uuid.uuid4().hex)
+        for rel_path, file_path in files.items():
+            dest_path = os.path.join(tmp_dir, "files", rel_path)
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            shutil.copyfile(file_path, dest_path)
+        os.makedirs(tmp_dir, exist_ok=True)
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump({"key": key, "files": sorted(files.keys()),
+                       "metadata": metadata if metadata is not None else {},
+                       "created_at": time.time()}, f, indent=2, sort_keys=True)
+
+        entry_dir = self._entry_dir(key)
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        try:
+            os.rename(tmp_dir, entry_dir)
+            self.stats["stores"] += 1
+            if self.total_bytes is not None:
+                self.total_bytes += self._dir_size(entry_dir)
+        except OSError:
+            # another process stored the same key first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        if self.max_bytes is not None:
+            if self.total_bytes is None:
+                self.total_bytes = sum(self._dir_size(d) for d in self._entry_dir_list())
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+        return CacheEntry(key=key, entry_dir=entry_dir, files=sorted(files.keys()),
+                          metadata=metadata if metadata is not None else {})
+
+    def restore(self, entry:CacheEntry, dest_dir:str, rel_paths:Optional[List[str]] = None):
+        """
+        Copy the files of an entry to dest_dir, keeping their relative paths.
+
+        Args:
+            entry: Entry returned by lookup
+            dest_dir: Destination directory
+            rel_paths: Files to restore, all files of the entry by default
+
+        Returns:
+            list: Paths of the restored files
+        """
+        return self.restore_files(entry, {rel_path: os.path.join(dest_dir, rel_path) for rel_path in
+                                          (entry.files if rel_paths is None else rel_paths)})
+
+    def restore_files(self, entry:CacheEntry, dest_paths:Dict[str, str]):
+        """
+        Copy files of an entry to their destinations.
+
+        Args:
+            entry: Entry returned by lookup
+            dest_paths: Relative path inside the entry -> destination path
+
+        Returns:
+            list: Paths of the restored files
+
+        Raises:
+            FileNotFoundError: The entry was evicted by another process since
+                               the lookup, the lookup then counts as a miss
+        """
+        restored_files = []
+        try:
+            for rel_path, dest_path in dest_paths.items():
+                os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+                shutil.copyfile(entry.file_path(rel_path), dest_path)
+                restored_files.append(dest_path)
+        except FileNotFoundError:
+            self.stats["hits"] -= 1
+            self.stats["misses"] += 1
+            raise
+        return restored_files
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            int: Number of evicted entries
+        """
+        if self.max_bytes is None:
+            return 0
+        entry_list = []
+        for entry_dir in self._entry_dir_list():
+            try:
+                last_use = os.path.getmtime(os.path.join(entry_dir, "meta.json"))
+            except FileNotFoundError:
+                continue
+            entry_list.append((last_use, entry_dir, self._dir_size(entry_dir)))
+        total_bytes = sum(size for _, _, size in entry_list)
+        evicted = 0
+        for last_use, entry_dir, size in sorted(entry_list):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                if os.path.getmtime(os.path.join(entry_dir, "meta.json")) != last_use:
+                    # looked up since the scan, about to be restored
+                    continue
+                # renamed away first, a lookup finds the whole entry or none
+                trash_dir = os.path.join(self.cache_dir, "tmp", uuid.uuid4().hex)
+                os.rename(entry_dir, trash_dir)
+            except OSError:
+                # evicted by another process
+                total_bytes -= size
+                continue
+            shutil.rmtree(trash_dir, ignore_errors=True)
+            total_bytes -= size
+            evicted += 1
+        self.total_bytes = total_bytes
+        self.stats["evictions"] += evicted
+        return evicted
+
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups > 0 else 0.0
@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+import hashlib
+import platform
+from datetime import datetime, timezone
+
+
+def sha256_bytes(content:bytes) -> str:
+    """
+    Get the sha256 hex digest of some bytes.
+    """
+    if not isinstance(content, bytes):
+        raise TypeError(f"expected bytes but got {type(content)}")
+    return hashlib.sha256(content).hexdigest()
+
+
+def sha256_file(file_path:str) -> str:
+    """
+    Get the sha256 hex digest of the content of a file.
+    """
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"cannot hash missing file: {file_path}")
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ArtifactManifest:
+    """
+    Sidecar manifest of a benchmark output directory.
+
+    The artifacts themselves are byte-identical for the same seed and
+    configuration, everything that is not (time, host, versions) is kept here,
+    together with the content hash of every artifact.
+    """
+
+    def __init__(self, output_dir:str, manifest_file_name:str = "manifest.json"):
+        if not isinstance(output_dir, str):
+            raise TypeError(f"expected str but got {type(output_dir)}")
+        if output_dir == "":
+            raise ValueError("output_dir cannot be empty")
+        if manifest_file_name == "":
+            raise ValueError("manifest_file_name cannot be empty")
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, manifest_file_name)
+        self.provenance = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "host": platform.node(),
+            "python_version": platform.python_version(),
+            "command_line": list(sys.argv),
+        }
+        self.config = {}
+        # stage name -> {relative path -> {"sha256": ..., "size": ...}}
+        self.artifacts = {}
+
+    def set_config(self, config:dict):
+        if not isinstance(config, dict):
+            raise TypeError(f"expected dict but got {type(config)}")
+        self.config = dict(config)
+
+    def set_provenance(self, key:str, value):
+        self.provenance[key] = value
+
+    def add_artifact(self, stage:str, file_path:str):
+        """
+        Record the content hash of one artifact under a stage name.
+
+        Args:
+            stage: Name of the stage that produced the artifact
+            file_path: Path to the artifact
+
+        Returns:
+            str: sha256 hex digest of the artifact
+        """
+        if stage == "":
+            raise ValueError("stage cannot be empty")
+        digest = sha256_file(file_path)
+        rel_path = os.path.relpath(os.path.abspath(file_path), os.path.abspath(self.output_dir))
+        self.artifacts.setdefault(stage, {})[rel_path] = {
+            "sha256": digest,
+            "size": os.path.getsize(file_path),
+        }
+        return digest
+
+    def mark_pruned(self):
+        """
+        Mark the artifacts whose file is gone, e.g. pruned by a retention
+        policy, with "pruned": true. Their hashes stay, a packed artifact
+        can still be checked against its archive member.
+
+        Returns:
+            int: Number of artifacts marked
+        """
+        marked = 0
+        for stage_artifacts in self.artifacts.values():
+            for rel_path, entry in stage_artifacts.items():
+                if not os.path.exists(os.path.join(self.output_dir, rel_path)) and not entry.get("pruned"):
+                    entry["pruned"] = True
+                    marked += 1
+        return marked
+
+    def to_dict(self):
+        return {
+            "provenance": self.provenance,
+            "config": self.config,
+            "artifacts": self.artifacts,
+        }
+
+    def write(self):
+        with open(self.manifest_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True, default=str)
+            f.write("\n")
+        print(f"[INFO] Manifest written to {self.manifest_path}")
+        return self.manifest_path
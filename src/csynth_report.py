@@ -0,0 +1,146 @@
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional
+
+
+@dataclass
+class LoopMetrics:
+    # nested loops are named parent/child
+    name : str
+    trip_count : Optional[int] = None
+    latency_min : Optional[int] = None
+    latency_max : Optional[int] = None
+    pipeline_ii : Optional[int] = None
+    pipeline_depth : Optional[int] = None
+
+
+@dataclass
+class SynthesisMetrics:
+    """
+    The numbers of a csynth report of one solution.
+    """
+    top_name : Optional[str] = None
+    part : Optional[str] = None
+    tool_version : Optional[str] = None
+    target_clock_ns : Optional[float] = None
+    estimated_clock_ns : Optional[float] = None
+    latency_min : Optional[int] = None
+    latency_max : Optional[int] = None
+    interval_min : Optional[int] = None
+    interval_max : Optional[int] = None
+    ff : Optional[int] = None
+    lut : Optional[int] = None
+    dsp : Optional[int] = None
+    bram_18k : Optional[int] = None
+    uram : Optional[int] = None
+    loops : List[LoopMetrics] = field(default_factory=list)
+    report_path : Optional[str] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _to_int(text):
+    # undefined values are reported as "undef", "?" or "-"
+    if text is None:
+        return None
+    try:
+        return int(text.strip())
+    except ValueError:
+        return None
+
+
+def _to_float(text):
+    if text is None:
+        return None
+    try:
+        return float(text.strip())
+    except ValueError:
+        return None
+
+
+def _find_text(element, path_list):
+    # the tag names differ between releases, the first one found wins
+    for path in path_list:
+        if element is None:
+            return None
+        found = element.find(path)
+        # a <TripCount> holding a <range> has whitespace text only
+        if found is not None and found.text is not None and found.text.strip() != "":
+            return found.text
+    return None
+
+
+def _parse_loops(loop_parent, prefix=""):
+    loop_list = []
+    for loop_element in list(loop_parent):
+        if loop_element.find("TripCount") is None and loop_element.find("Latency") is None:
+            continue
+        name = prefix + loop_element.tag
+        loop_list.append(LoopMetrics(
+            name=name,
+            trip_count=_to_int(_find_text(loop_element, ["TripCount", "TripCount/range/max"])),
+            latency_min=_to_int(_find_text(loop_element, ["Latency/range/min", "Latency"])),
+            latency_max=_to_int(_find_text(loop_element, ["Latency/range/max", "Latency"])),
+            pipeline_ii=_to_int(_find_text(loop_element, ["PipelineII"])),
+            pipeline_depth=_to_int(_find_text(loop_element, ["PipelineDepth"])),
+        ))
+        loop_list.extend(_parse_loops(loop_element, prefix=name + "/"))
+    return loop_list
+
+
+def parse_csynth_xml(xml_file_path:str) -> SynthesisMetrics:
+    """
+    Parse a csynth.xml report written by csynth_design.
+
+    Args:
+        xml_file_path: Path to the XML report
+
+    Returns:
+        SynthesisMetrics: the report numbers, None for the values the report does not have
+    """
+    if not os.path.exists(xml_file_path):
+        raise FileNotFoundError(f"csynth report not found: {xml_file_path}")
+    root = ET.parse(xml_file_path).getroot()
+
+    user_assignments = root.find("UserAssignments")
+    performance = root.find("PerformanceEstimates")
+    overall_latency = performance.find("SummaryOfOverallLatency") if performance is not None else None
+    resources = root.find("AreaEstimates/Resources")
+
+    metrics = SynthesisMetrics(
+        top_name=_find_text(user_assignments, ["TopModelName"]),
+        part=_find_text(user_assignments, ["Part"]),
+        tool_version=_find_text(root, ["ReportVersion/Version"]),
+        target_clock_ns=_to_float(_find_text(user_assignments, ["TargetClockPeriod"])),
+        estimated_clock_ns=_to_float(_find_text(performance, ["SummaryOfTimingAnalysis/EstimatedClockPeriod"])),
+        latency_min=_to_int(_find_text(overall_latency, ["Best-caseLatency"])),
+        latency_max=_to_int(_find_text(overall_latency, ["Worst-caseLatency"])),
+        interval_min=_to_int(_find_text(overall_latency, ["Interval-min"])),
+        interval_max=_to_int(_find_text(overall_latency, ["Interval-max"])),
+        ff=_to_int(_find_text(resources, ["FF"])),
+        lut=_to_int(_find_text(resources, ["LUT"])),
+        dsp=_to_int(_find_text(resources, ["DSP", "DSP48E"])),
+        bram_18k=_to_int(_find_text(resources, ["BRAM_18K"])),
+        uram=_to_int(_find_text(resources, ["URAM"])),
+        report_path=xml_file_path,
+    )
+    loop_summary = performance.find("SummaryOfLoopLatency") if performance is not None else None
+    if loop_summary is not None:
+        metrics.loops = _parse_loops(loop_summary)
+    return metrics
+
+
+def find_csynth_xml(solution_path:str, top_name:Optional[str] = None):
+    """
+    Find the csynth XML report of a solution, None if it has none.
+    """
+    report_dir = os.path.join(solution_path, "syn", "report")
+    candidate_list = ["csynth.xml"]
+    if top_name is not None:
+        candidate_list.insert(0, f"{top_name}_csynth.xml")
+    for candidate in candidate_list:
+        if os.path.exists(os.path.join(report_dir, candidate)):
+            return os.path.join(report_dir, candidate)
+    return None
@@ -1,9 +1,12 @@
-from matplotlib import pyplot as plt
 import networkx as nx
 from node import OpNode, OperationType, ResultDataType, BranchNode, LoopNode, Node, ArrayNode
 from node import QuantizationMode, OverflowMode
 from node import BRAM_TYPE
+from pragma_overlay import PragmaOverlay
+import os
 import shutil
+import dataclasses
+from xml.sax.saxutils import escape, quoteattr
 import subprocess
 from typing import Union, List
 
@@ -20,11 +23,9 @@ class GraphManager:
 
         self.function_name = "top"
 
-        # the program graphs for dumping various verilog
-        self.program_graph_copy_1 = nx.MultiDiGraph()
-        self.program_graph_copy_2 = nx.MultiDiGraph()
-        self.cp_1 = 10
-        self.cp_2 = 10
+        # the pragma overlays for dumping various verilog, they share program_graph
+        self.pragma_overlays = []
+        self._active_pragma_overlay = None
 
     def _get_op_node_list(self):
         """Traverse the graph and return all OpNode instances as a list, excluding WRITE operation types."""
@@ -202,22 +203,33 @@ class GraphManager:
         else:
             raise NotImplementedError(f"Unsupported combination of start_index and end_index types in LoopNode." +\
                                       f"start index = {node.start_index}, end index = {node.end_index}")
+    def _get_loop_pragma(self, node:LoopNode):
+        """
+        Get the pragma of a loop node, from the active overlay if there is one,
+        otherwise from the loop node itself.
+        """
+        if self._active_pragma_overlay is not None:
+            return self._active_pragma_overlay.get_loop_pragma(node)
+        return node.get_pragma()
+
     def _loop_node_pragma_to_str(self, node:LoopNode):
         node.check_pragma_status() 
+        loop_pragma = self._get_loop_pragma(node)
+        loop_pragma.check_pragma_status()
         loop_node_pragma_str = ""
-        if node.is_pipelined:
+        if loop_pragma.is_pipelined:
             loop_node_pragma_str += "\n#pragma HLS pipeline\n"
         else:
             loop_node_pragma_str += "\n#pragma HLS pipeline off\n"
 
-        if node.is_flattened:
+        if loop_pragma.is_flattened:
             loop_node_pragma_str += "\n#pragma HLS loop_flatten\n"
         
-        if node.is_unrolled:
-            if node.is_fully_unrolled:
+        if loop_pragma.is_unrolled:
+            if loop_pragma.is_fully_unrolled:
                 loop_node_pragma_str += "\n#pragma HLS unroll\n"
             else:
-                loop_node_pragma_str += f"\n#pragma HLS unroll factor={node.unroll_factor}\n"
+                loop_node_pragma_str += f"\n#pragma HLS unroll factor={loop_pragma.unroll_factor}\n"
         else:
             pass
         return loop_node_pragma_str
@@ -880,15 +892,9 @@ class GraphManager:
     
 
     def _cpp_head_generation(self):
-        
-        from datetime import datetime
-        
-        now = datetime.now()
-
-        # Format as ddmmyyHHMMSS
-        formatted_datetime = now.strftime("%d%m%y%H%M%S")
-
-        return f'//{formatted_datetime}\n#include"ap_int.h"\n#include"ap_fixed.h"\n'
+        # no timestamp here, the same seed must give byte-identical C++,
+        # the provenance goes to the sidecar manifest instead
+        return '#include"ap_int.h"\n#include"ap_fixed.h"\n'
 
     def _dump_cpp(self):
         # dump the program to cpp
@@ -908,23 +914,30 @@ class GraphManager:
         return interface_pragmas_str
 
 
-    def _dump_cp_1_cpp(self):
-        tmp_origin = self.program_graph
-        self.program_graph = self.program_graph_copy_1 
+    def _dump_cpp_with_overlay(self, pragma_overlay:PragmaOverlay):
+        if not isinstance(pragma_overlay, PragmaOverlay):
+            raise TypeError(f"expected PragmaOverlay but got {type(pragma_overlay)}")
+        self._active_pragma_overlay = pragma_overlay
+        try:
+            cpp_str = self._dump_cpp()
+        finally:
+            self._active_pragma_overlay = None
+        return cpp_str
 
-        cp_1_cpp_str = self._dump_cpp()
+    def _dump_variant_cpp(self, variant_index:int):
+        """
+        Dump the C++ of one variant, variant_index starts from 1.
+        """
+        if not 1 <= variant_index <= len(self.pragma_overlays):
+            raise ValueError(f"illegal variant index {variant_index}, "+\
+                             f"there are {len(self.pragma_overlays)} variants")
+        return self._dump_cpp_with_overlay(self.pragma_overlays[variant_index - 1])
 
-        self.program_graph = tmp_origin
-        return cp_1_cpp_str
+    def _dump_cp_1_cpp(self):
+        return self._dump_variant_cpp(1)
     
     def _dump_cp_2_cpp(self):
-        tmp_origin = self.program_graph
-        self.program_graph = self.program_graph_copy_2
-
-        cp_2_cpp_str = self._dump_cpp()
-
-        self.program_graph = tmp_origin
-        return cp_2_cpp_str
+        return self._dump_variant_cpp(2)
 
     def dump_cpp_std(self, file_path: str = "output.cpp"):
         """
@@ -937,7 +950,6 @@ class GraphManager:
         else:
             print("[INFO] clang-format found in system environment.")
             contain_clang_format = True
-        self.dump_png()
 
         cpp_code = self._dump_cpp()
         with open(file_path, 'w') as f:
@@ -953,131 +965,229 @@ class GraphManager:
                 print(result.stdout)
                 print(result.stderr)
 
-    def generate_cmp_graphs(self):
-        print("[INFO] generate gragmas for 2 graphs for comparsion")
-        print("[INFO] reset the graph pointer to empty")
-        self.program_graph_copy_1 = nx.MultiDiGraph()
-        self.program_graph_copy_2 = nx.MultiDiGraph()
-        self._copy_graph_and_insert_pragmas()
-
-        # simple check, have same number of nodes
-        if not (self.program_graph_copy_1.number_of_nodes() == \
-                self.program_graph_copy_2.number_of_nodes() == \
-                self.program_graph.number_of_nodes()):
-            raise ValueError("expected the copied graph and the original "+\
-            "one to have the same number of nodes, but got "+\
-            f"self.program_graph_copy_1.number_of_nodes() = "+\
-            f"{self.program_graph_copy_1.number_of_nodes()}; "+\
-            f"self.program_graph_copy_2.number_of_nodes() = "+\
-            f"{self.program_graph_copy_2.number_of_nodes()}; "+\
-            f"self.program_graph.number_of_nodes() = "+\
-            f"{self.program_graph.number_of_nodes()}")
-        if not (self.program_graph_copy_1.number_of_edges() == \
-                self.program_graph_copy_2.number_of_edges() == \
-                self.program_graph.number_of_edges()):
-            raise ValueError("expected the copied graph and the original "+\
-            "one to have the same number of edges, but got "+\
-            f"self.program_graph_copy_1.number_of_edges() = "+\
-            f"{self.program_graph_copy_1.number_of_edges()}; "+\
-            f"self.program_graph_copy_2.number_of_edges() = "+\
-            f"{self.program_graph_copy_2.number_of_edges()}; "+\
-            f"self.program_graph.number_of_edges() = "+\
-            f"{self.program_graph.number_of_edges()}")
+    def generate_variant_overlays(self, variant_count:int = 2):
+        print(f"[INFO] generate gragmas for {variant_count} variants")
+        if not isinstance(variant_count, int):
+            raise TypeError(f"expected variant_count to be int but got {type(variant_count)}")
+        if variant_count < 1:
+            raise ValueError(f"illegal variant count {variant_count}")
+        print("[INFO] reset the pragma overlays to empty")
+        self.pragma_overlays = []
+        self._generate_pragma_overlays(variant_count)
+
+        # simple check, every loop node has a pragma in every overlay
+        if len(self.pragma_overlays) != variant_count:
+            raise ValueError(f"expected {variant_count} pragma overlays "+\
+                             f"but got {len(self.pragma_overlays)}")
+        loop_node_list = self._get_loop_node_list()
+        for pragma_overlay in self.pragma_overlays:
+            if not isinstance(pragma_overlay, PragmaOverlay):
+                raise TypeError(f"expected PragmaOverlay but got {type(pragma_overlay)}")
+            if not pragma_overlay.covers(loop_node_list):
+                raise ValueError("expected the pragma overlay to cover all "+\
+                f"{len(loop_node_list)} loop nodes, but got "+\
+                f"{sorted(pragma_overlay.loop_pragmas.keys())}")
         print("[INFO] finished pragma generation")
         return True
 
+    def generate_cmp_graphs(self):
+        return self.generate_variant_overlays(variant_count=2)
+
+    def _run_clang_format(self, file_path:str):
+        print("[INFO] Running clang-format on the dumped C++ code...")
+        result = subprocess.run(["clang-format", 
+            "-i", "--style=Google", file_path], capture_output=True, text=True)
+        if result.returncode == 0:
+            print("[INFO] clang-format completed successfully.")
+        else:
+            print("[WARNING] clang-format encountered issues:")
+            print(result.stdout)
+            print(result.stderr)
 
-    def dump_cpp_comparsion(self, file_path_1:str = "output_1.cpp",
-                            file_path_2:str = "output_2.cpp"):
+    def dump_cpp_variants(self, file_path_list:List[str]):
+        """
+        Generate one pragma overlay per file and dump every variant of the graph.
+        :param file_path_list: The paths to the output C++ files, one per variant.
+        """
+        if not isinstance(file_path_list, list):
+            raise TypeError(f"expected list but got {type(file_path_list)}")
+        if len(file_path_list) == 0:
+            raise ValueError("empty file path list")
         contain_clang_format = False
         if shutil.which("clang-format") is None:
             print("[WARNING] clang-format not found in system environment.")
         else:
             print("[INFO] clang-format found in system environment.")
             contain_clang_format = True
-        self.dump_png()
-
-        # Generate comparison graphs with different pragmas
-        self.generate_cmp_graphs()
-
-        cpp_code_1 = self._dump_cp_1_cpp()
-        cpp_code_2 = self._dump_cp_2_cpp()
 
-        with open(file_path_1, 'w') as f:
-            f.write(cpp_code_1)
-        print(f"[INFO] C++ code dumped to {file_path_1}")
+        # Generate variant overlays with different pragmas
+        self.generate_variant_overlays(variant_count=len(file_path_list))
 
-        with open(file_path_2, 'w') as f:
-            f.write(cpp_code_2)
-        print(f"[INFO] C++ code dumped to {file_path_2}")
+        for i, file_path in enumerate(file_path_list, 1):
+            cpp_code = self._dump_variant_cpp(i)
+            with open(file_path, 'w') as f:
+                f.write(cpp_code)
+            print(f"[INFO] C++ code dumped to {file_path}")
 
         if contain_clang_format:
-            print("[INFO] Running clang-format on the dumped C++ code...")
-            result = subprocess.run(["clang-format", 
-                "-i", "--style=Google", file_path_1], capture_output=True, text=True)
-            if result.returncode == 0:
-                print("[INFO] clang-format completed successfully.")
-            else:
-                print("[WARNING] clang-format encountered issues:")
-                print(result.stdout)
-                print(result.stderr)
-        if contain_clang_format:
-            print("[INFO] Running clang-format on the dumped C++ code...")
-            result = subprocess.run(["clang-format", 
-                "-i", "--style=Google", file_path_2], capture_output=True, text=True)
-            if result.returncode == 0:
-                print("[INFO] clang-format completed successfully.")
-            else:
-                print("[WARNING] clang-format encountered issues:")
-                print(result.stdout)
-                print(result.stderr)
+            for file_path in file_path_list:
+                self._run_clang_format(file_path)
+
+    def dump_cpp_comparsion(self, file_path_1:str = "output_1.cpp",
+                            file_path_2:str = "output_2.cpp"):
+        self.dump_cpp_variants([file_path_1, file_path_2])
 
     
 
-    def _set_loop_node_pragmas(self, node):
+    def _generate_loop_pragma(self, node):
         raise NotImplementedError("not overloaded")
     
     def _set_design_cp_in_ns(self):
         raise NotImplementedError("not overloaded")
 
-    def _insert_pragmas_to_graph(self, program_graph_to_be_inserted:nx.MultiDiGraph):
-        for node in program_graph_to_be_inserted.nodes():
-            if isinstance(node, LoopNode):
-                self._set_loop_node_pragmas(node)
-                node.check_pragma_status()
+    def _generate_pragma_overlay(self):
+        pragma_overlay = PragmaOverlay()
+        for node in self._get_loop_node_list():
+            pragma_overlay.set_loop_pragma(node, self._generate_loop_pragma(node))
+        return pragma_overlay
+
+    def _generate_pragma_overlays(self, variant_count:int = 2):
+        print("[INFO] call GraphManager::_generate_pragma_overlays")
+        self.pragma_overlays = []
+        for _ in range(variant_count):
+            pragma_overlay = self._generate_pragma_overlay()
+            pragma_overlay.clock_period = self._set_design_cp_in_ns()
+            self.pragma_overlays.append(pragma_overlay)
+        print("[INFO] end call GraphManager::_generate_pragma_overlays")
 
-    def _copy_graph_and_insert_pragmas(self):
-        print("[INFO] call GraphManager::_copy_graph_and_insert_pragmas")
-        self.program_graph_copy_1 = self.program_graph.copy()
-        self.program_graph_copy_2 = self.program_graph.copy()       
+    
+    
+    def _graph_node_id(self, node):
+        # address constants of array accesses are plain ints in the graph
+        if hasattr(node, 'name'):
+            return node.name
+        return f"const_{node}"
 
-        self._insert_pragmas_to_graph(self.program_graph_copy_1)
-        self._insert_pragmas_to_graph(self.program_graph_copy_2)
+    def _graph_node_attributes(self, node):
+        """
+        Flat str -> str attributes of a node for the graph exports.
+        """
+        if not dataclasses.is_dataclass(node):
+            return {"kind": "Constant", "value": str(node)}
+        attributes = {"kind": type(node).__name__}
+        for field in dataclasses.fields(node):
+            if field.name == "name":
+                continue
+            value = getattr(node, field.name)
+            if hasattr(value, 'value'):
+                value = value.value
+            elif hasattr(value, 'name'):
+                value = value.name
+            attributes[field.name] = str(value)
+        return attributes
+
+    def _graph_edge_attributes(self, edge_data:dict):
+        return {k: str(v) for k, v in sorted(edge_data.items())}
+
+    def dump_dot(self, file_path: str = "output_graph.dot"):
+        """
+        Dump the program graph to a Graphviz DOT file, written node by node.
+        :param file_path: The path to the output DOT file.
+        """
+        def dot_str(value):
+            return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
 
-        self.cp_1 = self._set_design_cp_in_ns()
-        self.cp_2 = self._set_design_cp_in_ns() 
-        print("[INFO] end call GraphManager::_copy_graph_and_insert_pragmas")
+        with open(file_path, 'w') as f:
+            f.write("digraph program_graph {\n")
+            for node in self.program_graph.nodes():
+                node_id = self._graph_node_id(node)
+                attributes = {"label": node_id}
+                attributes.update(self._graph_node_attributes(node))
+                attr_str = ", ".join(f"{k}={dot_str(v)}" for k, v in attributes.items())
+                f.write(f"  {dot_str(node_id)} [{attr_str}];\n")
+            for u, v, edge_data in self.program_graph.edges(data=True):
+                attributes = self._graph_edge_attributes(edge_data)
+                attr_str = ""
+                if attributes:
+                    attr_str = " [" + ", ".join(f"{k}={dot_str(val)}" for k, val in attributes.items()) + "]"
+                f.write(f"  {dot_str(self._graph_node_id(u))} -> {dot_str(self._graph_node_id(v))}{attr_str};\n")
+            f.write("}\n")
+        print(f"[INFO] Program graph dumped to {file_path}")
 
-    
-    
-    def dump_png(self, file_path: str = "output_graph.png"):
+    def dump_graphml(self, file_path: str = "output_graph.graphml"):
+        """
+        Dump the program graph to a GraphML file, written node by node.
+        Every attribute is declared as a string key.
+        :param file_path: The path to the output GraphML file.
+        """
+        node_attribute_list = [(node, self._graph_node_attributes(node))
+                               for node in self.program_graph.nodes()]
+        node_keys = sorted({k for _, attributes in node_attribute_list for k in attributes})
+        edge_keys = sorted({k for _, _, edge_data in self.program_graph.edges(data=True) for k in edge_data})
+
+        with open(file_path, 'w') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+            for key in node_keys:
+                f.write(f'  <key id={quoteattr("n_" + key)} for="node" attr.name={quoteattr(key)} attr.type="string"/>\n')
+            for key in edge_keys:
+                f.write(f'  <key id={quoteattr("e_" + key)} for="edge" attr.name={quoteattr(key)} attr.type="string"/>\n')
+            f.write('  <graph id="program_graph" edgedefault="directed">\n')
+            for node, attributes in node_attribute_list:
+                f.write(f'    <node id={quoteattr(self._graph_node_id(node))}>\n')
+                for k, v in attributes.items():
+                    f.write(f'      <data key={quoteattr("n_" + k)}>{escape(v)}</data>\n')
+                f.write('    </node>\n')
+            for u, v, edge_data in self.program_graph.edges(data=True):
+                f.write(f'    <edge source={quoteattr(self._graph_node_id(u))} '
+                        f'target={quoteattr(self._graph_node_id(v))}>\n')
+                for k, val in self._graph_edge_attributes(edge_data).items():
+                    f.write(f'      <data key={quoteattr("e_" + k)}>{escape(val)}</data>\n')
+                f.write('    </edge>\n')
+            f.write('  </graph>\n')
+            f.write('</graphml>\n')
+        print(f"[INFO] Program graph dumped to {file_path}")
+
+    def _layered_layout(self):
+        """
+        Place the nodes row by row on their topological generation, linear in
+        the graph size. Falls back to the spring layout on a cyclic graph.
+        """
+        if not nx.is_directed_acyclic_graph(self.program_graph):
+            print("[WARNING] program graph is not acyclic, fall back to spring layout")
+            return nx.spring_layout(self.program_graph)
+        pos = {}
+        for depth, generation in enumerate(nx.topological_generations(self.program_graph)):
+            generation = sorted(generation, key=self._graph_node_id)
+            offset = (len(generation) - 1) / 2
+            for i, node in enumerate(generation):
+                pos[node] = (i - offset, -depth)
+        return pos
+
+    def dump_png(self, file_path: str = "output_graph.png", layout: str = "layered", dpi: int = 300):
         """
         Dump the program graph to a PNG file with only node names displayed.
         :param file_path: The path to the output PNG file.
+        :param layout: "layered" places the nodes on their topological generation,
+                       "spring" uses the (quadratic) spring layout.
+        :param dpi: Resolution of the picture.
         """
+        if layout not in ("layered", "spring"):
+            raise ValueError(f"unknown layout {layout}, expected layered or spring")
+        # matplotlib is only loaded when a picture is asked for, its import and
+        # backend setup dominate the startup of short generator runs otherwise
+        from matplotlib import pyplot as plt
+
         # Create a mapping of node objects to their names for labels
-        labels = {}
-        for node in self.program_graph.nodes():
-            if hasattr(node, 'name'):
-                labels[node] = node.name
-            else:
-                labels[node] = str(node)
+        labels = {node: self._graph_node_id(node) for node in self.program_graph.nodes()}
         
         # Clear any previous plots
         plt.clf()
         
-        # Draw the graph with custom labels showing only node names
-        pos = nx.spring_layout(self.program_graph)  # Use spring layout for better visualization
+        if layout == "layered":
+            pos = self._layered_layout()
+        else:
+            pos = nx.spring_layout(self.program_graph)
         nx.draw(self.program_graph, pos, labels=labels, with_labels=True, 
                 node_size=2000, node_color='lightblue', font_size=10, 
                 font_color='black', font_weight='bold', arrows=True, 
@@ -1085,11 +1195,30 @@ class GraphManager:
         
         plt.title("Program Graph")
         plt.axis('off')  # Turn off axis for cleaner look
-        # plt.tight_layout()
-        plt.savefig(file_path, dpi=300, bbox_inches='tight')
+        plt.savefig(file_path, dpi=dpi, bbox_inches='tight')
         plt.clf()  # Clear the plot after saving
         print(f"[INFO] Program graph dumped to {file_path}")
 
+    def export_graph(self, output_dir:str, formats:List[str], png_layout:str = "layered"):
+        """
+        Export the program graph in the requested formats.
+        :param output_dir: Directory of the exported files, named program_graph.<format>.
+        :param formats: Any of "dot", "graphml" and "png".
+        :return: The list of written file paths.
+        """
+        exporters = {"dot": self.dump_dot, "graphml": self.dump_graphml}
+        written_files = []
+        for graph_format in formats:
+            file_path = os.path.join(output_dir, f"program_graph.{graph_format}")
+            if graph_format == "png":
+                self.dump_png(file_path, layout=png_layout)
+            elif graph_format in exporters:
+                exporters[graph_format](file_path)
+            else:
+                raise ValueError(f"unknown graph format {graph_format}")
+            written_files.append(file_path)
+        return written_files
+
     def _has_branch_node(self):
         return self.branch_node_counter > 0
     
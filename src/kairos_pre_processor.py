@@ -1,12 +1,15 @@
 import os
+import verilog_post_processor
 from verilog_post_processor import VerilogPostProcessor
 from yosys_compiler import YosysCompiler
+from artifact_manifest import sha256_file
 class KairosPreprocessor:
 
     def __init__(self, verilog_file_path_before_preprocess:str,
                  verilog_file_path_after_preprocess:str,
                  working_dir:str,
-                 top_name:str):
+                 top_name:str,
+                 yosys_compiler:YosysCompiler = None):
         if not isinstance(verilog_file_path_before_preprocess, str):
             raise TypeError()
         if not isinstance(verilog_file_path_after_preprocess, str):
@@ -34,16 +37,67 @@ class KairosPreprocessor:
         
         self.top_name = top_name
 
-        self.yosys_compiler_instance = YosysCompiler()
+        if yosys_compiler is None:
+            yosys_compiler = YosysCompiler()
+        self.yosys_compiler_instance = yosys_compiler
         self.vpp_instance = None
 
     def process(self):
+        """
+        Flatten and post-process the design, unless the yosys cache has both.
+
+        Returns:
+            bool: True if the files were restored from the yosys cache
+        """
+        if self.restore_from_cache():
+            return True
         self.yosys_compiler_instance.execute_flatten(
             verilog_file_path=self.verilog_file_path_before,
             working_dir=self.working_dir,
             verilog_output_file_path=self.verilog_file_path_mid,
             top_name=self.top_name
         )
+        self.post_process()
+        self.store_in_cache()
+        return False
+
+    def add_flatten(self, yosys_compiler:YosysCompiler):
+        """
+        Add the flatten step to an open yosys session, to flatten several
+        designs in one yosys launch. post_process runs once the session ran.
+        """
+        yosys_compiler.add_flatten(
+            verilog_file_path=self.verilog_file_path_before,
+            verilog_output_file_path=self.verilog_file_path_mid,
+            top_name=self.top_name
+        )
+
+    def _get_cache_key(self):
+        # a change of the post processor invalidates the processed files
+        return self.yosys_compiler_instance.get_cache_key(
+            "flatten", self.verilog_file_path_before, self.top_name,
+            post_processor_sha256=sha256_file(verilog_post_processor.__file__))
+
+    def _cache_files(self):
+        return {"flatten.v": self.verilog_file_path_mid, "proc.v": self.verilog_file_path_after}
+
+    def restore_from_cache(self):
+        """
+        Restore the flattened and the processed file from the yosys cache.
+
+        Returns:
+            bool: True on a cache hit
+        """
+        if self.yosys_compiler_instance.cache is None:
+            return False
+        return self.yosys_compiler_instance.restore_from_cache(self._get_cache_key(), self._cache_files())
+
+    def store_in_cache(self):
+        if self.yosys_compiler_instance.cache is None:
+            return
+        self.yosys_compiler_instance.store_in_cache(self._get_cache_key(), self._cache_files())
+
+    def post_process(self):
         self.vpp_instance = VerilogPostProcessor(
             flattened_verilog_file_path=self.verilog_file_path_mid,
             processed_verilog_file_path=self.verilog_file_path_after
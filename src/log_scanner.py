@@ -0,0 +1,111 @@
+import re
+import json
+from dataclasses import dataclass, asdict, replace
+from typing import List
+
+
+SEVERITY_LIST = ["fatal", "warning"]
+
+
+@dataclass
+class LogPattern:
+    name : str
+    regex : str
+    severity : str = "warning"
+
+    def __post_init__(self):
+        if self.severity not in SEVERITY_LIST:
+            raise ValueError(f"illegal severity {self.severity}, expected one of {SEVERITY_LIST}")
+        self.compiled_regex = re.compile(self.regex)
+
+
+@dataclass
+class LogMatch:
+    pattern_name : str
+    severity : str
+    line_number : int
+    line : str
+
+    def to_dict(self):
+        return asdict(self)
+
+
+# Known vitis_hls messages. A fatal match stops the run, the tool would only
+# fail later or spend hours on a design that cannot finish.
+VITIS_HLS_LOG_PATTERNS = [
+    LogPattern(name="hls_error", regex=r"^ERROR: \[[A-Z]+ [0-9]+-[0-9]+\]", severity="fatal"),
+    # the design exploded after unrolling and inlining, scheduling will not finish
+    LogPattern(name="design_size_blowup", regex=r"^WARNING: \[HLS 200-1995\]", severity="fatal"),
+    LogPattern(name="cannot_unroll", regex=r"^WARNING: \[XFORM 203-503\]", severity="warning"),
+    LogPattern(name="ii_violation", regex=r"^WARNING: \[(HLS 200-885|HLS 200-880|SCHED 204-68)\]",
+               severity="warning"),
+    LogPattern(name="timing_violation", regex=r"^WARNING: \[HLS 200-871\]", severity="warning"),
+    # a synthesis profile setting the release does not know, see vitis_hls_compiler.SynthesisProfile
+    LogPattern(name="profile_setting_skipped", regex=r"^@@HLS_PROFILE_SKIPPED", severity="warning"),
+]
+
+# patterns that only concern the failing solution; a batch session catches
+# the failure of one solution and goes on with the next
+SOLUTION_ERROR_PATTERN_NAMES = ["hls_error"]
+
+
+def get_batch_log_patterns(pattern_list:List[LogPattern]) -> List[LogPattern]:
+    """
+    Get the patterns of a batch session: the solution errors are reported
+    but do not stop the session.
+    """
+    return [replace(pattern, severity="warning") if pattern.name in SOLUTION_ERROR_PATTERN_NAMES else pattern
+            for pattern in pattern_list]
+
+
+def load_log_patterns(file_path:str) -> List[LogPattern]:
+    """
+    Load log patterns from a JSON list of {"name", "regex", "severity"} objects.
+    """
+    with open(file_path) as f:
+        pattern_dict_list = json.load(f)
+    if not isinstance(pattern_dict_list, list):
+        raise ValueError(f"expected a list of log patterns in {file_path}")
+    return [LogPattern(**pattern_dict) for pattern_dict in pattern_dict_list]
+
+
+class LogScanner:
+    """
+    Matches the lines of a tool log against a set of patterns while the tool
+    runs. feed_line returns True once a fatal pattern matched, the runner
+    then stops the tool.
+    """
+
+    def __init__(self, pattern_list:List[LogPattern], max_matches:int = 100):
+        if not isinstance(pattern_list, list):
+            raise TypeError(f"expected list but got {type(pattern_list)}")
+        for pattern in pattern_list:
+            if not isinstance(pattern, LogPattern):
+                raise TypeError(f"expected LogPattern but got {type(pattern)}")
+        self.pattern_list = pattern_list
+        self.max_matches = max_matches
+        self.matches = []
+        self.fatal_match = None
+        self.line_count = 0
+
+    def feed_line(self, line:str):
+        self.line_count += 1
+        for pattern in self.pattern_list:
+            if pattern.compiled_regex.search(line):
+                log_match = LogMatch(pattern_name=pattern.name, severity=pattern.severity,
+                                     line_number=self.line_count, line=line.rstrip("\n"))
+                if len(self.matches) < self.max_matches:
+                    self.matches.append(log_match)
+                if pattern.severity == "fatal" and self.fatal_match is None:
+                    self.fatal_match = log_match
+                break
+        return self.fatal_match is not None
+
+    def scan_file(self, file_path:str):
+        with open(file_path, errors="replace") as f:
+            for line in f:
+                self.feed_line(line)
+        return self.matches
+
+    def get_diagnostics(self) -> List[dict]:
+        return [log_match.to_dict() for log_match in self.matches]
@@ -1,19 +1,738 @@
-from random_graph_manager import RandomGraphManager
-from vitis_hls_compiler import VitisHLSCompiler
-from miter_generator import MiterGenerator
-from yosys_compiler import YosysCompiler
-from kairos_pre_processor import KairosPreprocessor
 import os
 import sys
+import json
+import time
 import argparse
-import random
+import shutil
+import itertools
+import traceback
 
+# The stage modules (graph generation, HLS, miter, yosys) are imported inside
+# the functions using them, so `--help`, `--skip-compilation` and the worker
+# processes only load what their run needs.
 
-def main():
+
+def parse_variant_pairs(pairs_str, variant_count, has_reference=False):
     """
-    Main function to generate random HLS benchmark graphs, dump C++ files, and compile with Vitis HLS.
+    Parse the variant pairs to build miters for.
+
+    Args:
+        pairs_str: Comma separated pairs like "1-2,1-3", or None for all pairs
+        variant_count: Number of generated variants
+        has_reference: Index 0 is the Python reference RTL, by default every
+                       variant is paired with it instead of with each other
+
+    Returns:
+        list: List of (i, j) tuples of 1-based variant indices with i < j
+    """
+    if pairs_str is None or pairs_str == "":
+        if has_reference:
+            return [(0, i) for i in range(1, variant_count + 1)]
+        return list(itertools.combinations(range(1, variant_count + 1), 2))
+
+    first_index = 0 if has_reference else 1
+
+    pair_list = []
+    for pair_str in pairs_str.split(","):
+        pair_str = pair_str.strip()
+        tokens = pair_str.split("-")
+        if len(tokens) != 2:
+            raise ValueError(f"illegal variant pair '{pair_str}', expected format 'i-j'")
+        i, j = int(tokens[0]), int(tokens[1])
+        if i == j:
+            raise ValueError(f"illegal variant pair '{pair_str}', a variant cannot pair with itself")
+        if not (first_index <= i <= variant_count and first_index <= j <= variant_count):
+            raise ValueError(f"illegal variant pair '{pair_str}', "
+                             f"variant index should be in [{first_index}, {variant_count}]")
+        pair = (min(i, j), max(i, j))
+        if pair not in pair_list:
+            pair_list.append(pair)
+    return pair_list
+
+
+def create_hls_cache(args):
+    if args.hls_cache_dir is None:
+        return None
+    from artifact_cache import ArtifactCache
+    return ArtifactCache(args.hls_cache_dir, max_bytes=args.hls_cache_max_mb * 1024 * 1024)
+
+
+def create_yosys_cache(args):
+    if args.yosys_cache_dir is None:
+        return None
+    from artifact_cache import ArtifactCache
+    return ArtifactCache(args.yosys_cache_dir)
+
+
+def setup_tool_replay(args):
+    """
+    Put record/replay stand-ins for vitis_hls and yosys in front of the PATH,
+    the tool runs of this process and its workers then go through them.
+    """
+    if args.tool_replay is None:
+        return None
+    from tool_replay import install_tool_shims
+    real_tools = {"yosys": os.environ["YOSYS"]} if os.environ.get("YOSYS") else None
+    shim_paths = install_tool_shims(os.path.join(args.output_dir, "tool_shims"), args.tool_replay,
+                                    args.tool_fixture_dir, real_tools=real_tools)
+    os.environ["PATH"] = os.path.dirname(shim_paths["vitis_hls"]) + os.pathsep + os.environ.get("PATH", "")
+    os.environ["YOSYS"] = shim_paths["yosys"]
+    print(f"[INFO] Tool {args.tool_replay} mode, fixtures in {args.tool_fixture_dir}")
+    return shim_paths
+
+
+# one yosys worker pool per process, a corpus worker process keeps its pool
+# across benchmarks. The workers exit on the end of their stdin when the
+# process ends.
+_yosys_worker_pool = None
+
+
+def get_yosys_worker_pool(args):
+    global _yosys_worker_pool
+    if args.yosys_workers == 0:
+        return None
+    if _yosys_worker_pool is None:
+        from yosys_worker import YosysWorkerPool
+        _yosys_worker_pool = YosysWorkerPool(worker_count=args.yosys_workers,
+                                             timeout_s=args.tool_timeout,
+                                             memory_limit_mb=args.tool_memory_mb)
+    return _yosys_worker_pool
+
+
+def load_hls_log_patterns(args):
+    # None keeps the built-in vitis_hls patterns
+    if args.hls_log_patterns is None:
+        return None
+    from log_scanner import load_log_patterns
+    return load_log_patterns(args.hls_log_patterns)
+
+
+def print_diagnostics(compile_result):
+    for diagnostic in compile_result.get("diagnostics") or []:
+        level = "ERROR" if diagnostic["severity"] == "fatal" else "WARNING"
+        print(f"[{level}]   log line {diagnostic['line_number']} ({diagnostic['pattern_name']}): "
+              f"{diagnostic['line']}")
+
+
+def record_synthesis_metrics(args, all_compile_results, clock_periods=None):
+    """
+    Store the csynth metrics of the compiled variants in the metrics database.
+    """
+    if args.metrics_db is None:
+        return
+    from metrics_store import MetricsStore
+    from artifact_manifest import sha256_file
+
+    metrics_store = MetricsStore(args.metrics_db)
+    stored = 0
+    try:
+        for result in all_compile_results:
+            if result.get("metrics") is None:
+                continue
+            i = result["compile_index"]
+            metrics_store.add_metrics(
+                benchmark=f"seed_{args.seed}",
+                variant=i,
+                metrics=result["metrics"],
+                seed=args.seed,
+                clock_period=args.clock_period if clock_periods is None else clock_periods[i - 1],
+                profile=args.hls_profile,
+                cpp_sha256=sha256_file(result["cpp_file"])
+            )
+            stored += 1
+    finally:
+        metrics_store.close()
+    print(f"[INFO] Stored the synthesis metrics of {stored} variants in {args.metrics_db}")
+
+
+def apply_retention_policies(args, all_compile_results, miter_dir_list, manifest=None):
+    """
+    Prune the HLS projects and the miter directories of a finished benchmark.
+
+    Returns:
+        dict: stage name -> retention report
+    """
+    from retention import apply_retention, MITER_KEEP_PATTERNS
+    from vitis_hls_compiler import VitisHLSCompiler
+
+    retention_reports = {}
+    pruned_project_paths = set()
+    for result in all_compile_results:
+        project_path = result.get("project_path")
+        # variants compiled in one batch project are pruned once
+        if project_path is None or project_path in pruned_project_paths:
+            continue
+        pruned_project_paths.add(project_path)
+        hls_compiler = VitisHLSCompiler(working_dir=os.path.dirname(project_path))
+        retention_reports[f"hls_compile_{result['compile_index']}"] = \
+            hls_compiler.apply_retention_policy(os.path.basename(project_path), args.retention)
+    for miter_dir in miter_dir_list:
+        if os.path.isdir(miter_dir):
+            retention_reports[os.path.basename(miter_dir)] = \
+                apply_retention(miter_dir, MITER_KEEP_PATTERNS, args.retention)
+
+    for stage, report in retention_reports.items():
+        print(f"[INFO] Retention '{args.retention}' {stage}: {report['bytes_reclaimed']} of "
+              f"{report['bytes_before']} bytes reclaimed, {report['files_pruned']} files pruned")
+    print(f"[INFO] Retention reclaimed {sum(r['bytes_reclaimed'] for r in retention_reports.values())} bytes")
+    if manifest is not None:
+        manifest.set_provenance("retention", retention_reports)
+        # the pruned files stay listed, marked as pruned
+        manifest.mark_pruned()
+    return retention_reports
+
+
+def record_cache_stats(cache, cache_name="hls_cache", manifest=None):
+    if cache is None:
+        return
+    label = {"hls_cache": "HLS cache", "yosys_cache": "yosys cache"}[cache_name]
+    print(f"[INFO] {label}: {cache.stats['hits']} hits, {cache.stats['misses']} misses, "
+          f"{cache.stats['evictions']} evictions")
+    if manifest is not None:
+        manifest.set_provenance(cache_name, dict(cache.stats))
+
+
+def compile_variants(args, cpp_files_created, manifest=None, clock_periods=None, compile_indices=None):
+    """
+    Compile every C++ variant with Vitis HLS exactly once.
+
+    Args:
+        args: Parsed command line arguments
+        cpp_files_created: List of C++ files, one per variant
+        manifest: Optional ArtifactManifest recording the produced artifacts
+        clock_periods: Optional clock period per variant, args.clock_period by default
+        compile_indices: Optional 1-based indices of the variants to compile, all by default
+
+    Returns:
+        tuple: (list of compile results, bool indicating all compilations succeeded)
+    """
+    from vitis_hls_compiler import VitisHLSCompiler
+
+    all_compile_results = []
+    compilation_success = True
+    if clock_periods is None:
+        clock_periods = [args.clock_period] * len(cpp_files_created)
+
+    hls_cache = create_hls_cache(args)
+    hls_log_patterns = load_hls_log_patterns(args)
+
+    for i, cpp_file in enumerate(cpp_files_created, 1):
+        if compile_indices is not None and i not in compile_indices:
+            continue
+        print(f"[INFO] Compiling file {i}/{len(cpp_files_created)}: {os.path.basename(cpp_file)}")
+
+        # Create separate working directory for each compilation
+        compile_dir = os.path.join(args.output_dir, f"compile_{i}")
+        if not os.path.exists(compile_dir):
+            os.makedirs(compile_dir)
+
+        # Create separate HLS compiler instance for this file
+        hls_compiler = VitisHLSCompiler(
+            working_dir=compile_dir,
+            hls_script_path=os.path.join(compile_dir, f"hls_script_{i}.tcl"),
+            log_file_path=os.path.join(compile_dir, f"hls_compile_{i}.log"),
+            timeout_s=args.tool_timeout,
+            memory_limit_mb=args.tool_memory_mb,
+            part=args.part,
+            cache=hls_cache,
+            profile=args.hls_profile,
+            log_patterns=hls_log_patterns
+        )
+
+        try:
+            # Compile this specific C++ file
+            compile_result = hls_compiler.compile(
+                project_name=f"{args.project_name}_{i}",
+                top_name=args.top_function,
+                clock_period=clock_periods[i - 1],
+                cpp_file_list=[cpp_file]
+            )
+
+            compile_result["cpp_file"] = cpp_file
+            compile_result.setdefault("cache_hit", False)
+            compile_result["compile_index"] = i
+            all_compile_results.append(compile_result)
+
+            if compile_result["success"]:
+                if manifest is not None:
+                    manifest.add_artifact(f"hls_compile_{i}", compile_result["script_file"])
+                    for verilog_file in compile_result["verilog_files"]:
+                        manifest.add_artifact(f"hls_compile_{i}", verilog_file)
+                print(f"[INFO] File {i} compilation completed successfully!")
+                if args.verbose:
+                    print(f"  Project: {compile_result['project_path']}")
+                    print(f"  Log: {compile_result['log_file']}")
+                    if compile_result["verilog_files"]:
+                        print(f"  HDL files: {len(compile_result['verilog_files'])}")
+            else:
+                print(f"[ERROR] File {i} compilation failed")
+                print_diagnostics(compile_result)
+                compilation_success = False
+                if compile_result["log_file"] is not None and os.path.exists(compile_result["log_file"]):
+                    print(f"[ERROR] Check log file: {compile_result['log_file']}")
+
+        except Exception as e:
+            print(f"[ERROR] Exception during compilation of file {i}: {str(e)}")
+            compilation_success = False
+            continue
+
+    record_cache_stats(hls_cache, "hls_cache", manifest)
+    return all_compile_results, compilation_success
+
+
+def compile_variants_batch(args, cpp_files_created, manifest=None, clock_periods=None, compile_indices=None):
+    """
+    Compile every C++ variant in a single vitis_hls session. Variants with the
+    same C++ content share one project, with one solution per variant.
+
+    Args:
+        args: Parsed command line arguments
+        cpp_files_created: List of C++ files, one per variant
+        manifest: Optional ArtifactManifest recording the produced artifacts
+        clock_periods: Optional clock period per variant, args.clock_period by default
+        compile_indices: Optional 1-based indices of the variants to compile, all by default
+
+    Returns:
+        tuple: (list of compile results, bool indicating all compilations succeeded)
+    """
+    from vitis_hls_compiler import VitisHLSCompiler, HLSJob
+    from artifact_manifest import sha256_file
+
+    if clock_periods is None:
+        clock_periods = [args.clock_period] * len(cpp_files_created)
+
+    compile_dir = os.path.join(args.output_dir, "compile_batch")
+    os.makedirs(compile_dir, exist_ok=True)
+    hls_cache = create_hls_cache(args)
+    hls_compiler = VitisHLSCompiler(
+        working_dir=compile_dir,
+        hls_script_path=os.path.join(compile_dir, "hls_batch.tcl"),
+        log_file_path=os.path.join(compile_dir, "hls_batch.log"),
+        timeout_s=args.tool_timeout,
+        memory_limit_mb=args.tool_memory_mb,
+        part=args.part,
+        cache=hls_cache,
+        profile=args.hls_profile,
+        log_patterns=load_hls_log_patterns(args)
+    )
+
+    variant_indices = [i for i in range(1, len(cpp_files_created) + 1)
+                       if compile_indices is None or i in compile_indices]
+    job_list = []
+    project_by_content = {}
+    for i in variant_indices:
+        cpp_file = cpp_files_created[i - 1]
+        # the project holds the sources, identical variants only differ in the solution
+        project_index = project_by_content.setdefault(sha256_file(cpp_file), i)
+        job_list.append(HLSJob(
+            project_name=f"{args.project_name}_{project_index}",
+            top_name=args.top_function,
+            clock_period=clock_periods[i - 1],
+            cpp_file_list=[cpp_files_created[project_index - 1]],
+            solution_name=f"solution{i}",
+            log_file_path=os.path.join(compile_dir, f"hls_compile_{i}.log")
+        ))
+
+    print(f"[INFO] Compiling {len(job_list)} variants in one vitis_hls session "
+          f"({len(project_by_content)} projects)")
+    all_compile_results = hls_compiler.compile_batch(job_list)
+    compilation_success = True
+    for i, compile_result in zip(variant_indices, all_compile_results):
+        compile_result["cpp_file"] = cpp_files_created[i - 1]
+        compile_result["compile_index"] = i
+        if compile_result["success"]:
+            if manifest is not None:
+                if compile_result["script_file"] is not None:
+                    manifest.add_artifact("hls_compile_batch", compile_result["script_file"])
+                for verilog_file in compile_result["verilog_files"]:
+                    manifest.add_artifact(f"hls_compile_{i}", verilog_file)
+            print(f"[INFO] File {i} compilation completed successfully!")
+        else:
+            print(f"[ERROR] File {i} compilation failed: {compile_result.get('error')}")
+            print_diagnostics(compile_result)
+            compilation_success = False
+
+    record_cache_stats(hls_cache, "hls_cache", manifest)
+    return all_compile_results, compilation_success
+
+
+def generate_reference_rtl(args, graph_manager, manifest=None):
+    """
+    Lower the program graph to the reference Verilog, the miter side of variant 0.
+
+    Returns:
+        dict: Compile result like entry of the reference, without an HLS project
+    """
+    from reference_rtl import ReferenceRTLGenerator
+
+    reference_dir = os.path.join(args.output_dir, "reference")
+    os.makedirs(reference_dir, exist_ok=True)
+    verilog_file = os.path.join(reference_dir, f"{args.top_function}.v")
+    ReferenceRTLGenerator(graph_manager, top_name=args.top_function).dump_verilog(verilog_file)
+    if manifest is not None:
+        manifest.add_artifact("reference_rtl", verilog_file)
+    return {"compile_index": 0, "success": True, "verilog_files": [verilog_file],
+            "project_path": None, "log_file": None, "cpp_file": None}
+
+
+def generate_miter_for_pair(args, result_1, result_2, miter_output_dir, manifest=None, yosys_cache=None):
+    """
+    Build the miter and its AIGER for one pair of compiled variants.
+
+    Args:
+        args: Parsed command line arguments
+        result_1: Compile result of the first variant
+        result_2: Compile result of the second variant
+        miter_output_dir: Output directory of this miter
+        manifest: Optional ArtifactManifest recording the produced artifacts
+        yosys_cache: Optional ArtifactCache of the flattened, processed and AIGER files
+
+    Returns:
+        str: Path to the generated AIGER file, the reduced one with --reduce-aiger
+             or the first word-level file without AIGER output, None if it was not generated
+             or was dropped as a duplicate by --dedupe drop
+    """
+    from miter_generator import MiterGenerator
+    from yosys_compiler import YosysCompiler, get_output_file_paths, get_aiger_map_path
+    from aiger import read_aiger, read_aiger_map
+
+    index_1 = result_1["compile_index"]
+    index_2 = result_2["compile_index"]
+
+    # Check if both compilations have verilog files
+    if not result_1["verilog_files"] or not result_2["verilog_files"]:
+        print(f"[WARNING] Compilation {index_1} or {index_2} has no Verilog files. Skipping miter generation.")
+        return None
+
+    # Create miter output directory
+    if not os.path.exists(miter_output_dir):
+        os.makedirs(miter_output_dir)
+        if args.verbose:
+            print(f"[INFO] Created miter output directory: {miter_output_dir}")
+
+    # Validate that all Verilog files exist
+    verilog_files_1 = result_1["verilog_files"]
+    verilog_files_2 = result_2["verilog_files"]
+
+    print(f"[INFO] Creating miter {index_1}-{index_2} from {len(verilog_files_1)} and {len(verilog_files_2)} Verilog files...")
+
+    if args.verbose:
+        print(f"[INFO] Verilog files from compilation {index_1}:")
+        for vf in verilog_files_1:
+            print(f"  {vf}")
+        print(f"[INFO] Verilog files from compilation {index_2}:")
+        for vf in verilog_files_2:
+            print(f"  {vf}")
+
+    # one yosys launch flattens both sides, or one per side with
+    # --parallel-miter-sides, a second one writes the AIGER
+    yosys_compiler = YosysCompiler(timeout_s=args.tool_timeout,
+                                   memory_limit_mb=args.tool_memory_mb,
+                                   worker_pool=get_yosys_worker_pool(args),
+                                   cache=yosys_cache,
+                                   aiger_recipe=args.aiger_recipe,
+                                   output_formats=args.output_formats)
+
+    # Initialize MiterGenerator
+    miter_generator = MiterGenerator(
+        verilog_file_path_list_1=verilog_files_1,
+        verilog_file_path_list_2=verilog_files_2,
+        merged_verilog_folder_path=miter_output_dir,
+        top_name=args.top_function,
+        yosys_compiler=yosys_compiler,
+        parallel_sides=args.parallel_miter_sides,
+        write_screen_miter=args.prescreen_cycles > 0
+    )
+
+    # Generate the miter
+    kairos_top = miter_generator.generate_miter(insert_assertions=False)
+
+    print(f"[INFO] Miter generation completed successfully!")
+    print(f"  Merged file 1: {miter_generator.merged_verilog_file_path_1}")
+    print(f"  Merged file 2: {miter_generator.merged_verilog_file_path_2}")
+    print(f"  Miter file: {miter_generator.miter_verilog_file_path}")
+    if kairos_top:
+        print(f"  Kairos top module: {kairos_top}")
+    miter_stage = f"miter_{index_1}_{index_2}"
+    if manifest is not None:
+        for file_path in [miter_generator.merged_verilog_file_path_1,
+                          miter_generator.merged_verilog_file_path_2,
+                          miter_generator.merged_verilog_file_path_1_proc,
+                          miter_generator.merged_verilog_file_path_2_proc,
+                          miter_generator.miter_verilog_file_path] + \
+                miter_generator.yosys_log_file_path_list:
+            manifest.add_artifact(miter_stage, file_path)
+
+    # Compile the miter to AIGER and the word-level formats in one yosys session
+    print(f"[INFO] Starting Yosys compilation to {', '.join(yosys_compiler.output_formats)}...")
+    try:
+        # Set up AIGER output file path
+        aiger_output_path = os.path.join(miter_output_dir, "miter.aig")
+
+        # Get the miter file path and top module name
+        miter_file_path = miter_generator.miter_verilog_file_path
+
+        # Use the kairos_top if available, otherwise default to "top"
+        top_module_name = kairos_top if kairos_top else "top"
+
+        if args.verbose:
+            print(f"[INFO] Compiling miter file: {miter_file_path}")
+            print(f"[INFO] Top module: {top_module_name}")
+            print(f"[INFO] Output AIGER file: {aiger_output_path}")
+
+        # Execute Yosys compilation
+        yosys_compiler.execute(
+            verilog_file_path=miter_file_path,
+            working_dir=miter_output_dir,
+            aiger_file_path=aiger_output_path,
+            top_name=top_module_name,
+            has_map=args.dedupe_db is not None
+        )
+
+        # Verify the output files were created
+        output_file_paths = get_output_file_paths(aiger_output_path, yosys_compiler.output_formats)
+        for output_format, output_file_path in output_file_paths.items():
+            if not os.path.exists(output_file_path):
+                print(f"[ERROR] {output_format} file was not created: {output_file_path}")
+                return None
+            file_size = os.path.getsize(output_file_path)
+            print(f"[INFO] {output_format} file generated successfully: {output_file_path} ({file_size} bytes)")
+        if manifest is not None:
+            manifest.add_artifact(miter_stage, yosys_compiler.log_file_path)
+            for output_file_path in output_file_paths.values():
+                manifest.add_artifact(miter_stage, output_file_path)
+
+        if "aiger" in output_file_paths:
+            aig = read_aiger(aiger_output_path)
+            aiger_stats = aig.get_stats()
+            print(f"[INFO] AIGER size with recipe {args.aiger_recipe}: {aiger_stats['inputs']} inputs, "
+                  f"{aiger_stats['latches']} latches, {aiger_stats['ands']} ANDs, "
+                  f"{aiger_stats['outputs'] + aiger_stats['bad']} outputs/bad, depth {aiger_stats['depth']}, "
+                  f"latch init {aiger_stats['latch_init']}")
+            if manifest is not None:
+                manifest.provenance.setdefault("aiger_stats", {})[miter_stage] = dict(
+                    aiger_stats, recipe=args.aiger_recipe)
+        if "aiger" in output_file_paths and args.dedupe_db is not None:
+            map_path = get_aiger_map_path(aiger_output_path)
+            if os.path.exists(map_path):
+                aig.symbols.update(read_aiger_map(map_path))
+                if manifest is not None:
+                    manifest.add_artifact(miter_stage, map_path)
+            else:
+                print(f"[WARNING] AIGER map file was not created: {map_path}, hashing with unnamed inputs")
+            is_duplicate = dedupe_miter_aiger(args, aig, aiger_output_path, miter_stage, manifest)
+            if is_duplicate and args.dedupe == "drop":
+                shutil.rmtree(miter_output_dir)
+                if manifest is not None:
+                    manifest.artifacts.pop(miter_stage, None)
+                print(f"[INFO] Dropped the duplicate miter {miter_output_dir}")
+                return None
+        if args.prescreen_cycles > 0:
+            prescreen_miter(args, yosys_compiler, miter_generator.screen_miter_verilog_file_path,
+                            top_module_name, miter_stage, manifest)
+        if "aiger" in output_file_paths and args.reduce_aiger:
+            return reduce_miter_aiger(aig, aiger_output_path, miter_stage, manifest)
+        return next(iter(output_file_paths.values()))
+
+    except Exception as yosys_e:
+        print(f"[ERROR] Yosys compilation to AIGER failed: {str(yosys_e)}")
+        raise yosys_e
+
+
+def prescreen_miter(args, yosys_compiler, screen_miter_file_path, top_module_name, miter_stage, manifest=None):
+    """
+    Simulate the miter on random stimulus before it is published. The screen
+    miter is the miter with the valid of both sides as a second output, its
+    AIGER is written with symbols to find the two outputs. A miter whose
+    unsafe signal fires, or that never gets both sides valid, is reported
+    but kept.
+
+    Args:
+        args: Parsed command line arguments
+        yosys_compiler: YosysCompiler of the miter, forked for the screen AIGER
+        screen_miter_file_path: Path to miter_screen.v
+        top_module_name: Top module of the miter
+        miter_stage: Manifest stage of the miter
+        manifest: Optional ArtifactManifest receiving the report
+
+    Returns:
+        SimulationReport: The simulation result
+    """
+    from aiger import read_aiger
+    from aig_simulator import AigSimulator, find_output_literal
+    from verilog_processing import UNSAFE_SINGAL_NAME, BOTH_VALID_SIGNAL_NAME
+
+    screen_compiler = yosys_compiler.fork()
+    screen_compiler.output_formats = ["aiger"]
+    screen_aiger_path = os.path.splitext(screen_miter_file_path)[0] + ".aig"
+    screen_compiler.execute(
+        verilog_file_path=screen_miter_file_path,
+        working_dir=os.path.dirname(screen_miter_file_path),
+        aiger_file_path=screen_aiger_path,
+        top_name=top_module_name,
+        has_symbol=True
+    )
+    aig = read_aiger(screen_aiger_path)
+    start_time = time.perf_counter()
+    report = AigSimulator(aig, word_count=1, seed=args.seed).run(
+        args.prescreen_cycles,
+        unsafe_literal=find_output_literal(aig, UNSAFE_SINGAL_NAME),
+        valid_literal=find_output_literal(aig, BOTH_VALID_SIGNAL_NAME))
+    elapsed_s = round(time.perf_counter() - start_time, 3)
+    if report.failed:
+        print(f"[WARNING] {UNSAFE_SINGAL_NAME} fires at cycle {report.first_failing_cycle} of the random "
+              f"simulation in {report.failing_streams}/{report.streams} streams, the miter is broken")
+    elif report.first_valid_cycle is None:
+        print(f"[WARNING] the miter never has both sides valid within {report.cycles} simulated cycles")
+    else:
+        print(f"[INFO] pre-screen passed in {elapsed_s}s: {report.cycles} cycles, both sides valid in "
+              f"{report.valid_reached_fraction:.0%} of {report.streams} streams from cycle {report.first_valid_cycle}")
+    if manifest is not None:
+        manifest.provenance.setdefault("prescreen", {})[miter_stage] = dict(report.to_dict(), elapsed_s=elapsed_s)
+        manifest.add_artifact(miter_stage, screen_miter_file_path)
+        manifest.add_artifact(miter_stage, screen_compiler.log_file_path)
+        manifest.add_artifact(miter_stage, screen_aiger_path)
+    return report
+
+
+def dedupe_miter_aiger(args, aig, aiger_path, miter_stage, manifest=None):
     """
-    # Parse command line arguments
+    Register the structural hash of the miter AIG in the dedupe index. The
+    inputs and latches are named after the miter ports by the yosys map, so
+    that miters equal up to the AND numbering and the input order share a
+    hash.
+
+    Args:
+        args: Parsed command line arguments
+        aig: The Aiger read from aiger_path, with the map symbols
+        aiger_path: Path to the miter AIGER file
+        miter_stage: Manifest stage of the miter
+        manifest: Optional ArtifactManifest receiving the hash
+
+    Returns:
+        bool: True if an earlier miter has the same hash
+    """
+    from aig_dedupe import AigDedupeIndex
+
+    start_time = time.perf_counter()
+    structural_hash = aig.structural_hash()
+    elapsed_s = round(time.perf_counter() - start_time, 3)
+    dedupe_index = AigDedupeIndex(args.dedupe_db)
+    try:
+        representative = dedupe_index.register(
+            structural_hash,
+            benchmark=f"seed_{args.seed}",
+            miter=miter_stage,
+            aiger_path=os.path.abspath(aiger_path),
+            stats=aig.get_size(),
+            drop_duplicate=args.dedupe == "drop"
+        )
+    finally:
+        dedupe_index.close()
+    if representative is None:
+        print(f"[INFO] AIG structural hash {structural_hash} is new ({elapsed_s}s)")
+    else:
+        print(f"[WARNING] The miter AIG duplicates {representative['benchmark']}/{representative['miter']} "
+              f"(structural hash {structural_hash})")
+    if manifest is not None:
+        manifest.provenance.setdefault("aiger_dedupe", {})[miter_stage] = {
+            "structural_hash": structural_hash,
+            "duplicate_of": None if representative is None else
+                f"{representative['benchmark']}/{representative['miter']}",
+            "elapsed_s": elapsed_s,
+        }
+    return representative is not None
+
+
+def write_dedupe_report(args):
+    """
+    Write the duplicate clusters of the dedupe index to
+    output_dir/dedupe_report.json.
+
+    Returns:
+        dict: The report
+    """
+    from aig_dedupe import AigDedupeIndex
+
+    dedupe_index = AigDedupeIndex(args.dedupe_db)
+    try:
+        report = dedupe_index.get_report()
+    finally:
+        dedupe_index.close()
+    report_path = os.path.join(args.output_dir, "dedupe_report.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"[INFO] {report['miters']} miter AIGs in {args.dedupe_db}: {report['unique']} unique, "
+          f"{report['duplicates']} duplicates in {len(report['clusters'])} clusters, {report['dropped']} dropped")
+    print(f"[INFO] Dedupe report written to {report_path}")
+    return report
+
+
+def reduce_miter_aiger(aig, aiger_path, miter_stage, manifest=None):
+    """
+    Write the miter AIG reduced to the cone of influence of its outputs next
+    to it, as <name>_reduced.aig.
+
+    Args:
+        aig: The Aiger read from aiger_path
+        aiger_path: Path to the miter AIGER file
+        miter_stage: Manifest stage of the miter
+        manifest: Optional ArtifactManifest receiving the reduced file and report
+
+    Returns:
+        str: Path to the reduced AIGER file
+    """
+    from aiger import write_aiger
+
+    reduced, report = aig.reduce()
+    reduced_path = os.path.splitext(aiger_path)[0] + "_reduced.aig"
+    write_aiger(reduced, reduced_path)
+    before, after = report["before"], report["after"]
+    print(f"[INFO] AIGER reduced to {reduced_path}: inputs {before['inputs']} -> {after['inputs']}, "
+          f"latches {before['latches']} -> {after['latches']}, ANDs {before['ands']} -> {after['ands']}, "
+          f"{report['constant_latches']} constant latches")
+    if manifest is not None:
+        manifest.provenance.setdefault("aiger_reduction", {})[miter_stage] = report
+        manifest.add_artifact(miter_stage, reduced_path)
+    return reduced_path
+
+
+def parse_seed_range(seeds_str):
+    """
+    Parse an inclusive seed range.
+
+    Args:
+        seeds_str: Range like "100..163", or a single seed like "7"
+
+    Returns:
+        list: List of seeds in ascending order
+    """
+    tokens = seeds_str.split("..")
+    if len(tokens) == 1:
+        return [int(tokens[0])]
+    if len(tokens) != 2:
+        raise ValueError(f"illegal seed range '{seeds_str}', expected format 'A..B'")
+    first, last = int(tokens[0]), int(tokens[1])
+    if first > last:
+        raise ValueError(f"illegal seed range '{seeds_str}', {first} is larger than {last}")
+    return list(range(first, last + 1))
+
+
+def parse_graph_formats(graph_formats_str):
+    """
+    Parse the comma separated program graph export formats, "none" for no export.
+    """
+    if graph_formats_str == "none":
+        return []
+    graph_formats = [f.strip() for f in graph_formats_str.split(",") if f.strip()]
+    for graph_format in graph_formats:
+        if graph_format not in ("dot", "graphml", "png"):
+            raise ValueError(f"unknown graph format: {graph_format}")
+    return graph_formats
+
+
+def build_arg_parser():
     parser = argparse.ArgumentParser(description='HLS Model Checking Benchmark Generator')
     parser.add_argument('--seed', type=int, default=42, help='Random seed for graph generation (default: 42)')
     parser.add_argument('--output-dir', type=str, default='./output', help='Output directory for generated files (default: ./output)')
@@ -21,127 +740,196 @@ def main():
     parser.add_argument('--project-name', type=str, default='hls_benchmark', help='HLS project name (default: hls_benchmark)')
     parser.add_argument('--top-function', type=str, default='top', help='Top-level function name (default: top)')
     parser.add_argument('--clock-period', type=int, default=10, help='Clock period in nanoseconds (default: 10)')
+    parser.add_argument('--part', type=str, default='xc7z020clg484-1', help='FPGA part of the HLS projects (default: xc7z020clg484-1)')
+    parser.add_argument('--hls-profile', type=str, default='default', choices=['default', 'fast'],
+                        help='Vitis HLS synthesis profile, fast trades QoR for C-to-RTL turnaround (default: default)')
+    parser.add_argument('--hls-log-patterns', type=str, default=None,
+                        help='JSON file of fatal/warning patterns matched on the live vitis_hls log (default: built-in)')
+    parser.add_argument('--metrics-db', type=str, default=None,
+                        help='sqlite database collecting the csynth metrics of every variant (default: none)')
+    parser.add_argument('--tool-replay', type=str, default=None, choices=['record', 'replay'],
+                        help='Run vitis_hls and yosys through stand-ins that record their runs to the fixture '
+                             'directory, or replay recorded runs without the tools installed (default: off)')
+    parser.add_argument('--tool-fixture-dir', type=str, default='tool_fixtures',
+                        help='Fixture directory of --tool-replay (default: tool_fixtures)')
+    parser.add_argument('--retention', type=str, default='keep', choices=['keep', 'pack', 'compress', 'delete'],
+                        help='What happens to the HLS project and miter files the flow does not need once a '
+                             'benchmark finished: keep, pack into a tar, compress into a tar.gz, or delete (default: keep)')
+    parser.add_argument('--variants', type=int, default=2, help='Number of pragma variants generated from one graph (default: 2)')
+    parser.add_argument('--pairs', type=str, default=None, help='Variant pairs to build miters for, e.g. "1-2,1-3" (default: all pairs)')
+    parser.add_argument('--reference-rtl', action='store_true',
+                        help='Lower the graph to Verilog in Python as variant 0 and build HLS vs reference miters, '
+                             'pairs default to 0-1 .. 0-N and a single variant is enough')
+    parser.add_argument('--graph-formats', type=str, default='dot,graphml',
+                        help='Program graph exports, any of dot,graphml,png or "none" (default: dot,graphml)')
+    parser.add_argument('--png-layout', type=str, default='layered', choices=['layered', 'spring'],
+                        help='Layout of the png graph export (default: layered)')
+    corpus_group = parser.add_mutually_exclusive_group()
+    corpus_group.add_argument('--seeds', type=str, default=None,
+                              help='Corpus mode, generate one benchmark per seed of the inclusive range A..B')
+    corpus_group.add_argument('--count', type=int, default=None,
+                              help='Corpus mode, generate N benchmarks with seeds starting at --seed')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of benchmarks generated in parallel in corpus mode (default: 1)')
+    parser.add_argument('--tool-timeout', type=float, default=None,
+                        help='Wall-clock timeout in seconds of every vitis_hls and yosys run (default: none)')
+    parser.add_argument('--tool-memory-mb', type=int, default=None,
+                        help='Address space limit in MB of every vitis_hls and yosys run (default: none)')
+    parser.add_argument('--yosys-workers', type=int, default=0,
+                        help='Run the yosys sessions on N long-lived yosys processes, one pool per corpus worker, '
+                             'instead of one yosys launch per session (default: 0)')
+    parser.add_argument('--hls-cache-dir', type=str, default=None,
+                        help='Directory of the content-addressed HLS result cache (default: no cache)')
+    parser.add_argument('--hls-cache-max-mb', type=int, default=10240,
+                        help='Size bound of the HLS cache, least recently used entries are evicted (default: 10240)')
+    parser.add_argument('--parallel-miter-sides', action='store_true',
+                        help='Merge, flatten, post-process and transform the two sides of a miter on two threads, '
+                             'with one yosys launch per side instead of one for both')
+    parser.add_argument('--yosys-cache-dir', type=str, default=None,
+                        help='Directory of the content-addressed cache of the flattened, processed and AIGER '
+                             'files, keyed on the input content, top, script and yosys version (default: no cache)')
+    parser.add_argument('--aiger-recipe', type=str, default='fast',
+                        choices=['fast', 'balanced', 'strong', 'strong_seq', 'strong_retime', 'liyou'],
+                        help='ABC optimization recipe of the AIGER export, from fast to strong, strong_seq and '
+                             'strong_retime also optimize across latches (default: fast)')
+    parser.add_argument('--output-formats', type=str, default='aiger',
+                        help='Comma separated miter outputs written in one yosys session, from aiger, btor (BTOR2) '
+                             'and smt2; the word-level ones skip the bit-blasting (default: aiger)')
+    parser.add_argument('--prescreen-cycles', type=int, default=0,
+                        help='Simulate every miter on 64 random stimulus streams for N cycles before it is published, '
+                             'reporting a firing unsafe signal or both sides never valid (default: 0, off)')
+    parser.add_argument('--reduce-aiger', action='store_true',
+                        help='Also write miter_reduced.aig, the miter AIG reduced to the cone of influence of its '
+                             'outputs with constants propagated and dangling logic removed')
+    parser.add_argument('--dedupe-db', type=str, default=None,
+                        help='sqlite index of the structural hashes of the miter AIGs, miters equal up to the AND '
+                             'numbering and the input order are duplicates; corpus mode writes dedupe_report.json '
+                             '(default: none)')
+    parser.add_argument('--dedupe', type=str, default='mark', choices=['mark', 'drop'],
+                        help='What happens to a duplicate miter of --dedupe-db: mark it in the index and manifest, '
+                             'or also delete its directory (default: mark)')
+    parser.add_argument('--use-variant-clocks', action='store_true',
+                        help='Synthesize every variant with the clock period drawn for it instead of --clock-period')
+    parser.add_argument('--batch-compile', action='store_true',
+                        help='Synthesize all variants in a single vitis_hls session')
     parser.add_argument('--skip-compilation', action='store_true', help='Skip Vitis HLS compilation step')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose output')
-    
-    args = parser.parse_args()
-    
+    return parser
+
+
+def run_benchmark(args):
+    """
+    Generate, compile and build the miters of a single benchmark.
+
+    Args:
+        args: Parsed command line arguments, args.seed and args.output_dir select the benchmark
+
+    Returns:
+        int: Process exit code, 0 on success
+    """
+    from artifact_manifest import ArtifactManifest
+
+    variant_pairs = parse_variant_pairs(args.pairs, args.variants, args.reference_rtl)
+    graph_formats = parse_graph_formats(args.graph_formats)
+
     # Create output directory if it doesn't exist
     if not os.path.exists(args.output_dir):
         os.makedirs(args.output_dir)
         if args.verbose:
             print(f"[INFO] Created output directory: {args.output_dir}")
-    
-    # Set up file paths for comparison files
-    cpp_file_1_path = os.path.join(args.output_dir, f"benchmark_1.cpp")
-    cpp_file_2_path = os.path.join(args.output_dir, f"benchmark_2.cpp")
-    
+
+    # Provenance (time, host, command line) goes to the sidecar manifest,
+    # the artifacts themselves only depend on the seed and configuration
+    manifest = ArtifactManifest(args.output_dir)
+    manifest.set_config(vars(args))
+    # a corpus worker keeps its yosys pool across benchmarks, only the jobs
+    # of this benchmark are recorded
+    yosys_stats_at_start = None if _yosys_worker_pool is None else _yosys_worker_pool.get_stats()
+
+    # Set up file paths for variant files
+    cpp_file_path_list = [os.path.join(args.output_dir, f"benchmark_{i}.cpp")
+                          for i in range(1, args.variants + 1)]
+
     try:
         # Step 1: Generate random graph
+        from random_graph_manager import RandomGraphManager
         print(f"[INFO] Generating random graph with seed {args.seed}...")
         graph_manager = RandomGraphManager(seed=args.seed)
-        
+
         success = graph_manager.generate_random_graph()
         if not success:
             print("[ERROR] Failed to generate random graph")
             return 1
-        
+
         if args.verbose:
             # Print graph statistics
             graph = graph_manager.program_graph
             op_nodes = graph_manager._get_op_node_list()
             array_nodes = graph_manager._get_array_node_list()
-            
+
             print(f"[INFO] Graph generation completed:")
             print(f"  Total nodes: {graph.number_of_nodes()}")
             print(f"  Total edges: {graph.number_of_edges()}")
             print(f"  Operation nodes: {len(op_nodes)}")
             print(f"  Array nodes: {len(array_nodes)}")
-        
-        # Step 2: Dump C++ comparison files
-        print(f"[INFO] Dumping C++ comparison files...")
-        graph_manager.dump_cpp_comparsion(cpp_file_1_path, cpp_file_2_path)
-        
-        # Validate both C++ files were created
-        files_to_check = [cpp_file_1_path, cpp_file_2_path]
+
+        # Plotting is opt-in, the default exports are linear in the graph size
+        for graph_file in graph_manager.export_graph(args.output_dir, graph_formats,
+                                                     png_layout=args.png_layout):
+            manifest.add_artifact("graph_export", graph_file)
+
+        # Step 2: Dump C++ variant files
+        print(f"[INFO] Dumping {args.variants} C++ variant files...")
+        graph_manager.dump_cpp_variants(cpp_file_path_list)
+
+        # Validate all C++ files were created
         cpp_files_created = []
-        
-        for file_path in files_to_check:
+
+        for file_path in cpp_file_path_list:
             if not os.path.exists(file_path):
                 print(f"[ERROR] Failed to create C++ file: {file_path}")
                 return 1
-            
+
             # Validate file content
             with open(file_path, 'r') as f:
                 content = f.read().strip()
                 if not content:
                     print(f"[ERROR] Generated C++ file is empty: {file_path}")
                     return 1
-            
+
             cpp_files_created.append(file_path)
+            manifest.add_artifact("cpp_generation", file_path)
             print(f"[INFO] C++ file generated successfully: {file_path} ({len(content)} characters)")
-        
-        print(f"[INFO] Generated {len(cpp_files_created)} comparison C++ files")
-        
+
+        print(f"[INFO] Generated {len(cpp_files_created)} variant C++ files")
+
+        reference_result = None
+        if args.reference_rtl:
+            reference_result = generate_reference_rtl(args, graph_manager, manifest)
+
         if args.skip_compilation:
             print("[INFO] Skipping Vitis HLS compilation as requested")
             print(f"[INFO] Generated files:")
             for cpp_file in cpp_files_created:
                 print(f"  C++ source: {cpp_file}")
             return 0
-        
-        # Step 3: Compile with Vitis HLS (compile each file separately)
-        print(f"[INFO] Starting Vitis HLS compilation for {len(cpp_files_created)} files...")
-        
-        all_compile_results = []
-        compilation_success = True
-        
-        for i, cpp_file in enumerate(cpp_files_created, 1):
-            print(f"[INFO] Compiling file {i}/{len(cpp_files_created)}: {os.path.basename(cpp_file)}")
-            
-            # Create separate working directory for each compilation
-            compile_dir = os.path.join(args.output_dir, f"compile_{i}")
-            if not os.path.exists(compile_dir):
-                os.makedirs(compile_dir)
-            
-            # Create separate HLS compiler instance for this file
-            hls_compiler = VitisHLSCompiler(
-                working_dir=compile_dir,
-                hls_script_path=os.path.join(compile_dir, f"hls_script_{i}.tcl"),
-                log_file_path=os.path.join(compile_dir, f"hls_compile_{i}.log")
-            )
-            
-            try:
-                # Compile this specific C++ file
-                compile_result = hls_compiler.compile(
-                    project_name=f"{args.project_name}_{i}",
-                    top_name=args.top_function,
-                    clock_period=args.clock_period,
-                    cpp_file_list=[cpp_file]
-                )
-                
-                compile_result["cpp_file"] = cpp_file
-                compile_result["compile_index"] = i
-                all_compile_results.append(compile_result)
-                
-                if compile_result["success"]:
-                    print(f"[INFO] File {i} compilation completed successfully!")
-                    if args.verbose:
-                        print(f"  Project: {compile_result['project_path']}")
-                        print(f"  Log: {compile_result['log_file']}")
-                        if compile_result["verilog_files"]:
-                            print(f"  HDL files: {len(compile_result['verilog_files'])}")
-                else:
-                    print(f"[ERROR] File {i} compilation failed")
-                    compilation_success = False
-                    if os.path.exists(compile_result["log_file"]):
-                        print(f"[ERROR] Check log file: {compile_result['log_file']}")
-                        
-            except Exception as e:
-                print(f"[ERROR] Exception during compilation of file {i}: {str(e)}")
-                compilation_success = False
-                continue
-        
+
+        # Step 3: Compile with Vitis HLS (compile each paired variant exactly once)
+        compile_indices = sorted({i for pair in variant_pairs for i in pair if i != 0})
+        print(f"[INFO] Starting Vitis HLS compilation for {len(compile_indices)} of {len(cpp_files_created)} files...")
+        clock_periods = None
+        if args.use_variant_clocks:
+            clock_periods = [overlay.clock_period for overlay in graph_manager.pragma_overlays]
+            print(f"[INFO] Using the variant clock periods {clock_periods}")
+        if args.batch_compile:
+            all_compile_results, compilation_success = compile_variants_batch(
+                args, cpp_files_created, manifest, clock_periods, compile_indices)
+        else:
+            all_compile_results, compilation_success = compile_variants(
+                args, cpp_files_created, manifest, clock_periods, compile_indices)
+
+        record_synthesis_metrics(args, all_compile_results, clock_periods)
+
         # Print summary of all compilations
         if compilation_success:
             print("[INFO] All Vitis HLS compilations completed successfully!")
@@ -160,125 +948,220 @@ def main():
         else:
             print("[ERROR] One or more Vitis HLS compilations failed")
             return 1
-        
-        # Step 4: Generate miter using the compiled Verilog files
-        print("[INFO] Starting miter generation...")
-        try:
-            # Ensure we have exactly 2 compilation results for miter generation
-            if len(all_compile_results) != 2:
-                print(f"[WARNING] Miter generation requires exactly 2 compiled files, but got {len(all_compile_results)}. Skipping miter generation.")
-            else:
-                result_1 = all_compile_results[0]
-                result_2 = all_compile_results[1]
-                
-                # Check if both compilations have verilog files
-                if not result_1["verilog_files"] or not result_2["verilog_files"]:
-                    print("[WARNING] One or both compilations have no Verilog files. Skipping miter generation.")
-                else:
-                    # Create miter output directory
-                    miter_output_dir = os.path.join(args.output_dir, "miter")
-                    if not os.path.exists(miter_output_dir):
-                        os.makedirs(miter_output_dir)
-                        if args.verbose:
-                            print(f"[INFO] Created miter output directory: {miter_output_dir}")
-                    
-                    # Validate that all Verilog files exist
-                    verilog_files_1 = result_1["verilog_files"]
-                    verilog_files_2 = result_2["verilog_files"]
-                    
-                    print(f"[INFO] Creating miter from {len(verilog_files_1)} and {len(verilog_files_2)} Verilog files...")
-                    
-                    if args.verbose:
-                        print(f"[INFO] Verilog files from compilation 1:")
-                        for vf in verilog_files_1:
-                            print(f"  {vf}")
-                        print(f"[INFO] Verilog files from compilation 2:")
-                        for vf in verilog_files_2:
-                            print(f"  {vf}")
-                    
-                    # Initialize MiterGenerator
-                    miter_generator = MiterGenerator(
-                        verilog_file_path_list_1=verilog_files_1,
-                        verilog_file_path_list_2=verilog_files_2,
-                        merged_verilog_folder_path=miter_output_dir,
-                        top_name=args.top_function
-                    )
-                    
-                    # Generate the miter
-                    kairos_top = miter_generator.generate_miter(insert_assertions=False)
-                    
-                    print(f"[INFO] Miter generation completed successfully!")
-                    print(f"  Merged file 1: {miter_generator.merged_verilog_file_path_1}")
-                    print(f"  Merged file 2: {miter_generator.merged_verilog_file_path_2}")
-                    print(f"  Miter file: {miter_generator.miter_verilog_file_path}")
-                    if kairos_top:
-                        print(f"  Kairos top module: {kairos_top}")
-                    
-                    # Step 5: Compile miter to AIGER using YosysCompiler
-                    print("[INFO] Starting Yosys compilation to AIGER...")
-                    try:
-                        yosys_compiler = YosysCompiler()
-                        
-                        # Set up AIGER output file path
-                        aiger_output_path = os.path.join(miter_output_dir, "miter.aig")
-                        
-                        # Get the miter file path and top module name
-                        miter_file_path = miter_generator.miter_verilog_file_path
-                        
-                        # Use the kairos_top if available, otherwise default to "top"
-                        top_module_name = kairos_top if kairos_top else "top"
-                        
-                        if args.verbose:
-                            print(f"[INFO] Compiling miter file: {miter_file_path}")
-                            print(f"[INFO] Top module: {top_module_name}")
-                            print(f"[INFO] Output AIGER file: {aiger_output_path}")
-                        
-                        # Execute Yosys compilation
-                        yosys_compiler.execute(
-                            verilog_file_path=miter_file_path,
-                            working_dir=miter_output_dir,
-                            aiger_file_path=aiger_output_path,
-                            top_name=top_module_name
-                        )
-                        
-                        # Verify AIGER file was created
-                        if os.path.exists(aiger_output_path):
-                            file_size = os.path.getsize(aiger_output_path)
-                            print(f"[INFO] AIGER file generated successfully: {aiger_output_path} ({file_size} bytes)")
-                        else:
-                            print(f"[ERROR] AIGER file was not created: {aiger_output_path}")
-                            
-                    except Exception as yosys_e:
-                        print(f"[ERROR] Yosys compilation to AIGER failed: {str(yosys_e)}")
-                        raise yosys_e
-                        if args.verbose:
-                            import traceback
-                            traceback.print_exc()
-                        print("[WARNING] Continuing despite Yosys compilation failure...")
-                    
-        except Exception as e:
 
-            print(f"[ERROR] Miter generation failed: {str(e)}")
-            raise e
-            if args.verbose:
-                import traceback
-                traceback.print_exc()
-            # Don't return error here, as the main compilation was successful
-            print("[WARNING] Continuing despite miter generation failure...")
-            
+        # Step 4: Generate miters for the variant pairs from the shared compile results
+        print(f"[INFO] Starting miter generation for {len(variant_pairs)} variant pairs...")
+        compile_results_by_index = {result["compile_index"]: result for result in all_compile_results}
+        if reference_result is not None:
+            compile_results_by_index[0] = reference_result
+        miter_dir_list = []
+        yosys_cache = create_yosys_cache(args)
+        for i, j in variant_pairs:
+            miter_output_dir = os.path.join(args.output_dir, f"miter_{i}_{j}")
+            miter_dir_list.append(miter_output_dir)
+            try:
+                generate_miter_for_pair(
+                    args,
+                    result_1=compile_results_by_index[i],
+                    result_2=compile_results_by_index[j],
+                    miter_output_dir=miter_output_dir,
+                    manifest=manifest,
+                    yosys_cache=yosys_cache
+                )
+            except Exception as e:
+                print(f"[ERROR] Miter generation for variants {i}-{j} failed: {str(e)}")
+                raise e
+
+        record_cache_stats(yosys_cache, "yosys_cache", manifest)
+        yosys_worker_pool = get_yosys_worker_pool(args)
+        if yosys_worker_pool is not None:
+            yosys_stats = yosys_worker_pool.get_stats(since=yosys_stats_at_start)
+            print(f"[INFO] yosys workers: {yosys_stats['jobs']} jobs in {yosys_stats['job_elapsed_s']}s, "
+                  f"{yosys_stats['worker_starts']} worker starts, {yosys_stats['failed_jobs']} failed jobs")
+            manifest.set_provenance("yosys_workers", yosys_stats)
+
+        # only a finished benchmark is pruned, a failed one stays whole for debugging
+        if args.retention != "keep":
+            apply_retention_policies(args, all_compile_results, miter_dir_list, manifest)
+
     except Exception as e:
         print(f"[ERROR] An error occurred: {str(e)}")
         raise e
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
-        return 1
-    
+    finally:
+        manifest.write()
+
     print("[INFO] Benchmark generation and compilation completed successfully!")
     return 0
 
 
-if __name__ == "__main__":
-    sys.exit(main())
+def _run_corpus_shard(args, seed, shard_dir):
+    """
+    Run one benchmark of the corpus in a worker process. The output of the
+    benchmark goes to the log file of its shard, exceptions are kept in the
+    result instead of aborting the corpus.
+
+    Returns:
+        dict: Result of the benchmark
+    """
+    shard_args = argparse.Namespace(**vars(args))
+    shard_args.seed = seed
+    shard_args.output_dir = shard_dir
+    shard_args.seeds = None
+    shard_args.count = None
+    os.makedirs(shard_dir, exist_ok=True)
+    log_file_path = os.path.join(shard_dir, "run.log")
+
+    result = {"seed": seed, "output_dir": shard_dir, "log_file": log_file_path}
+    start_time = time.perf_counter()
+    with open(log_file_path, "w") as log_file:
+        # redirect at the file descriptor level, so that the tools started by
+        # the benchmark write to the shard log as well
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_stdout_fd = os.dup(1)
+        saved_stderr_fd = os.dup(2)
+        os.dup2(log_file.fileno(), 1)
+        os.dup2(log_file.fileno(), 2)
+        try:
+            exit_code = run_benchmark(shard_args)
+            result["status"] = "success" if exit_code == 0 else "failed"
+            result["exit_code"] = exit_code
+        except Exception as e:
+            traceback.print_exc()
+            result["status"] = "error"
+            result["exit_code"] = None
+            result["error"] = f"{type(e).__name__}: {str(e)}"
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_stdout_fd, 1)
+            os.dup2(saved_stderr_fd, 2)
+            os.close(saved_stdout_fd)
+            os.close(saved_stderr_fd)
+    result["elapsed_s"] = round(time.perf_counter() - start_time, 3)
+    return result
+
+
+def run_corpus(args, seed_list):
+    """
+    Generate one benchmark per seed in a process pool, each into its own
+    shard output_dir/seed_<seed>, and aggregate the results in
+    output_dir/corpus_summary.json.
 
+    Args:
+        args: Parsed command line arguments
+        seed_list: Seeds of the benchmarks
 
+    Returns:
+        int: Process exit code, 0 if every benchmark succeeded
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if args.jobs < 1:
+        raise ValueError(f"illegal job count {args.jobs}")
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"[INFO] Corpus mode: {len(seed_list)} benchmarks with {args.jobs} jobs")
+
+    results = []
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(args.jobs, len(seed_list))) as executor:
+        futures = {executor.submit(_run_corpus_shard, args, seed,
+                                   os.path.join(args.output_dir, f"seed_{seed}")): seed
+                   for seed in seed_list}
+        for future in as_completed(futures):
+            seed = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # the worker process itself died
+                result = {"seed": seed, "status": "error", "exit_code": None,
+                          "error": f"{type(e).__name__}: {str(e)}"}
+            results.append(result)
+            level = "INFO" if result["status"] == "success" else "ERROR"
+            print(f"[{level}] [{len(results)}/{len(seed_list)}] seed {seed}: {result['status']}"
+                  + (f" ({result['error']})" if "error" in result else ""))
+    elapsed_s = time.perf_counter() - start_time
+
+    results.sort(key=lambda result: result["seed"])
+    status_counts = {}
+    for result in results:
+        status_counts[result["status"]] = status_counts.get(result["status"], 0) + 1
+    summary = {
+        "config": vars(args),
+        "benchmark_count": len(results),
+        "status_counts": status_counts,
+        "elapsed_s": round(elapsed_s, 3),
+        "results": results,
+    }
+    if args.dedupe_db is not None:
+        dedupe_report = write_dedupe_report(args)
+        summary["dedupe"] = {name: dedupe_report[name] for name in ["miters", "unique", "duplicates", "dropped"]}
+    summary_path = os.path.join(args.output_dir, "corpus_summary.json")
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2, sort_keys=True, default=str)
+        f.write("\n")
+    print(f"[INFO] Corpus finished in {elapsed_s:.1f}s: "
+          + ", ".join(f"{count} {status}" for status, count in sorted(status_counts.items())))
+    print(f"[INFO] Corpus summary written to {summary_path}")
+    return 0 if status_counts.get("success", 0) == len(results) else 1
+
+
+def main():
+    """
+    Main function to generate random HLS benchmark graphs, dump C++ files, and compile with Vitis HLS.
+    """
+    args = build_arg_parser().parse_args()
+
+    min_variants = 1 if args.reference_rtl else 2
+    if args.variants < min_variants:
+        print(f"[ERROR] At least {min_variants} variants are required, but got {args.variants}")
+        return 1
+    try:
+        parse_variant_pairs(args.pairs, args.variants, args.reference_rtl)
+        parse_graph_formats(args.graph_formats)
+        if args.seeds is not None:
+            seed_list = parse_seed_range(args.seeds)
+        elif args.count is not None:
+            if args.count < 1:
+                raise ValueError(f"illegal benchmark count {args.count}")
+            seed_list = list(range(args.seed, args.seed + args.count))
+        else:
+            seed_list = None
+        if args.jobs < 1:
+            raise ValueError(f"illegal job count {args.jobs}")
+        if args.tool_timeout is not None and args.tool_timeout <= 0:
+            raise ValueError(f"illegal tool timeout {args.tool_timeout}")
+        if args.yosys_workers < 0:
+            raise ValueError(f"illegal yosys worker count {args.yosys_workers}")
+        if args.yosys_workers > 0 and args.tool_replay is not None:
+            raise ValueError("--yosys-workers cannot be combined with --tool-replay, "
+                             "the stand-ins replay single yosys launches")
+        from yosys_compiler import get_output_formats
+        output_formats = get_output_formats(args.output_formats)
+        if args.reduce_aiger and "aiger" not in output_formats:
+            raise ValueError("--reduce-aiger needs the aiger output format")
+        if args.dedupe_db is not None and "aiger" not in output_formats:
+            raise ValueError("--dedupe-db needs the aiger output format")
+        if args.prescreen_cycles < 0:
+            raise ValueError(f"illegal pre-screen cycle count {args.prescreen_cycles}")
+        if args.hls_cache_max_mb <= 0:
+            raise ValueError(f"illegal HLS cache size {args.hls_cache_max_mb}")
+        if args.tool_memory_mb is not None and args.tool_memory_mb <= 0:
+            raise ValueError(f"illegal tool memory limit {args.tool_memory_mb}")
+    except ValueError as e:
+        print(f"[ERROR] {str(e)}")
+        return 1
+
+    try:
+        setup_tool_replay(args)
+    except FileNotFoundError as e:
+        print(f"[ERROR] {str(e)}")
+        return 1
+
+    if seed_list is not None:
+        return run_corpus(args, seed_list)
+    return run_benchmark(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
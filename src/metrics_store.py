@@ -0,0 +1,127 @@
+import sqlite3
+from typing import List, Optional
+from csynth_report import SynthesisMetrics
+
+
+SYNTHESIS_COLUMNS = [
+    ("benchmark", "TEXT NOT NULL"),
+    ("variant", "INTEGER NOT NULL"),
+    ("seed", "INTEGER"),
+    ("clock_period", "INTEGER"),
+    ("profile", "TEXT"),
+    ("cpp_sha256", "TEXT"),
+    ("top_name", "TEXT"),
+    ("part", "TEXT"),
+    ("tool_version", "TEXT"),
+    ("target_clock_ns", "REAL"),
+    ("estimated_clock_ns", "REAL"),
+    ("latency_min", "INTEGER"),
+    ("latency_max", "INTEGER"),
+    ("interval_min", "INTEGER"),
+    ("interval_max", "INTEGER"),
+    ("ff", "INTEGER"),
+    ("lut", "INTEGER"),
+    ("dsp", "INTEGER"),
+    ("bram_18k", "INTEGER"),
+    ("uram", "INTEGER"),
+    ("loop_count", "INTEGER"),
+    ("report_path", "TEXT"),
+]
+
+LOOP_COLUMNS = [
+    ("benchmark", "TEXT NOT NULL"),
+    ("variant", "INTEGER NOT NULL"),
+    ("loop_name", "TEXT NOT NULL"),
+    ("trip_count", "INTEGER"),
+    ("latency_min", "INTEGER"),
+    ("latency_max", "INTEGER"),
+    ("pipeline_ii", "INTEGER"),
+    ("pipeline_depth", "INTEGER"),
+]
+
+
+class MetricsStore:
+    """
+    sqlite store of the synthesis metrics, one row per benchmark and variant
+    in synthesis_metrics and one row per loop in loop_metrics. The corpus
+    workers share one database file, writes wait for the lock.
+    """
+
+    def __init__(self, db_path:str, timeout_s:float = 60.0):
+        if not isinstance(db_path, str):
+            raise TypeError(f"expected str but got {type(db_path)}")
+        if db_path == "":
+            raise ValueError("db_path cannot be empty")
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, timeout=timeout_s)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS synthesis_metrics (" +
+                ", ".join(f"{name} {sql_type}" for name, sql_type in SYNTHESIS_COLUMNS) +
+                ", PRIMARY KEY (benchmark, variant))")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS loop_metrics (" +
+                ", ".join(f"{name} {sql_type}" for name, sql_type in LOOP_COLUMNS) +
+                ", PRIMARY KEY (benchmark, variant, loop_name))")
+
+    def close(self):
+        self.connection.close()
+
+    def add_metrics(self, benchmark:str, variant:int, metrics:SynthesisMetrics,
+                    seed:Optional[int] = None, clock_period:Optional[int] = None,
+                    profile:Optional[str] = None, cpp_sha256:Optional[str] = None):
+        """
+        Insert or replace the metrics of one variant of a benchmark.
+        """
+        if not isinstance(metrics, SynthesisMetrics):
+            raise TypeError(f"expected SynthesisMetrics but got {type(metrics)}")
+        row = dict(metrics.to_dict())
+        del row["loops"]
+        row.update({"benchmark": benchmark, "variant": variant, "seed": seed,
+                    "clock_period": clock_period, "profile": profile, "cpp_sha256": cpp_sha256,
+                    "loop_count": len(metrics.loops)})
+        column_names = [name for name, _ in SYNTHESIS_COLUMNS]
+        with self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO synthesis_metrics ({', '.join(column_names)}) "
+                f"VALUES ({', '.join('?' for _ in column_names)})",
+                [row[name] for name in column_names])
+            self.connection.execute("DELETE FROM loop_metrics WHERE benchmark = ? AND variant = ?",
+                                    (benchmark, variant))
+            self.connection.executemany(
+                "INSERT INTO loop_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(benchmark, variant, loop.name, loop.trip_count, loop.latency_min,
+                  loop.latency_max, loop.pipeline_ii, loop.pipeline_depth) for loop in metrics.loops])
+
+    def query(self, where:str = "", params:tuple = (), order_by:Optional[str] = None,
+              descending:bool = False, limit:Optional[int] = None) -> List[dict]:
+        """
+        Select synthesis_metrics rows.
+
+        Args:
+            where: Optional SQL condition, e.g. "latency_max < ? AND ff < ?"
+            params: Parameters of the condition
+            order_by: Column to sort on
+            descending: Sort in descending order
+            limit: Maximum number of rows
+
+        Returns:
+            list: One dict per row
+        """
+        sql = "SELECT * FROM synthesis_metrics"
+        if where != "":
+            sql += f" WHERE {where}"
+        if order_by is not None:
+            if order_by not in [name for name, _ in SYNTHESIS_COLUMNS]:
+                raise ValueError(f"unknown column {order_by}")
+            sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, benchmark, variant"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def get_loops(self, benchmark:str, variant:int) -> List[dict]:
+        return [dict(row) for row in self.connection.execute(
+            "SELECT * FROM loop_metrics WHERE benchmark = ? AND variant = ? ORDER BY loop_name",
+            (benchmark, variant))]
@@ -1,12 +1,17 @@
 import os
-from verilog_processing import kairos_preprocess
+from concurrent.futures import ThreadPoolExecutor
+from verilog_processing import kairos_transform, kairos_construct
 from kairos_pre_processor import KairosPreprocessor
+from yosys_compiler import YosysCompiler
 import re
 class MiterGenerator:
     def __init__(self, verilog_file_path_list_1:list[str],
                  verilog_file_path_list_2:list[str],
                  merged_verilog_folder_path:str,
-                 top_name:str):
+                 top_name:str,
+                 yosys_compiler:YosysCompiler = None,
+                 parallel_sides:bool = False,
+                 write_screen_miter:bool = False):
         if not isinstance(verilog_file_path_list_1, list):
             raise TypeError()
         if not isinstance(verilog_file_path_list_2, list):
@@ -36,56 +41,99 @@ class MiterGenerator:
         self.merged_verilog_file_path_1_proc = os.path.join(merged_verilog_folder_path,"merged_1_proc.v")
         self.merged_verilog_file_path_2_proc = os.path.join(merged_verilog_folder_path,"merged_2_proc.v")
         self.miter_verilog_file_path = os.path.join(merged_verilog_folder_path, "miter.v")
+        # the miter with both_valid as a second output, for the simulation pre-screen
+        self.write_screen_miter = write_screen_miter
+        self.screen_miter_verilog_file_path = os.path.join(merged_verilog_folder_path, "miter_screen.v")
         self.working_dir = merged_verilog_folder_path
         self.top_name = top_name
+        self.flatten_log_file_path = os.path.join(merged_verilog_folder_path, "flatten_yosys.log")
+        self.yosys_compiler = YosysCompiler() if yosys_compiler is None else yosys_compiler
+        # run the two sides on their own threads, each with its own yosys launch,
+        # instead of flattening both in one launch
+        self.parallel_sides = parallel_sides
+        self.yosys_log_file_path_list = []
         self.kpp1 = None
         self.kpp2 = None
 
-    def _merge_verilog(self):
-        print("[INFO] start merge verilog")
-        with open(self.merged_verilog_file_path_1, 'w') as outfile1:
-            for fname in self.verilog_file_path_list_1:
+    def _merge_side(self, verilog_file_path_list, merged_verilog_file_path):
+        with open(merged_verilog_file_path, 'w') as outfile:
+            for fname in verilog_file_path_list:
                 with open(fname) as infile:
-                    outfile1.write(infile.read())
-                    outfile1.write('\n')
+                    outfile.write(infile.read())
+                    outfile.write('\n')
 
-        with open(self.merged_verilog_file_path_2, 'w') as outfile2:
-            for fname in self.verilog_file_path_list_2:
-                with open(fname) as infile:
-                    outfile2.write(infile.read())
-                    outfile2.write('\n')
+    def _merge_verilog(self):
+        print("[INFO] start merge verilog")
+        self._merge_side(self.verilog_file_path_list_1, self.merged_verilog_file_path_1)
+        self._merge_side(self.verilog_file_path_list_2, self.merged_verilog_file_path_2)
         print("[INFO] finisihed merge verilog")
 
-    def _generate_miter(self, insert_assertions=False):
-        print("[INFO] start generate miter")
-        self._merge_verilog()
-
-        self.kpp1 = KairosPreprocessor(
-            working_dir=self.working_dir,
-            top_name=self.top_name,
-            verilog_file_path_before_preprocess=self.merged_verilog_file_path_1,
-            verilog_file_path_after_preprocess=self.merged_verilog_file_path_1_proc
-        )
-        self.kpp1.process()
-        self.kpp2 = KairosPreprocessor(
+    def _create_preprocessor(self, merged_verilog_file_path, merged_verilog_file_path_proc, yosys_compiler):
+        return KairosPreprocessor(
             working_dir=self.working_dir,
             top_name=self.top_name,
-            verilog_file_path_before_preprocess=self.merged_verilog_file_path_2,
-            verilog_file_path_after_preprocess=self.merged_verilog_file_path_2_proc
+            verilog_file_path_before_preprocess=merged_verilog_file_path,
+            verilog_file_path_after_preprocess=merged_verilog_file_path_proc,
+            yosys_compiler=yosys_compiler
         )
-        self.kpp2.process()
 
-        if not os.path.exists(self.merged_verilog_file_path_1):
-            raise FileNotFoundError()
-        if not os.path.exists(self.merged_verilog_file_path_2):
-            raise FileNotFoundError()
+    def _preprocess_in_one_session(self):
+        self._merge_verilog()
+        self.kpp1 = self._create_preprocessor(self.merged_verilog_file_path_1,
+                                              self.merged_verilog_file_path_1_proc, self.yosys_compiler)
+        self.kpp2 = self._create_preprocessor(self.merged_verilog_file_path_2,
+                                              self.merged_verilog_file_path_2_proc, self.yosys_compiler)
+        # the sides missing from the yosys cache are flattened in one yosys launch
+        pending_kpp_list = [kpp for kpp in (self.kpp1, self.kpp2) if not kpp.restore_from_cache()]
+        if len(pending_kpp_list) > 0:
+            self.yosys_compiler.begin_session(self.working_dir)
+            for kpp in pending_kpp_list:
+                kpp.add_flatten(self.yosys_compiler)
+            self.yosys_compiler.run_session(self.flatten_log_file_path)
+            self.yosys_log_file_path_list.append(self.flatten_log_file_path)
+        elif os.path.exists(self.flatten_log_file_path):
+            # no stale log of an earlier run next to the cached files
+            os.remove(self.flatten_log_file_path)
+        for kpp in pending_kpp_list:
+            kpp.post_process()
+            kpp.store_in_cache()
+        return [kairos_transform(self.merged_verilog_file_path_1_proc),
+                kairos_transform(self.merged_verilog_file_path_2_proc)]
+
+    def _preprocess_side(self, side):
+        # merge, flatten, post-process and transform one side, only its own files are touched
+        verilog_file_path_list, merged_verilog_file_path, merged_verilog_file_path_proc = [
+            (self.verilog_file_path_list_1, self.merged_verilog_file_path_1, self.merged_verilog_file_path_1_proc),
+            (self.verilog_file_path_list_2, self.merged_verilog_file_path_2, self.merged_verilog_file_path_2_proc),
+        ][side - 1]
+        self._merge_side(verilog_file_path_list, merged_verilog_file_path)
+        kpp = self._create_preprocessor(merged_verilog_file_path, merged_verilog_file_path_proc,
+                                        self.yosys_compiler.fork())
+        log_file_path = os.path.splitext(kpp.verilog_file_path_mid)[0] + "_yosys.log"
+        if not kpp.process():
+            self.yosys_log_file_path_list.append(log_file_path)
+        elif os.path.exists(log_file_path):
+            os.remove(log_file_path)
+        return kpp, kairos_transform(merged_verilog_file_path_proc)
+
+    def _preprocess_in_parallel(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            (self.kpp1, middle_1), (self.kpp2, middle_2) = executor.map(self._preprocess_side, [1, 2])
+        return [middle_1, middle_2]
+
+    def _generate_miter(self, insert_assertions=False):
+        print("[INFO] start generate miter")
+        self.yosys_log_file_path_list = []
         try:
-            kairos_top = kairos_preprocess(
-                src_file_1=self.merged_verilog_file_path_1_proc,
-                src_file_2=self.merged_verilog_file_path_2_proc,
-                dst_file=self.miter_verilog_file_path,
-                fast_slow_mode=True
-            )
+            if self.parallel_sides:
+                middle_1, middle_2 = self._preprocess_in_parallel()
+            else:
+                middle_1, middle_2 = self._preprocess_in_one_session()
+            kairos_top = kairos_construct(middle_1, middle_2, self.miter_verilog_file_path,
+                                          fast_slow_mode=True)
+            if self.write_screen_miter:
+                kairos_construct(middle_1, middle_2, self.screen_miter_verilog_file_path,
+                                 fast_slow_mode=True, expose_valid=True)
         except Exception as e:
             print(f"[ERROR] src_file_1 = {self.merged_verilog_file_path_1_proc}")
             print(f"[ERROR] src_file_2 = {self.merged_verilog_file_path_2_proc}")
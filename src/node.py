@@ -98,6 +98,31 @@ class BranchNode(Node):
     def __hash__(self):
         return hash(self.name)
 
+@dataclass
+class LoopPragma:
+    """
+    The pragma settings of a single loop, kept apart from the LoopNode so that
+    several variants can share one program graph.
+    """
+    is_pipelined : bool = False
+    is_flattened : bool = False
+    is_unrolled : bool = False
+    is_fully_unrolled : bool = False
+    unroll_factor : int = 1
+
+    def check_pragma_status(self):
+        if self.is_unrolled:
+            if self.unroll_factor <= 1:
+                raise ValueError("illegal loop pragma, when unrolled but with factor <= 1 "+\
+                                 f"loop pragma: {self.__repr__()}")
+        else:
+            if self.unroll_factor != 1:
+                raise ValueError("illegal loop pragma, when not unrolled but with factor != 1 "+\
+                                 f"loop pragma: {self.__repr__()}")
+            if self.is_fully_unrolled:
+                raise ValueError("illegal loop pragma, when not unrolled but with fully unrolled set true "+\
+                                 f"loop pragma: {self.__repr__()}")
+
 @dataclass
 class LoopNode(Node):
     start_index : Union[int, 'OpNode']
@@ -113,6 +138,24 @@ class LoopNode(Node):
 
     def get_loop_var_name(self):
         return f"{self.name}_loop_var"
+
+    def get_pragma(self) -> LoopPragma:
+        return LoopPragma(
+            is_pipelined=self.is_pipelined,
+            is_flattened=self.is_flattened,
+            is_unrolled=self.is_unrolled,
+            is_fully_unrolled=self.is_fully_unrolled,
+            unroll_factor=self.unroll_factor
+        )
+
+    def apply_pragma(self, loop_pragma:LoopPragma):
+        if not isinstance(loop_pragma, LoopPragma):
+            raise TypeError(f"expected LoopPragma but got {type(loop_pragma)}")
+        self.is_pipelined = loop_pragma.is_pipelined
+        self.is_flattened = loop_pragma.is_flattened
+        self.is_unrolled = loop_pragma.is_unrolled
+        self.is_fully_unrolled = loop_pragma.is_fully_unrolled
+        self.unroll_factor = loop_pragma.unroll_factor
     
     def __hash__(self):
         # Handle the case where start_index or end_index might be OpNode objects
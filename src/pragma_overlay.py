@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from typing import Dict
+from node import LoopNode, LoopPragma
+
+
+@dataclass
+class PragmaOverlay:
+    """
+    Per-variant pragma settings layered on top of the shared program graph.
+
+    The program graph itself is never copied; each variant only records the
+    LoopPragma of every loop (keyed by the loop node name) and its clock period.
+    """
+    loop_pragmas : Dict[str, LoopPragma] = field(default_factory=dict)
+    clock_period : int = 10
+
+    def set_loop_pragma(self, loop_node:LoopNode, loop_pragma:LoopPragma):
+        if not isinstance(loop_node, LoopNode):
+            raise TypeError(f"expected LoopNode but got {type(loop_node)}")
+        if not isinstance(loop_pragma, LoopPragma):
+            raise TypeError(f"expected LoopPragma but got {type(loop_pragma)}")
+        if loop_node.name == "":
+            raise ValueError("loop node should be named before setting its pragma")
+        loop_pragma.check_pragma_status()
+        self.loop_pragmas[loop_node.name] = loop_pragma
+
+    def get_loop_pragma(self, loop_node:LoopNode) -> LoopPragma:
+        if not isinstance(loop_node, LoopNode):
+            raise TypeError(f"expected LoopNode but got {type(loop_node)}")
+        if loop_node.name not in self.loop_pragmas:
+            raise KeyError(f"no pragma recorded for loop node {loop_node.name}")
+        return self.loop_pragmas[loop_node.name]
+
+    def covers(self, loop_node_list) -> bool:
+        return all(n.name in self.loop_pragmas for n in loop_node_list)
@@ -6,8 +6,8 @@ from dataclasses import dataclass
 from random_type_generator import RandomTypeGenerator
 from random_op_type_generator import RandomOpTypeGenerator
 import random
+import hashlib
 import networkx as nx
-import numpy as np
 from node import QuantizationMode, OverflowMode
 from random_pragma_generator import RandomPragmaGenerator
 # from typing import overload
@@ -180,6 +180,9 @@ class RandomGraphManager(GraphManager):
         
         if len(l) == 1:
             return l[0]
+
+        # imported here, so that only the generation itself pays for numpy
+        import numpy as np
         
         # Create indices for the list
         indices = np.arange(len(l))
@@ -550,8 +553,8 @@ class RandomGraphManager(GraphManager):
             self.dump_cpp_std("output.cpp")
 
     
-    def _set_loop_node_pragmas(self, loop_node):
-        self.rand_pg_gen.generate_pragma_for_loop_node(loop_node=loop_node)
+    def _generate_loop_pragma(self, loop_node):
+        return self.rand_pg_gen.generate_loop_pragma()
 
     def _set_design_cp_in_ns(self):
         return self.rand_pg_gen.generate_cp_ns()
@@ -565,60 +568,41 @@ class RandomGraphManager(GraphManager):
         self.rand_op_type_gen = RandomOpTypeGenerator()
         self.rand_pg_gen = RandomPragmaGenerator()
 
-    def _copy_graph_and_insert_pragmas(self):
+    def _get_variant_seed(self, i:int, stream:str) -> int:
         """
-        Override parent method to ensure different pragma generation for comparison files.
-        This method creates two copies of the graph and inserts different random pragmas
-        into each copy by using different random seeds.
+        Derived seed of variant i for the "pragma" or the "clock" stream.
+        Variants 1 and 2 keep the seed*2+i and seed*3+i of the comparison
+        pair, from variant 3 on these collide with the neighbouring seeds,
+        so the seed is taken from a hash of (seed, stream, i).
         """
-        import copy
-        print("[INFO] call RandomGraphManager::_copy_graph_and_insert_pragmas")
-        
-        # Create deep copies of the graph to ensure node objects are independent
-        self.program_graph_copy_1 = nx.MultiDiGraph()
-        self.program_graph_copy_2 = nx.MultiDiGraph()
-        
-        # Deep copy nodes to ensure independence
-        node_mapping_1 = {}
-        node_mapping_2 = {}
-        
-        for node in self.program_graph.nodes():
-            node_copy_1 = copy.deepcopy(node)
-            node_copy_2 = copy.deepcopy(node)
-            self.program_graph_copy_1.add_node(node_copy_1)
-            self.program_graph_copy_2.add_node(node_copy_2)
-            node_mapping_1[node] = node_copy_1
-            node_mapping_2[node] = node_copy_2
-        
-        # Copy edges using the new node mappings
-        for edge in self.program_graph.edges(data=True):
-            source, target, data = edge
-            self.program_graph_copy_1.add_edge(node_mapping_1[source], node_mapping_1[target], **data)
-            self.program_graph_copy_2.add_edge(node_mapping_2[source], node_mapping_2[target], **data)
+        if i <= 2:
+            return self.seed * {"pragma": 2, "clock": 3}[stream] + i
+        digest = hashlib.sha256(f"{self.seed}/{stream}/{i}".encode()).digest()
+        return int.from_bytes(digest[:8], "little")
+
+    def _generate_pragma_overlays(self, variant_count:int = 2):
+        """
+        Override parent method to ensure different pragma generation for every variant.
+        This method creates one pragma overlay per variant over the shared graph by
+        using a different derived random seed for each, the graph itself is not copied.
+        """
+        print("[INFO] call RandomGraphManager::_generate_pragma_overlays")
 
         # Save current random state
         current_state = random.getstate()
-        
-        # Generate pragmas for copy 1 with original seed
-        random.seed(self.seed * 2 + 1)  # Use a derived seed for copy 1
-        self._insert_pragmas_to_graph(self.program_graph_copy_1)
-        
-        # Generate pragmas for copy 2 with different seed
-        random.seed(self.seed * 2 + 2)  # Use a different derived seed for copy 2
-        self._insert_pragmas_to_graph(self.program_graph_copy_2)
-        
-        # Restore random state
-        random.setstate(current_state)
 
-        # Generate different clock period values
-        random.seed(self.seed * 3 + 1)
-        self.cp_1 = self._set_design_cp_in_ns()
-        random.seed(self.seed * 3 + 2) 
-        self.cp_2 = self._set_design_cp_in_ns()
+        self.pragma_overlays = []
+        for i in range(1, variant_count + 1):
+            # Generate pragmas for variant i with a derived seed
+            random.seed(self._get_variant_seed(i, "pragma"))
+            pragma_overlay = self._generate_pragma_overlay()
+
+            # Generate the clock period of variant i with another derived seed
+            random.seed(self._get_variant_seed(i, "clock"))
+            pragma_overlay.clock_period = self._set_design_cp_in_ns()
+            self.pragma_overlays.append(pragma_overlay)
         
-        # Restore random state again
+        # Restore random state
         random.setstate(current_state)
 
-        print("[INFO] end call RandomGraphManager::_copy_graph_and_insert_pragmas")
-
-
+        print("[INFO] end call RandomGraphManager::_generate_pragma_overlays")
@@ -1,6 +1,6 @@
 
 
-from node import LoopNode
+from node import LoopNode, LoopPragma
 import random
 
 class RandomPragmaGenerator:
@@ -9,22 +9,28 @@ class RandomPragmaGenerator:
         # do a equal random binary choice that return boolean
         return random.choice([True, False])
 
-    def generate_pragma_for_loop_node(self, loop_node:LoopNode):
-        if not isinstance(loop_node, LoopNode):
-            raise TypeError(f"unexpected type for loop node type is {type(loop_node)}")
-        loop_node.is_pipelined = self._random_binary_choice()
-        loop_node.is_flattened = self._random_binary_choice()
-        loop_node.is_unrolled = self._random_binary_choice()
+    def generate_loop_pragma(self) -> LoopPragma:
+        loop_pragma = LoopPragma()
+        loop_pragma.is_pipelined = self._random_binary_choice()
+        loop_pragma.is_flattened = self._random_binary_choice()
+        loop_pragma.is_unrolled = self._random_binary_choice()
 
-        if not loop_node.is_unrolled:
-            loop_node.unroll_factor = 1
-            loop_node.is_fully_unrolled = False
+        if not loop_pragma.is_unrolled:
+            loop_pragma.unroll_factor = 1
+            loop_pragma.is_fully_unrolled = False
         else:
-            loop_node.is_fully_unrolled = self._random_binary_choice()
-            if not loop_node.is_fully_unrolled:
-                loop_node.unroll_factor = random.choice([2, 4, 8, 16, 32])
+            loop_pragma.is_fully_unrolled = self._random_binary_choice()
+            if not loop_pragma.is_fully_unrolled:
+                loop_pragma.unroll_factor = random.choice([2, 4, 8, 16, 32])
             else:
-                loop_node.unroll_factor = 999
+                loop_pragma.unroll_factor = 999
+        loop_pragma.check_pragma_status()
+        return loop_pragma
+
+    def generate_pragma_for_loop_node(self, loop_node:LoopNode):
+        if not isinstance(loop_node, LoopNode):
+            raise TypeError(f"unexpected type for loop node type is {type(loop_node)}")
+        loop_node.apply_pragma(self.generate_loop_pragma())
         loop_node.check_pragma_status()
 
 
@@ -0,0 +1,546 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from node import OpNode, OperationType, ResultDataType, QuantizationMode, OverflowMode
+from node import LoopNode, BranchNode, ArrayNode
+
+
+@dataclass
+class ApType:
+    """
+    A C++ arbitrary precision type, ap_int<W> and ap_uint<W> are fixed point
+    types without fractional bits.
+    """
+    width : int
+    frac : int
+    signed : bool
+    is_fixed : bool = False
+    rounding_mode : Optional[QuantizationMode] = None
+    wrap_mode : Optional[OverflowMode] = None
+
+
+@dataclass
+class Wire:
+    name : str
+    width : int
+    # (primitive, operands ...), the operands are wires or ints
+    expr : tuple
+
+
+@dataclass
+class Value:
+    # a wire holding the raw bits of a value, the number is raw * 2^-frac
+    wire : Wire
+    frac : int
+    signed : bool
+
+    @property
+    def width(self):
+        return self.wire.width
+
+
+def get_ap_type(node:OpNode) -> ApType:
+    if node.result_type == ResultDataType.AP_INT:
+        return ApType(width=node.result_width, frac=0, signed=True)
+    if node.result_type == ResultDataType.AP_UINT:
+        return ApType(width=node.result_width, frac=0, signed=False)
+    if node.result_type == ResultDataType.AP_FIXED:
+        if not isinstance(node.result_rounding_mode, QuantizationMode):
+            raise TypeError(f"expected QuantizationMode but got {type(node.result_rounding_mode)}")
+        if not isinstance(node.result_wrap_mode, OverflowMode):
+            raise TypeError(f"expected OverflowMode but got {type(node.result_wrap_mode)}")
+        return ApType(width=node.result_width, frac=node.result_width - node.result_int_width_ap_fixed,
+                      signed=True, is_fixed=True, rounding_mode=node.result_rounding_mode,
+                      wrap_mode=node.result_wrap_mode)
+    raise ValueError(f"Unsupported result_type: {node.result_type}")
+
+
+def _mask(width:int):
+    return (1 << width) - 1
+
+
+class ReferenceRTLGenerator:
+    """
+    Lowers a loop-free program graph straight to a Verilog module, without
+    Vitis HLS, so that one side of a miter costs no tool run.
+
+    Every op node keeps the C++ semantics of the generated code: the operands
+    are combined at the exact width of the ap_int/ap_fixed result type, and
+    the result is converted to the type of the node, with the quantization
+    and overflow mode of an ap_fixed node. The graph is first lowered to a
+    netlist of bit-vector primitives, which is printed as Verilog and can be
+    evaluated in Python by simulate.
+
+    The module has the ports of a Vitis HLS top with the default ap_ctrl_hs
+    block protocol: ap_clk, ap_rst, ap_start, ap_done, ap_idle, ap_ready,
+    one port per scalar input and <output> with <output>_ap_vld. It computes
+    the output combinationally, like a Vitis top of latency 0.
+    """
+
+    def __init__(self, graph_manager, top_name:Optional[str] = None):
+        self.graph_manager = graph_manager
+        self.top_name = graph_manager.get_function_name() if top_name is None else top_name
+        if not isinstance(self.top_name, str):
+            raise TypeError(f"expected str but got {type(self.top_name)}")
+        if self.top_name == "":
+            raise ValueError("top_name cannot be empty")
+        self.wires : List[Wire] = []
+        self.input_list : List[OpNode] = []
+        self.output_list : List[OpNode] = []
+        self.node_values : Dict[OpNode, Value] = {}
+        self._wire_counter = 0
+        self._lowered = False
+
+    # netlist primitives, every one adds a wire and returns it
+
+    def _new_wire(self, width:int, expr:tuple, name:Optional[str] = None):
+        if width <= 0:
+            raise ValueError(f"illegal wire width {width}")
+        if name is None:
+            name = f"t_{self._wire_counter}"
+            self._wire_counter += 1
+        self.wires.append(Wire(name=name, width=width, expr=expr))
+        return self.wires[-1]
+
+    def _const(self, value:int, width:int):
+        return self._new_wire(width, ("const", value & _mask(width)))
+
+    def _sext(self, wire:Wire, width:int):
+        if width == wire.width:
+            return wire
+        if width < wire.width:
+            raise ValueError(f"cannot sign extend {wire.width} bits to {width}")
+        return self._new_wire(width, ("sext", wire))
+
+    def _zext(self, wire:Wire, width:int):
+        if width == wire.width:
+            return wire
+        if width < wire.width:
+            raise ValueError(f"cannot zero extend {wire.width} bits to {width}")
+        return self._new_wire(width, ("zext", wire))
+
+    def _slice(self, wire:Wire, low:int, width:int):
+        if low == 0 and width == wire.width:
+            return wire
+        if low < 0 or low + width > wire.width:
+            raise ValueError(f"illegal slice [{low + width - 1}:{low}] of {wire.width} bits")
+        return self._new_wire(width, ("slice", wire, low))
+
+    def _binary(self, primitive:str, wire_a:Wire, wire_b:Wire):
+        if wire_a.width != wire_b.width:
+            raise ValueError(f"{primitive} of {wire_a.width} and {wire_b.width} bits")
+        width = 1 if primitive in ("eq", "slt") else wire_a.width
+        return self._new_wire(width, (primitive, wire_a, wire_b))
+
+    def _not(self, wire:Wire):
+        return self._new_wire(wire.width, ("not", wire))
+
+    def _shift(self, primitive:str, wire:Wire, amount:Wire):
+        # the amount is unsigned and may be wider than the shifted wire
+        return self._new_wire(wire.width, (primitive, wire, amount))
+
+    def _mux(self, select:Wire, wire_1:Wire, wire_0:Wire):
+        if wire_1.width != wire_0.width or select.width != 1:
+            raise ValueError("illegal mux operands")
+        return self._new_wire(wire_1.width, ("mux", select, wire_1, wire_0))
+
+    def _concat(self, wire_high:Wire, wire_low:Wire):
+        return self._new_wire(wire_high.width + wire_low.width, ("concat", wire_high, wire_low))
+
+    def _is_zero(self, wire:Wire):
+        return self._binary("eq", wire, self._const(0, wire.width))
+
+    # values
+
+    def _make_value(self, wire:Wire, frac:int, signed:bool):
+        return Value(wire=wire, frac=frac, signed=signed)
+
+    def _to_signed(self, value:Value):
+        # an unsigned value gets a zero sign bit, the result is signed and exact
+        wire = value.wire
+        if value.signed:
+            return wire
+        return self._zext(wire, wire.width + 1)
+
+    def _align(self, value:Value, frac:int, width:int):
+        # the exact value with frac fractional bits, as a signed width-bit wire
+        shift = frac - value.frac
+        if shift < 0:
+            raise ValueError(f"cannot align {value.frac} fractional bits to {frac}")
+        wire = self._sext(self._to_signed(value), width - shift)
+        if shift == 0:
+            return wire
+        return self._shift("shl", self._sext(wire, width), self._const(shift, 32))
+
+    def _int_bits(self, value:Value):
+        # bits above the binary point, including a sign bit
+        return value.width + (0 if value.signed else 1) - value.frac
+
+    def _lower_arith(self, op_type:OperationType, value_a:Value, value_b:Value):
+        frac = max(value_a.frac, value_b.frac)
+        int_bits = max(self._int_bits(value_a), self._int_bits(value_b))
+        if op_type in (OperationType.ADD, OperationType.SUB):
+            width = int_bits + 1 + frac
+            primitive = "add" if op_type == OperationType.ADD else "sub"
+            wire = self._binary(primitive, self._align(value_a, frac, width), self._align(value_b, frac, width))
+            return self._make_value(wire, frac, True)
+        if op_type == OperationType.MUL:
+            wire_a = self._to_signed(value_a)
+            wire_b = self._to_signed(value_b)
+            width = wire_a.width + wire_b.width
+            wire = self._binary("mul", self._sext(wire_a, width), self._sext(wire_b, width))
+            return self._make_value(wire, value_a.frac + value_b.frac, True)
+        width = int_bits + frac
+        wire_a = self._align(value_a, frac, width)
+        wire_b = self._align(value_b, frac, width)
+        if op_type in (OperationType.AND, OperationType.OR, OperationType.XOR):
+            wire = self._binary(op_type.value.lower(), wire_a, wire_b)
+            return self._make_value(wire, frac, True)
+        compare_map = {
+            OperationType.EQ: lambda: self._binary("eq", wire_a, wire_b),
+            OperationType.NEQ: lambda: self._not(self._binary("eq", wire_a, wire_b)),
+            OperationType.LT: lambda: self._binary("slt", wire_a, wire_b),
+            OperationType.GT: lambda: self._binary("slt", wire_b, wire_a),
+            OperationType.LE: lambda: self._not(self._binary("slt", wire_b, wire_a)),
+            OperationType.GE: lambda: self._not(self._binary("slt", wire_a, wire_b)),
+        }
+        if op_type in compare_map:
+            # a bool, converted like ap_uint<1>
+            return self._make_value(compare_map[op_type](), 0, False)
+        raise NotImplementedError(f"Operation {op_type} not supported.")
+
+    def _trunc_to_int(self, value:Value):
+        # C++ conversion of an ap_fixed to an integer, rounds toward zero
+        wire = self._to_signed(value)
+        if value.frac == 0:
+            return wire
+        floor_wire = self._shift("ashr", wire, self._const(value.frac, 32))
+        is_negative = self._slice(wire, wire.width - 1, 1)
+        has_frac = self._not(self._is_zero(self._slice(wire, 0, value.frac)))
+        increment = self._binary("and", is_negative, has_frac)
+        return self._binary("add", floor_wire, self._zext(increment, wire.width))
+
+    def _lower_shift(self, op_type:OperationType, value_a:Value, value_b:Value, type_a:ApType, type_b:ApType):
+        # the result has the type of the left operand, a negative amount
+        # shifts the other way
+        if type_b.is_fixed:
+            amount = self._trunc_to_int(value_b)
+            amount_signed = True
+        elif type_a.is_fixed:
+            # ap_fixed << ap_int goes through to_int(), a 32-bit int
+            amount = value_b.wire
+            amount_signed = value_b.signed or value_b.width >= 32
+        else:
+            amount = value_b.wire
+            amount_signed = value_b.signed
+        wire_a = value_a.wire
+        if amount_signed:
+            amount = self._sext(amount, amount.width + 1)
+            is_negative = self._slice(amount, amount.width - 1, 1)
+            magnitude = self._mux(is_negative, self._binary("sub", self._const(0, amount.width), amount), amount)
+        else:
+            is_negative = None
+            magnitude = amount
+        right_primitive = "ashr" if value_a.signed else "lshr"
+        left_wire = self._shift("shl", wire_a, magnitude)
+        right_wire = self._shift(right_primitive, wire_a, magnitude)
+        if op_type == OperationType.SHL:
+            wire = left_wire if is_negative is None else self._mux(is_negative, right_wire, left_wire)
+        else:
+            wire = right_wire if is_negative is None else self._mux(is_negative, left_wire, right_wire)
+        return self._make_value(wire, value_a.frac, value_a.signed)
+
+    def _rounding_increment(self, mode:QuantizationMode, wire:Wire, drop:int, floor_wire:Wire):
+        # the quantization rules of ap_fixed, on the first dropped bit, the
+        # other dropped bits, the source sign and the kept lsb
+        if mode == QuantizationMode.AP_TRN:
+            return self._const(0, 1)
+        first_dropped = self._slice(wire, drop - 1, 1)
+        rest_dropped = self._const(0, 1) if drop < 2 else \
+            self._not(self._is_zero(self._slice(wire, 0, drop - 1)))
+        is_negative = self._slice(wire, wire.width - 1, 1)
+        if mode == QuantizationMode.AP_TRN_ZERO:
+            return self._binary("and", is_negative, self._binary("or", first_dropped, rest_dropped))
+        if mode == QuantizationMode.AP_RND:
+            return first_dropped
+        if mode == QuantizationMode.AP_RND_ZERO:
+            return self._binary("and", first_dropped, self._binary("or", is_negative, rest_dropped))
+        if mode == QuantizationMode.AP_RND_MIN_INF:
+            return self._binary("and", first_dropped, rest_dropped)
+        if mode == QuantizationMode.AP_RND_INF:
+            return self._binary("and", first_dropped, self._binary("or", self._not(is_negative), rest_dropped))
+        if mode == QuantizationMode.AP_RND_CONV:
+            return self._binary("and", first_dropped, self._binary("or", self._slice(floor_wire, 0, 1), rest_dropped))
+        raise ValueError(f"unknown quantization mode {mode}")
+
+    def _convert_to_fixed(self, value:Value, ap_type:ApType):
+        wire = self._to_signed(value)
+        width = ap_type.width
+        drop = value.frac - ap_type.frac
+        if drop > 0:
+            floor_wire = self._shift("ashr", wire, self._const(drop, 32))
+            increment = self._rounding_increment(ap_type.rounding_mode, wire, drop, floor_wire)
+            unrounded = self._sext(floor_wire, floor_wire.width + 1)
+            rounded = self._binary("add", unrounded, self._zext(increment, unrounded.width))
+        else:
+            rounded = self._shift("shl", self._sext(wire, wire.width - drop), self._const(-drop, 32))
+            unrounded = rounded
+        if rounded.width < width + 1:
+            rounded = self._sext(rounded, width + 1)
+            unrounded = self._sext(unrounded, width + 1)
+
+        low = self._slice(rounded, 0, width)
+        high = self._slice(rounded, width - 1, rounded.width - width + 1)
+        in_range = self._binary("or", self._is_zero(high),
+                                self._binary("eq", high, self._const(-1, high.width)))
+        is_negative = self._slice(rounded, rounded.width - 1, 1)
+        overflow = self._binary("and", self._not(in_range), self._not(is_negative))
+        underflow = self._binary("and", self._not(in_range), is_negative)
+        max_wire = self._const(_mask(width - 1), width)
+        min_wire = self._const(1 << (width - 1), width)
+
+        mode = ap_type.wrap_mode
+        if mode == OverflowMode.AP_WRAP:
+            return low
+        if mode == OverflowMode.AP_SAT:
+            return self._mux(overflow, max_wire, self._mux(underflow, min_wire, low))
+        if mode == OverflowMode.AP_SAT_ZERO:
+            return self._mux(self._binary("or", overflow, underflow), self._const(0, width), low)
+        if mode == OverflowMode.AP_SAT_SYM:
+            # the most negative value is not used, it saturates to -max
+            to_min = self._binary("or", underflow, self._binary("eq", low, min_wire))
+            return self._mux(overflow, max_wire,
+                             self._mux(to_min, self._const((1 << (width - 1)) + 1, width), low))
+        if mode == OverflowMode.AP_WRAP_SM:
+            # on overflow the bit above the target msb becomes the sign, the
+            # other bits are inverted if the sign changed
+            above_msb = self._slice(unrounded, width, 1)
+            if width == 1:
+                sign_magnitude = above_msb
+            else:
+                sign_magnitude = self._concat(above_msb, self._not(self._slice(low, 0, width - 1)))
+            sign_changed = self._not(self._binary("eq", above_msb, self._slice(low, width - 1, 1)))
+            flip = self._binary("and", self._binary("or", overflow, underflow), sign_changed)
+            return self._mux(flip, sign_magnitude, low)
+        raise ValueError(f"unknown overflow mode {mode}")
+
+    def _convert(self, value:Value, ap_type:ApType):
+        """
+        Convert a value to the type of a node, like the C++ assignment does.
+        """
+        if ap_type.is_fixed:
+            wire = self._convert_to_fixed(value, ap_type)
+        else:
+            # the signed integer part, wrapped to the width of the node
+            wire = self._trunc_to_int(value)
+            if wire.width >= ap_type.width:
+                wire = self._slice(wire, 0, ap_type.width)
+            else:
+                wire = self._sext(wire, ap_type.width)
+        return wire
+
+    def _get_operand_list(self, node:OpNode):
+        # the same operand order as GraphManager._op_node_to_assignment_str
+        preds = list(self.graph_manager.program_graph.predecessors(node))
+        preds = [p for p in preds if not (isinstance(p, LoopNode) or isinstance(p, BranchNode))]
+        if node.op_type == OperationType.NOT:
+            if len(preds) != 1:
+                raise ValueError(f"Operation NOT expects 1 operand, got {len(preds)}")
+            return preds
+        if len(preds) == 1:
+            return [preds[0], preds[0]]
+        if len(preds) != 2:
+            raise ValueError(f"op node {node.name} expects 2 operands, got {len(preds)}")
+        return preds
+
+    def _lower_node(self, node:OpNode):
+        operand_list = self._get_operand_list(node)
+        value_list = [self.node_values[p] for p in operand_list]
+        if node.op_type == OperationType.NOT:
+            value = value_list[0]
+            result = self._make_value(self._not(value.wire), value.frac, value.signed)
+        elif node.op_type in (OperationType.SHL, OperationType.SHR):
+            result = self._lower_shift(node.op_type, value_list[0], value_list[1],
+                                       get_ap_type(operand_list[0]), get_ap_type(operand_list[1]))
+        else:
+            result = self._lower_arith(node.op_type, value_list[0], value_list[1])
+        ap_type = get_ap_type(node)
+        wire = self._convert(result, ap_type)
+        named_wire = self._new_wire(ap_type.width, ("buf", wire), name=node.name)
+        self.node_values[node] = self._make_value(named_wire, ap_type.frac, ap_type.signed)
+
+    def check_graph(self):
+        """
+        Check that the graph is a pure dataflow of op nodes, which is what the
+        reference generator supports.
+        """
+        for node in self.graph_manager.program_graph.nodes():
+            if isinstance(node, (LoopNode, BranchNode, ArrayNode)):
+                raise ValueError(f"the reference RTL only supports loop-free dataflow graphs, got {node.name}")
+            if node.op_type in (OperationType.VISIT, OperationType.WRITE,
+                                OperationType.DIV, OperationType.MOD):
+                raise ValueError(f"the reference RTL does not support {node.op_type.value} node {node.name}")
+
+    def lower(self):
+        """
+        Lower the program graph to the netlist, once.
+        """
+        if self._lowered:
+            return
+        import networkx as nx
+        self.check_graph()
+        self.input_list, self.output_list, _ = self.graph_manager._select_function_arg_list()
+        if len(self.output_list) == 0:
+            raise ValueError("the program graph has no output")
+        for node in self.input_list:
+            ap_type = get_ap_type(node)
+            wire = self._new_wire(ap_type.width, ("input",), name=node.name)
+            self.node_values[node] = self._make_value(wire, ap_type.frac, ap_type.signed)
+        for node in nx.topological_sort(self.graph_manager.program_graph):
+            if node not in self.node_values:
+                self._lower_node(node)
+        self._lowered = True
+
+    def _expr_to_verilog(self, wire:Wire):
+        primitive = wire.expr[0]
+        operands = wire.expr[1:]
+        if primitive == "const":
+            return f"{wire.width}'d{operands[0]}"
+        if primitive == "buf":
+            return operands[0].name
+        if primitive == "sext":
+            src = operands[0]
+            if src.width == 1:
+                return f"{{{wire.width}{{{src.name}}}}}"
+            return f"{{{{{wire.width - src.width}{{{src.name}[{src.width - 1}]}}}}, {src.name}}}"
+        if primitive == "zext":
+            src = operands[0]
+            return f"{{{wire.width - src.width}'d0, {src.name}}}"
+        if primitive == "slice":
+            src, low = operands
+            if src.width == 1:
+                return src.name
+            return f"{src.name}[{low + wire.width - 1}:{low}]"
+        if primitive == "concat":
+            return f"{{{operands[0].name}, {operands[1].name}}}"
+        if primitive == "not":
+            return f"~{operands[0].name}"
+        if primitive == "mux":
+            return f"{operands[0].name} ? {operands[1].name} : {operands[2].name}"
+        if primitive == "slt":
+            return f"$signed({operands[0].name}) < $signed({operands[1].name})"
+        if primitive == "ashr":
+            return f"$signed({operands[0].name}) >>> {operands[1].name}"
+        operator_map = {"add": "+", "sub": "-", "mul": "*", "and": "&", "or": "|", "xor": "^",
+                        "eq": "==", "shl": "<<", "lshr": ">>"}
+        return f"{operands[0].name} {operator_map[primitive]} {operands[1].name}"
+
+    def _port_decl(self, direction:str, name:str, width:int):
+        if width == 1:
+            return f"{direction}   {name};"
+        return f"{direction}  [{width - 1}:0] {name};"
+
+    def generate_verilog(self):
+        """
+        Returns:
+            str: The Verilog of the reference module
+        """
+        self.lower()
+        port_list = ["ap_clk", "ap_rst", "ap_start", "ap_done", "ap_idle", "ap_ready"]
+        port_list += [node.name for node in self.input_list]
+        for node in self.output_list:
+            port_list += [node.name, f"{node.name}_ap_vld"]
+
+        lines = ["`timescale 1 ns / 1 ps", "",
+                 f"// reference RTL of {self.top_name}, generated from the program graph without HLS",
+                 f"module {self.top_name} ("]
+        lines += [f"        {port}," for port in port_list[:-1]] + [f"        {port_list[-1]}", ");", ""]
+        lines += [self._port_decl("input", "ap_clk", 1), self._port_decl("input", "ap_rst", 1),
+                  self._port_decl("input", "ap_start", 1), self._port_decl("output", "ap_done", 1),
+                  self._port_decl("output", "ap_idle", 1), self._port_decl("output", "ap_ready", 1)]
+        for node in self.input_list:
+            lines.append(self._port_decl("input", node.name, get_ap_type(node).width))
+        for node in self.output_list:
+            lines.append(self._port_decl("output", node.name, get_ap_type(node).width))
+            lines.append(self._port_decl("output", f"{node.name}_ap_vld", 1))
+        lines.append("")
+
+        input_names = set(node.name for node in self.input_list)
+        output_names = set(node.name for node in self.output_list)
+        for wire in self.wires:
+            if wire.name in input_names or wire.name in output_names:
+                continue
+            lines.append(f"wire  [{wire.width - 1}:0] {wire.name};" if wire.width > 1 else f"wire   {wire.name};")
+        lines.append("")
+        for wire in self.wires:
+            if wire.name in input_names:
+                continue
+            lines.append(f"assign {wire.name} = {self._expr_to_verilog(wire)};")
+        lines += ["", "assign ap_done = ap_start;", "assign ap_idle = ~ap_start;", "assign ap_ready = ap_start;"]
+        for node in self.output_list:
+            lines.append(f"assign {node.name}_ap_vld = ap_start;")
+        lines += ["", "endmodule", ""]
+        return "\n".join(lines)
+
+    def dump_verilog(self, file_path:str):
+        with open(file_path, "w") as f:
+            f.write(self.generate_verilog())
+        print(f"[INFO] reference RTL dumped to {file_path}")
+        return file_path
+
+    def simulate(self, input_values:Dict[str, int]) -> Dict[str, int]:
+        """
+        Evaluate the netlist in Python.
+
+        Args:
+            input_values: Input name -> raw bits of the input
+
+        Returns:
+            dict: Wire name -> raw bits, for every wire of the netlist
+        """
+        self.lower()
+        state = {}
+
+        def signed_of(wire):
+            raw = state[wire.name]
+            return raw - (1 << wire.width) if raw >> (wire.width - 1) else raw
+
+        for wire in self.wires:
+            primitive = wire.expr[0]
+            operands = wire.expr[1:]
+            if primitive == "input":
+                raw = input_values[wire.name]
+            elif primitive == "const":
+                raw = operands[0]
+            elif primitive == "buf":
+                raw = state[operands[0].name]
+            elif primitive == "sext":
+                raw = signed_of(operands[0])
+            elif primitive == "zext":
+                raw = state[operands[0].name]
+            elif primitive == "slice":
+                raw = state[operands[0].name] >> operands[1]
+            elif primitive == "concat":
+                raw = (state[operands[0].name] << operands[1].width) | state[operands[1].name]
+            elif primitive == "not":
+                raw = ~state[operands[0].name]
+            elif primitive == "mux":
+                raw = state[operands[1].name] if state[operands[0].name] else state[operands[2].name]
+            elif primitive == "eq":
+                raw = int(state[operands[0].name] == state[operands[1].name])
+            elif primitive == "slt":
+                raw = int(signed_of(operands[0]) < signed_of(operands[1]))
+            elif primitive in ("shl", "lshr", "ashr"):
+                amount = state[operands[1].name]
+                if primitive == "shl":
+                    raw = state[operands[0].name] << amount if amount < wire.width else 0
+                elif primitive == "lshr":
+                    raw = state[operands[0].name] >> amount
+                else:
+                    raw = signed_of(operands[0]) >> min(amount, wire.width)
+            else:
+                operation_map = {"add": lambda a, b: a + b, "sub": lambda a, b: a - b,
+                                 "mul": lambda a, b: a * b, "and": lambda a, b: a & b,
+                                 "or": lambda a, b: a | b, "xor": lambda a, b: a ^ b}
+                raw = operation_map[primitive](state[operands[0].name], state[operands[1].name])
+            state[wire.name] = raw & _mask(wire.width)
+        return state
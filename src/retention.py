@@ -0,0 +1,120 @@
+import os
+import re
+import glob
+import tarfile
+from typing import List
+
+
+RETENTION_POLICIES = ["keep", "pack", "compress", "delete"]
+
+# what the downstream flow reads from a Vitis HLS project, relative to the project
+HLS_KEEP_PATTERNS = [
+    "*/syn/verilog/*.v",
+    "*/syn/report/*csynth.xml",
+    "*/syn/report/*csynth.rpt",
+    "*.log",
+    "*/*.log",
+]
+
+# what is kept of a miter directory, the intermediate Verilog is not needed
+# once the AIGER exists
+MITER_KEEP_PATTERNS = [
+    "miter.v",
+    "*.aig",
+    "*.aag",
+    "*.btor",
+    "*.smt2",
+    "*.aig.map",
+    "*.log",
+]
+
+
+def _file_size(file_path:str):
+    return os.lstat(file_path).st_size
+
+
+def _remove_empty_dirs(root_dir:str):
+    for dir_path, _, _ in sorted(os.walk(root_dir), key=lambda walk: walk[0], reverse=True):
+        if dir_path != root_dir and not os.listdir(dir_path):
+            os.rmdir(dir_path)
+
+
+def _next_archive_path(root_dir:str, archive_name:str, archive_suffix:str):
+    # a re-run into the same directory gets pruned_artifacts_1.tar, _2, ...
+    archive_path = os.path.join(root_dir, archive_name + archive_suffix)
+    index = 0
+    while os.path.exists(archive_path):
+        index += 1
+        archive_path = os.path.join(root_dir, f"{archive_name}_{index}{archive_suffix}")
+    return archive_path
+
+
+def apply_retention(root_dir:str, keep_patterns:List[str], policy:str,
+                    archive_name:str = "pruned_artifacts"):
+    """
+    Apply a retention policy to a directory. The files matching keep_patterns
+    stay in place, the others are
+
+    - keep: left as they are
+    - pack: moved into one uncompressed <archive_name>.tar
+    - compress: moved into one <archive_name>.tar.gz
+    - delete: deleted
+
+    When the archive already exists, e.g. after a re-run into the same
+    directory, the newly pruned files go to <archive_name>_1.tar and so on.
+
+    Args:
+        root_dir: Directory to prune
+        keep_patterns: glob patterns relative to root_dir of the files to keep
+        policy: One of RETENTION_POLICIES
+        archive_name: Base name of the archive written in root_dir
+
+    Returns:
+        dict: policy, bytes_before, bytes_after, bytes_reclaimed, files_pruned and archive
+    """
+    if policy not in RETENTION_POLICIES:
+        raise ValueError(f"unknown retention policy {policy}, expected one of {RETENTION_POLICIES}")
+    if not os.path.isdir(root_dir):
+        raise FileNotFoundError(f"directory not found: {root_dir}")
+
+    archive_suffix = {"pack": ".tar", "compress": ".tar.gz"}.get(policy)
+    archive_pattern = re.compile(re.escape(archive_name) + r"(_\d+)?\.tar(\.gz)?")
+
+    keep_set = set()
+    for pattern in keep_patterns:
+        keep_set.update(os.path.abspath(p) for p in glob.glob(os.path.join(root_dir, pattern)))
+    all_files = []
+    for dir_path, _, file_names in os.walk(root_dir):
+        for file_name in file_names:
+            all_files.append(os.path.abspath(os.path.join(dir_path, file_name)))
+    all_files.sort()
+    # the previous archives are kept, pruning twice does not nest archives
+    prune_files = [f for f in all_files if f not in keep_set and
+                   archive_pattern.fullmatch(os.path.basename(f)) is None]
+
+    bytes_before = sum(_file_size(f) for f in all_files)
+    report = {"policy": policy, "bytes_before": bytes_before, "bytes_after": bytes_before,
+              "bytes_reclaimed": 0, "files_pruned": 0, "archive": None}
+    if policy == "keep" or len(prune_files) == 0:
+        return report
+
+    if archive_suffix is not None:
+        archive_path = _next_archive_path(root_dir, archive_name, archive_suffix)
+        mode = "w:gz" if policy == "compress" else "w"
+        with tarfile.open(archive_path, mode) as archive:
+            for file_path in prune_files:
+                archive.add(file_path, arcname=os.path.relpath(file_path, os.path.abspath(root_dir)),
+                            recursive=False)
+        report["archive"] = archive_path
+    for file_path in prune_files:
+        os.remove(file_path)
+    _remove_empty_dirs(root_dir)
+
+    bytes_after = 0
+    for dir_path, _, file_names in os.walk(root_dir):
+        for file_name in file_names:
+            bytes_after += _file_size(os.path.join(dir_path, file_name))
+    report["bytes_after"] = bytes_after
+    report["bytes_reclaimed"] = bytes_before - bytes_after
+    report["files_pruned"] = len(prune_files)
+    return report
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Record/replay stand-ins for vitis_hls and yosys.
+
+In record mode a stand-in runs the real tool and stores its output, exit code
+and the files it wrote under its cwd in a fixture store. In replay mode it
+looks the run up and writes the recorded outputs back instead of running the
+tool, so the whole flow past C++ emission runs without an EDA install.
+
+A run is keyed on the tool, its arguments, its script and the content of the
+files the script reads, so a changed design misses instead of replaying
+stale outputs. Files the tool deleted are not recorded.
+
+The stand-ins are small shell scripts written by install_tool_shims:
+
+    python tool_replay.py install --bin-dir shims --mode replay --fixture-dir fixtures
+    PATH=shims:$PATH python main.py ...
+"""
+
+import os
+import sys
+import shlex
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+from artifact_cache import ArtifactCache, make_cache_key
+
+
+REPLAY_MODES = ["record", "replay"]
+REPLAY_TOOLS = ["vitis_hls", "yosys"]
+
+# set by ToolRunner for every run, the stand-in leaves that log out of the outputs
+RUNNER_LOG_ENV = "TOOL_RUNNER_LOG_FILE"
+
+# exit code of a replay without a recorded run
+REPLAY_MISS_EXIT_CODE = 3
+
+
+def _file_sha256(file_path:str):
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# script commands whose operands are inputs of the run, the files a command
+# like write_verilog names may be left over from an earlier run in the same
+# directory and are not part of the key
+READ_COMMANDS = ["add_files", "source", "read", "read_verilog", "read_aiger", "read_blif",
+                 "read_json", "read_rtlil", "read_liberty", "script"]
+
+
+def _read_operands(script_content:str):
+    # commands of Tcl and yosys scripts end at a newline or at the ; of a yosys
+    # -p command list, file names are plain words, sometimes braced or quoted
+    for command in script_content.replace(";", "\n").splitlines():
+        tokens = [token.strip("{}\"'") for token in command.split()]
+        if len(tokens) > 1 and tokens[0] in READ_COMMANDS:
+            yield from tokens[1:]
+
+
+def get_run_key(tool:str, tool_args:List[str], cwd:str):
+    """
+    Get the fixture key of one tool run.
+
+    Every argument naming a file is replaced by the file content hash, and so
+    is every operand of a read command (READ_COMMANDS) of such a script, or
+    of an inline script like yosys -p, that names a file relative to cwd.
+
+    Args:
+        tool: Tool name, one of REPLAY_TOOLS
+        tool_args: Arguments of the tool, without the executable
+        cwd: Working directory of the run
+
+    Returns:
+        str: The fixture key
+    """
+    arg_list = []
+    input_files = {}
+    for arg in tool_args:
+        arg_path = os.path.join(cwd, arg)
+        if os.path.isfile(arg_path):
+            arg_list.append({"file": arg, "sha256": _file_sha256(arg_path)})
+            with open(arg_path, errors="replace") as f:
+                script_content = f.read()
+        else:
+            arg_list.append(arg)
+            script_content = arg
+        for token in _read_operands(script_content):
+            token_path = os.path.join(cwd, token)
+            if token not in input_files and token != arg and os.path.isfile(token_path):
+                input_files[token] = _file_sha256(token_path)
+    return make_cache_key({"tool": tool, "args": arg_list, "inputs": input_files})
+
+
+def _snapshot(root_dir:str, exclude_paths:List[str]):
+    # (size, mtime) of every file below root_dir, to find what a run wrote
+    snapshot = {}
+    exclude_paths = [os.path.abspath(p) for p in exclude_paths]
+    for dir_path, dir_names, file_names in os.walk(root_dir):
+        dir_names[:] = [d for d in dir_names
+                        if os.path.abspath(os.path.join(dir_path, d)) not in exclude_paths]
+        for file_name in file_names:
+            file_path = os.path.join(dir_path, file_name)
+            if os.path.abspath(file_path) in exclude_paths or os.path.islink(file_path):
+                continue
+            stat = os.stat(file_path)
+            snapshot[os.path.relpath(file_path, root_dir)] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def record_run(tool:str, real_tool:str, tool_args:List[str], fixture_dir:str, cwd:str = "."):
+    """
+    Run the real tool, pass its output through and store the run.
+
+    Returns:
+        int: Exit code of the tool
+    """
+    fixture_store = ArtifactCache(fixture_dir)
+    key = get_run_key(tool, tool_args, cwd)
+    exclude_paths = [p for p in [fixture_dir, os.environ.get(RUNNER_LOG_ENV)] if p]
+    before = _snapshot(cwd, exclude_paths)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stdout_path = os.path.join(tmp_dir, "stdout")
+        with open(stdout_path, "wb") as stdout_file:
+            process = subprocess.Popen([real_tool] + tool_args, cwd=cwd,
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            for chunk in iter(lambda: process.stdout.read1(64 * 1024), b""):
+                stdout_file.write(chunk)
+                sys.stdout.buffer.write(chunk)
+                sys.stdout.buffer.flush()
+            return_code = process.wait()
+
+        after = _snapshot(cwd, exclude_paths)
+        output_files = {os.path.join("cwd", rel_path): os.path.join(cwd, rel_path)
+                        for rel_path, file_stat in after.items() if before.get(rel_path) != file_stat}
+        output_files["stdout"] = stdout_path
+        fixture_store.store(key, output_files, metadata={
+            "tool": tool, "args": tool_args, "return_code": return_code})
+    return return_code
+
+
+def replay_run(tool:str, tool_args:List[str], fixture_dir:str, cwd:str = "."):
+    """
+    Write the recorded outputs of a run back to cwd and print its output.
+
+    Returns:
+        int: Recorded exit code, REPLAY_MISS_EXIT_CODE if the run was not recorded
+    """
+    fixture_store = ArtifactCache(fixture_dir)
+    key = get_run_key(tool, tool_args, cwd)
+    entry = fixture_store.lookup(key)
+    if entry is None:
+        print(f"[ERROR] no recorded {tool} run for {' '.join(tool_args)} in {fixture_dir} (key {key})",
+              file=sys.stderr)
+        return REPLAY_MISS_EXIT_CODE
+    for rel_path in entry.files:
+        if rel_path.startswith("cwd" + os.sep):
+            dest_path = os.path.join(cwd, os.path.relpath(rel_path, "cwd"))
+            os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+            shutil.copyfile(entry.file_path(rel_path), dest_path)
+    with open(entry.file_path("stdout"), "rb") as f:
+        shutil.copyfileobj(f, sys.stdout.buffer)
+    sys.stdout.buffer.flush()
+    return entry.metadata["return_code"]
+
+
+def install_tool_shims(bin_dir:str, mode:str, fixture_dir:str,
+                       real_tools:Optional[Dict[str, str]] = None):
+    """
+    Write vitis_hls and yosys stand-ins to bin_dir, to put in front of the PATH.
+
+    Args:
+        bin_dir: Directory receiving the stand-ins
+        mode: record or replay
+        fixture_dir: Fixture store directory
+        real_tools: Tool name -> real executable, record mode only, found on
+                    the PATH by default
+
+    Returns:
+        dict: Tool name -> stand-in path
+    """
+    if mode not in REPLAY_MODES:
+        raise ValueError(f"unknown replay mode {mode}, expected one of {REPLAY_MODES}")
+    real_tools = {} if real_tools is None else dict(real_tools)
+    os.makedirs(bin_dir, exist_ok=True)
+    os.makedirs(fixture_dir, exist_ok=True)
+
+    shim_paths = {}
+    for tool in REPLAY_TOOLS:
+        shim_path = os.path.join(os.path.abspath(bin_dir), tool)
+        command = [sys.executable, os.path.abspath(__file__), "run", "--tool", tool,
+                   "--mode", mode, "--fixture-dir", os.path.abspath(fixture_dir)]
+        if mode == "record":
+            real_tool = real_tools.get(tool, shutil.which(tool))
+            if real_tool is None or os.path.abspath(real_tool) == shim_path:
+                raise FileNotFoundError(f"cannot record {tool}, the real {tool} was not found")
+            command += ["--real-tool", os.path.abspath(real_tool)]
+        with open(shim_path, "w") as f:
+            f.write("#!/bin/sh\n")
+            f.write(f"exec {' '.join(shlex.quote(c) for c in command)} -- \"$@\"\n")
+        os.chmod(shim_path, 0o755)
+        shim_paths[tool] = shim_path
+    return shim_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay stand-ins for vitis_hls and yosys")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    install_parser = subparsers.add_parser("install", help="Write the stand-ins to a directory")
+    install_parser.add_argument("--bin-dir", type=str, required=True)
+    install_parser.add_argument("--mode", type=str, choices=REPLAY_MODES, required=True)
+    install_parser.add_argument("--fixture-dir", type=str, required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run as a stand-in, called by the installed scripts")
+    run_parser.add_argument("--tool", type=str, choices=REPLAY_TOOLS, required=True)
+    run_parser.add_argument("--mode", type=str, choices=REPLAY_MODES, required=True)
+    run_parser.add_argument("--fixture-dir", type=str, required=True)
+    run_parser.add_argument("--real-tool", type=str, default=None)
+    run_parser.add_argument("tool_args", nargs=argparse.REMAINDER)
+
+    args = parser.parse_args()
+    if args.command == "install":
+        for tool, shim_path in install_tool_shims(args.bin_dir, args.mode, args.fixture_dir).items():
+            print(f"[INFO] {tool} {args.mode} stand-in: {shim_path}")
+        return 0
+
+    tool_args = args.tool_args[1:] if args.tool_args[:1] == ["--"] else args.tool_args
+    if args.mode == "record":
+        if args.real_tool is None:
+            parser.error("--real-tool is required in record mode")
+        return record_run(args.tool, args.real_tool, tool_args, args.fixture_dir)
+    return replay_run(args.tool, tool_args, args.fixture_dir)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+import os
+import sys
+import time
+import shutil
+import signal
+import asyncio
+from dataclasses import dataclass, asdict
+from typing import Callable, List, Optional
+
+
+@dataclass
+class ToolResult:
+    """
+    Exit information of one external tool run.
+    """
+    command : List[str]
+    cwd : str
+    log_file_path : str
+    return_code : Optional[int] = None
+    timed_out : bool = False
+    cancelled : bool = False
+    # the line callback asked to stop the tool before it exited
+    stopped_early : bool = False
+    elapsed_s : float = 0.0
+
+    @property
+    def success(self):
+        return self.return_code == 0 and not self.timed_out and not self.cancelled \
+            and not self.stopped_early
+
+    def log_tail(self, line_count:int = 20):
+        """
+        Get the last lines of the log, for error messages.
+        """
+        if not os.path.exists(self.log_file_path):
+            return ""
+        with open(self.log_file_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 64 * 1024))
+            lines = f.read().decode(errors="replace").splitlines()
+        return "\n".join(lines[-line_count:])
+
+    def to_dict(self):
+        result_dict = asdict(self)
+        result_dict["success"] = self.success
+        return result_dict
+
+
+# sets the address space limit, then replaces itself with the tool
+_MEMORY_LIMIT_WRAPPER = "import os, sys, resource; limit = int(sys.argv[1]); " \
+    "resource.setrlimit(resource.RLIMIT_AS, (limit, limit)); os.execvp(sys.argv[2], sys.argv[2:])"
+
+
+def with_memory_limit(command:List[str], memory_limit_mb:Optional[int]) -> List[str]:
+    """
+    Wrap a command so that the tool runs with its address space limited.
+    The limit is set by a small exec wrapper instead of a preexec_fn, which
+    is not safe while other threads start processes at the same time. A
+    tool that is not found is left unwrapped, so the spawn still fails.
+
+    Args:
+        command: Executable and arguments
+        memory_limit_mb: Address space limit in MB, None for no limit
+
+    Returns:
+        list: The command to spawn
+    """
+    if memory_limit_mb is None or shutil.which(command[0]) is None:
+        return list(command)
+    return [sys.executable, "-c", _MEMORY_LIMIT_WRAPPER, str(memory_limit_mb * 1024 * 1024)] + list(command)
+
+
+class ToolRunner:
+    """
+    Runs an external tool (vitis_hls, yosys) as a child process.
+
+    Every run has its own cwd, so several runs can share one process, and its
+    stdout and stderr are streamed to a log file instead of kept in memory.
+    The tool runs in its own session, so that on a timeout or a cancellation
+    the whole process group is killed, including the helpers the tool started.
+    """
+
+    def __init__(self, timeout_s:Optional[float] = None,
+                 memory_limit_mb:Optional[int] = None,
+                 kill_grace_s:float = 5.0):
+        if timeout_s is not None and timeout_s <= 0:
+            raise ValueError(f"illegal timeout {timeout_s}")
+        if memory_limit_mb is not None and memory_limit_mb <= 0:
+            raise ValueError(f"illegal memory limit {memory_limit_mb}")
+        if kill_grace_s < 0:
+            raise ValueError(f"illegal kill grace period {kill_grace_s}")
+        self.timeout_s = timeout_s
+        self.memory_limit_mb = memory_limit_mb
+        self.kill_grace_s = kill_grace_s
+
+    async def _kill_process_group(self, process):
+        if process.returncode is not None:
+            return
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(process.pid, sig)
+            except ProcessLookupError:
+                return
+            try:
+                await asyncio.wait_for(process.wait(), timeout=self.kill_grace_s)
+                return
+            except asyncio.TimeoutError:
+                continue
+
+    async def _stream_to_log(self, stream, log_file, line_callback=None):
+        """
+        Copy the tool output to the log file. With a line callback, every
+        complete line is passed to it, and the copy returns early with True
+        once the callback returns True.
+        """
+        pending = b""
+        while True:
+            chunk = await stream.read(64 * 1024)
+            if not chunk:
+                break
+            log_file.write(chunk)
+            log_file.flush()
+            if line_callback is None:
+                continue
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                if line_callback(line.decode(errors="replace")):
+                    return True
+        if line_callback is not None and pending:
+            return bool(line_callback(pending.decode(errors="replace")))
+        return False
+
+    async def run_async(self, command:List[str], cwd:str, log_file_path:str,
+                        env:Optional[dict] = None,
+                        line_callback:Optional[Callable[[str], bool]] = None):
+        """
+        Run a tool to completion, its timeout or its cancellation.
+
+        Args:
+            command: Executable and arguments, not run through a shell
+            cwd: Working directory of the tool
+            log_file_path: File receiving the merged stdout and stderr
+            env: Optional environment of the tool, inherited by default
+            line_callback: Optional callable getting every output line while the
+                           tool runs, the tool is killed once it returns True
+
+        Returns:
+            ToolResult: Exit information of the run
+        """
+        if not isinstance(command, list) or len(command) == 0:
+            raise ValueError(f"expected a non empty command list but got {command}")
+        if not os.path.isdir(cwd):
+            raise FileNotFoundError(f"working directory not found: {cwd}")
+        if log_file_path == "":
+            raise ValueError("log_file_path cannot be empty")
+
+        result = ToolResult(command=list(command), cwd=cwd, log_file_path=log_file_path)
+        # tells the tool where its output goes, the record/replay stand-ins
+        # (tool_replay) leave that log out of the outputs they record
+        env = dict(os.environ if env is None else env)
+        env["TOOL_RUNNER_LOG_FILE"] = os.path.abspath(log_file_path)
+        start_time = time.perf_counter()
+        with open(log_file_path, "wb") as log_file:
+            process = await asyncio.create_subprocess_exec(
+                *with_memory_limit(command, self.memory_limit_mb),
+                cwd=cwd,
+                env=env,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                start_new_session=True
+            )
+            try:
+                stop_requested = await asyncio.wait_for(
+                    self._stream_to_log(process.stdout, log_file, line_callback),
+                    timeout=self.timeout_s
+                )
+                if stop_requested:
+                    result.stopped_early = True
+                    print(f"[WARNING] stopping {command[0]} early, killing its process group")
+                    await self._kill_process_group(process)
+                else:
+                    # the output is closed, wait for the exit within what is left of the timeout
+                    remaining_s = None if self.timeout_s is None else \
+                        max(0.0, self.timeout_s - (time.perf_counter() - start_time))
+                    await asyncio.wait_for(process.wait(), timeout=remaining_s)
+            except asyncio.TimeoutError:
+                result.timed_out = True
+                print(f"[WARNING] {command[0]} timed out after {self.timeout_s}s, killing its process group")
+                await self._kill_process_group(process)
+            except asyncio.CancelledError:
+                result.cancelled = True
+                await asyncio.shield(self._kill_process_group(process))
+                raise
+            finally:
+                result.return_code = process.returncode
+                result.elapsed_s = round(time.perf_counter() - start_time, 3)
+        return result
+
+    def run(self, command:List[str], cwd:str, log_file_path:str, env:Optional[dict] = None,
+            line_callback:Optional[Callable[[str], bool]] = None):
+        """
+        Blocking wrapper around run_async, for callers without an event loop.
+        """
+        return asyncio.run(self.run_async(command, cwd, log_file_path, env=env,
+                                          line_callback=line_callback))
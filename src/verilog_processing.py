@@ -285,8 +285,10 @@ def _wire_str(name: str, width_map: dict[str, int]) -> str:
         return f"[{width-1}:0] {name}"
 
 UNSAFE_SINGAL_NAME = "unsafe_signal"
-def construct_kairos(src_a: VerilogFile, src_b: VerilogFile, fast_slow_mode: bool) -> VerilogFile:
-    "Constructs a product machine for equivalence checking in the Kairos fashion."
+BOTH_VALID_SIGNAL_NAME = "both_valid"
+def construct_kairos(src_a: VerilogFile, src_b: VerilogFile, fast_slow_mode: bool,
+                     expose_valid: bool = False) -> VerilogFile:
+    "Constructs a product machine for equivalence checking in the Kairos fashion. `expose_valid` adds a both-valid output for simulation."
     dst = VerilogFile()
     dst.raw_lines.append("// Processed by function `construct_kairos` in `verilog_tricks.py`.")
     assert len(src_a.modules) == 1 and len(src_b.modules) == 1
@@ -321,12 +323,15 @@ def construct_kairos(src_a: VerilogFile, src_b: VerilogFile, fast_slow_mode: boo
     clock_input_name = m_a.clock_input_name
     valid_output_name = m_a.valid_output_name
 
-    ports = normal_input_names + [clock_input_name, UNSAFE_SINGAL_NAME]
+    ports = normal_input_names + [clock_input_name, UNSAFE_SINGAL_NAME] + \
+        ([BOTH_VALID_SIGNAL_NAME] if expose_valid else [])
     dst.raw_lines.append(f"module {m_a.module_name}_A_times_{m_b.module_name}_B ({', '.join(ports)});")
     for name in normal_input_names:
         dst.raw_lines.append(f"input {_wire_str(name, width_map)};")
     dst.raw_lines.append(f"input {clock_input_name};")
     dst.raw_lines.append(f"output {UNSAFE_SINGAL_NAME};")
+    if expose_valid:
+        dst.raw_lines.append(f"output {BOTH_VALID_SIGNAL_NAME};")
 
     dst.raw_lines.append("reg _setup;")
     dst.raw_lines.append("initial _setup = 1'b0;")
@@ -354,6 +359,8 @@ def construct_kairos(src_a: VerilogFile, src_b: VerilogFile, fast_slow_mode: boo
     dst.raw_lines.append(f"wire divergent;")
     dst.raw_lines.append(f"assign divergent = ~({' & '.join(miter_names)});")
     dst.raw_lines.append(f"assign {UNSAFE_SINGAL_NAME} = {valid_output_name}_A & {valid_output_name}_B & divergent;")
+    if expose_valid:
+        dst.raw_lines.append(f"assign {BOTH_VALID_SIGNAL_NAME} = {valid_output_name}_A & {valid_output_name}_B;")
 
     dst.raw_lines.append(f"{m_a.module_name}_A instance_A (")
     dst.raw_lines.append(f"    .{clock_input_name}({clock_input_name}),")
@@ -380,19 +387,26 @@ def construct_kairos(src_a: VerilogFile, src_b: VerilogFile, fast_slow_mode: boo
     return dst
 
 
-def kairos_preprocess(src_file_1: str, src_file_2: str, dst_file: str, fast_slow_mode: bool) -> str:
-    "Main verilog-to-verilog preprocess for kairos-style equivalence checking. Returns top-level module name."
-    src_1 = VerilogFile()
-    src_1.read_from_file(src_file_1)
-    middle_1 = add_clk_enable_signal(remove_reset_signal(merge_valid_signals(src_1), True))
-    src_2 = VerilogFile()
-    src_2.read_from_file(src_file_2)
-    middle_2 = add_clk_enable_signal(remove_reset_signal(merge_valid_signals(src_2), True))
-    dst = construct_kairos(middle_1, middle_2, fast_slow_mode)
+def kairos_transform(src_file: str) -> VerilogFile:
+    "Per-side part of `kairos_preprocess`, the two sides share nothing and can be transformed concurrently."
+    src = VerilogFile()
+    src.read_from_file(src_file)
+    return add_clk_enable_signal(remove_reset_signal(merge_valid_signals(src), True))
+
+
+def kairos_construct(middle_1: VerilogFile, middle_2: VerilogFile, dst_file: str, fast_slow_mode: bool,
+                     expose_valid: bool = False) -> str:
+    "Join two transformed sides into the miter. Returns top-level module name."
+    dst = construct_kairos(middle_1, middle_2, fast_slow_mode, expose_valid)
     dst.write_to_file(dst_file)
     return dst.modules[-1].module_name
 
 
+def kairos_preprocess(src_file_1: str, src_file_2: str, dst_file: str, fast_slow_mode: bool) -> str:
+    "Main verilog-to-verilog preprocess for kairos-style equivalence checking. Returns top-level module name."
+    return kairos_construct(kairos_transform(src_file_1), kairos_transform(src_file_2), dst_file, fast_slow_mode)
+
+
 def avr_preprocess(src_file: str, dst_file: str):
     "Adjustments for the AVR program."
     src = VerilogFile()
@@ -407,6 +421,22 @@ def avr_preprocess(src_file: str, dst_file: str):
     dst.write_to_file(dst_file)
 
 
+def property_preprocess(src_file: str, dst_file: str) -> bool:
+    "Assert that the unsafe signal stays 0, the property of the word-level model checkers. Returns False when no module has the unsafe output."
+    src = VerilogFile()
+    src.read_from_file(src_file)
+    miter_modules = [m for m in src.modules if UNSAFE_SINGAL_NAME in m.normal_output_names]
+    if len(miter_modules) == 0:
+        return False
+    line_number = miter_modules[-1].end_line
+    dst = VerilogFile()
+    dst.raw_lines = src.raw_lines[:line_number] + [
+        f"assert property ( !{UNSAFE_SINGAL_NAME} );",
+    ] + src.raw_lines[line_number:]
+    dst.write_to_file(dst_file)
+    return True
+
+
 def remove_nondeterminism(src: VerilogFile) -> VerilogFile:
     "Remove nondeterminism by changing all `'bx`s to `'b0`s."
     dst = VerilogFile()
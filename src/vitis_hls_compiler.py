@@ -1,13 +1,113 @@
 import shutil
 import os
 import glob
-import subprocess
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
+from tool_runner import ToolRunner
+from log_scanner import LogScanner, VITIS_HLS_LOG_PATTERNS, get_batch_log_patterns
+from csynth_report import parse_csynth_xml, find_csynth_xml
+from retention import apply_retention, HLS_KEEP_PATTERNS
+from artifact_cache import make_cache_key
+from artifact_manifest import sha256_file
+
+
+# printed by a profile setting the tool rejected, with the tool error
+PROFILE_SKIPPED_MARKER = "@@HLS_PROFILE_SKIPPED"
+
+
+@dataclass
+class SynthesisProfile:
+    """
+    Solution settings of a synthesis run. Every settings command is run inside
+    a catch, a release that does not know it skips it instead of failing, and
+    the skipped setting is echoed to the log with the error of the tool.
+    """
+    name : str
+    flow_target : str = "vivado"
+    settings : List[str] = field(default_factory=list)
+
+    def to_tcl(self):
+        return "".join(f"if {{[catch {{{setting}}} profile_error]}} "
+                       f"{{puts \"{PROFILE_SKIPPED_MARKER} {setting}: $profile_error\"}}\n"
+                       for setting in self.settings)
+
+
+SYNTHESIS_PROFILES = {
+    # the tool defaults, what the benchmark flow always used
+    "default": SynthesisProfile(name="default"),
+    # fast C-to-RTL turnaround for corpus generation, QoR does not matter:
+    # no automatic pipelining beyond the pragmas of the variants, and no
+    # deadlock detection logic in the RTL. The flow ends with csynth_design
+    # and reads the Verilog only, so the RTL is exported as Verilog alone and
+    # an export_design run on the project skips the Vivado reports and
+    # optimizations
+    "fast": SynthesisProfile(name="fast", settings=[
+        "config_compile -pipeline_loops 0",
+        "config_rtl -deadlock_detection none",
+        "config_export -rtl verilog",
+        "config_export -vivado_report_level 0",
+        "config_export -vivado_optimization_level 0",
+    ]),
+}
+
+
+def get_synthesis_profile(profile:Union[str, SynthesisProfile]) -> SynthesisProfile:
+    if isinstance(profile, SynthesisProfile):
+        return profile
+    if not isinstance(profile, str):
+        raise TypeError(f"expected str or SynthesisProfile but got {type(profile)}")
+    if profile not in SYNTHESIS_PROFILES:
+        raise ValueError(f"unknown synthesis profile {profile}, "
+                         f"expected one of {sorted(SYNTHESIS_PROFILES.keys())}")
+    return SYNTHESIS_PROFILES[profile]
+
+
+BATCH_BEGIN_MARKER = "@@HLS_BATCH_BEGIN"
+BATCH_END_MARKER = "@@HLS_BATCH_END"
+# cache entries are copied here before a run, then moved into the projects
+HLS_CACHE_STAGING_DIR = "_hls_cache_staging"
+
+
+@dataclass
+class HLSJob:
+    """
+    One solution to synthesize in a batch. Jobs with the same project_name
+    share the project, so they must have the same top and sources.
+    """
+    project_name : str
+    top_name : str
+    clock_period : int
+    cpp_file_list : List[str]
+    solution_name : str = "solution1"
+    # per-job log demultiplexed from the batch log, <project>_<solution>.log by default
+    log_file_path : Optional[str] = None
+
+    def get_tag(self):
+        return f"{self.project_name}/{self.solution_name}"
 
 
 class VitisHLSCompiler:
 
-    def __init__(self, working_dir = None, hls_script_path = None, log_file_path = None):
+    def __init__(self, working_dir = None, hls_script_path = None, log_file_path = None,
+                 timeout_s = None, memory_limit_mb = None,
+                 part = "xc7z020clg484-1", cache = None, tool_version = None,
+                 profile = "default", log_patterns = None):
         self.vitis_hls_exists = shutil.which("vitis_hls") is not None
+        # the log is scanned while vitis_hls runs, a fatal match stops it early
+        self.log_patterns = list(VITIS_HLS_LOG_PATTERNS) if log_patterns is None else log_patterns
+        self.last_log_scanner = None
+        self.profile = get_synthesis_profile(profile)
+        if not isinstance(part, str):
+            raise TypeError(f"expected str but got {type(part)}")
+        if part == "":
+            raise ValueError("part cannot be empty")
+        self.part = part
+        # optional ArtifactCache of the synthesis results
+        self.cache = cache
+        self.tool_version = tool_version
+        # vitis_hls runs with its own cwd, so several compilers can share a process
+        self.tool_runner = ToolRunner(timeout_s=timeout_s, memory_limit_mb=memory_limit_mb)
+        self.last_tool_result = None
         
         if working_dir is None:
             self.working_dir = os.getcwd()
@@ -32,12 +132,13 @@ class VitisHLSCompiler:
                 raise ValueError()
             self.log_file_path = log_file_path
 
-    def _collect_generated_verilog(self, project_name="proj"):
+    def _collect_generated_verilog(self, project_name="proj", solution_name="solution1"):
         """
         Collect generated Verilog files from the HLS synthesis output.
         
         Args:
             project_name: Name of the HLS project
+            solution_name: Name of the solution inside the project
             
         Returns:
             list: List of paths to generated Verilog files
@@ -46,7 +147,7 @@ class VitisHLSCompiler:
         
         # Common paths where Vitis HLS generates Verilog files
         synthesis_paths = [
-            os.path.join(self.working_dir, project_name, "solution1", "syn", "verilog"),
+            os.path.join(self.working_dir, project_name, solution_name, "syn", "verilog"),
             # os.path.join(self.working_dir, project_name, "solution1", "impl", "verilog"),
             # os.path.join(self.working_dir, project_name, "solution1", "syn", "vhdl"),
             # os.path.join(self.working_dir, project_name, "solution1", "impl", "vhdl")
@@ -55,10 +156,11 @@ class VitisHLSCompiler:
         for path in synthesis_paths:
             if os.path.exists(path):
                 # Find all Verilog files (.v, .sv) and VHDL files (.vhd, .vhdl)
-                v_files = glob.glob(os.path.join(path, "*.v"))
-                sv_files = glob.glob(os.path.join(path, "*.sv"))
-                vhd_files = glob.glob(os.path.join(path, "*.vhd"))
-                vhdl_files = glob.glob(os.path.join(path, "*.vhdl"))
+                # sorted, so that the merged verilog does not depend on the directory order
+                v_files = sorted(glob.glob(os.path.join(path, "*.v")))
+                sv_files = sorted(glob.glob(os.path.join(path, "*.sv")))
+                vhd_files = sorted(glob.glob(os.path.join(path, "*.vhd")))
+                vhdl_files = sorted(glob.glob(os.path.join(path, "*.vhdl")))
                 
                 verilog_files.extend(v_files)
                 # currently we only support v_files
@@ -68,46 +170,59 @@ class VitisHLSCompiler:
         
         return verilog_files
 
-    def _launch_hls_script(self):
+    def _launch_hls_script(self, job_count=1):
         """
         Launch the HLS script using vitis_hls command.
         
+        Args:
+            job_count: Number of solutions in the script, the timeout is per solution
+            
         Raises:
             RuntimeError: If vitis_hls is not available or compilation fails
         """
         if not self.vitis_hls_exists:
             raise RuntimeError("vitis_hls command not found in PATH")
             
-        # Change to working directory to ensure relative paths work correctly
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(self.working_dir)
-            cmd_hls = f"vitis_hls -f {os.path.basename(self.hls_script_path)} > {os.path.basename(self.log_file_path)} 2>&1"
-            ret = os.system(cmd_hls)
-            if ret != 0:
-                raise RuntimeError(f"vitis_hls command failed with exit code {ret}")
-            else:
-                print("[INFO] compile success from C to RTL")
-        finally:
-            os.chdir(original_cwd)
+        script_path = os.path.relpath(os.path.abspath(self.hls_script_path),
+                                      os.path.abspath(self.working_dir))
+        tool_runner = self.tool_runner
+        if job_count > 1 and tool_runner.timeout_s is not None:
+            tool_runner = ToolRunner(timeout_s=tool_runner.timeout_s * job_count,
+                                     memory_limit_mb=tool_runner.memory_limit_mb,
+                                     kill_grace_s=tool_runner.kill_grace_s)
+        # in a batch only what stalls the whole session stops it, an error of
+        # one solution is caught by the script
+        self.last_log_scanner = LogScanner(self.log_patterns if job_count == 1 else
+                                           get_batch_log_patterns(self.log_patterns))
+        self.last_tool_result = tool_runner.run(
+            ["vitis_hls", "-f", script_path],
+            cwd=self.working_dir,
+            log_file_path=self.log_file_path,
+            line_callback=self.last_log_scanner.feed_line
+        )
+        if self.last_tool_result.stopped_early:
+            fatal_match = self.last_log_scanner.fatal_match
+            raise RuntimeError(f"vitis_hls stopped early on {fatal_match.pattern_name} "
+                               f"at log line {fatal_match.line_number}: {fatal_match.line}")
+        if self.last_tool_result.timed_out:
+            raise RuntimeError(f"vitis_hls timed out after {tool_runner.timeout_s}s, "
+                               f"see {self.log_file_path}")
+        if self.last_tool_result.return_code != 0:
+            raise RuntimeError(f"vitis_hls command failed with exit code {self.last_tool_result.return_code}")
+        print("[INFO] compile success from C to RTL")
 
-    def _generate_hls_script(self,
-        project_name = "proj", top_name = "", clock_period = 0,
-        cpp_file_list = []):
+    def _scan_log_file(self, log_file_path):
         """
-        Generate HLS TCL script for synthesis.
-        
-        Args:
-            project_name: Name of the HLS project
-            top_name: Name of the top-level function
-            clock_period: Clock period in nanoseconds
-            cpp_file_list: List of C++ source files to include
-            
-        Raises:
-            TypeError: If arguments have wrong types
-            ValueError: If arguments have invalid values
-            FileNotFoundError: If C++ files don't exist
+        Get the diagnostics of a finished log, for results that did not come
+        from a scanned run (cache hits, batch jobs).
         """
+        if log_file_path is None or not os.path.exists(log_file_path):
+            return []
+        log_scanner = LogScanner(self.log_patterns)
+        log_scanner.scan_file(log_file_path)
+        return log_scanner.get_diagnostics()
+
+    def _check_design_args(self, project_name, top_name, clock_period, cpp_file_list):
         if not isinstance(project_name,str):
             raise TypeError()
         if not isinstance(top_name,str):
@@ -125,34 +240,151 @@ class VitisHLSCompiler:
             raise ValueError("empty top name")
         if clock_period <= 0:
             raise ValueError(f"illegal cp = {clock_period}")
-        
-        
-        file_list_add_str = ""
         for cpp_file in cpp_file_list:
             if not os.path.exists(cpp_file):
                 raise FileNotFoundError(f"cpp file not found: {cpp_file}")
-            # Use relative path if file is in working directory, otherwise absolute
-            if os.path.dirname(os.path.abspath(cpp_file)) == os.path.abspath(self.working_dir):
-                file_path = os.path.basename(cpp_file)
-            else:
-                file_path = os.path.abspath(cpp_file)
+
+    def _project_tcl(self, project_name, top_name, cpp_file_list):
+        file_list_add_str = ""
+        for cpp_file in cpp_file_list:
+            # Use path relative to the working directory, so that the script
+            # does not depend on where the output directory lives
+            file_path = os.path.relpath(os.path.abspath(cpp_file), os.path.abspath(self.working_dir))
             file_list_add_str += f"add_files {file_path}\n"
+        return f"open_project -reset {project_name}\nset_top {top_name}\n{file_list_add_str}\n"
+
+    def _solution_tcl(self, solution_name, clock_period):
+        return f'open_solution "{solution_name}" -flow_target {self.profile.flow_target}\n' + \
+            f"set_part {{{self.part}}}\n" + \
+            f"create_clock -period {clock_period} -name default\n" + \
+            self.profile.to_tcl()
+
+    def _generate_hls_script(self,
+        project_name = "proj", top_name = "", clock_period = 0,
+        cpp_file_list = []):
+        """
+        Generate HLS TCL script for synthesis.
+        
+        Args:
+            project_name: Name of the HLS project
+            top_name: Name of the top-level function
+            clock_period: Clock period in nanoseconds
+            cpp_file_list: List of C++ source files to include
             
+        Raises:
+            TypeError: If arguments have wrong types
+            ValueError: If arguments have invalid values
+            FileNotFoundError: If C++ files don't exist
+        """
+        self._check_design_args(project_name, top_name, clock_period, cpp_file_list)
 
-        script_content = f'''
-open_project -reset {project_name}
-set_top {top_name}
-{file_list_add_str}
-open_solution "solution1" -flow_target vivado
-set_part {{xc7z020clg484-1}}
-create_clock -period {clock_period} -name default
-csynth_design
-exit
-        '''
+        script_content = "\n" + \
+            self._project_tcl(project_name, top_name, cpp_file_list) + \
+            self._solution_tcl("solution1", clock_period) + \
+            "csynth_design\nexit\n        "
 
         with open(self.hls_script_path, "w") as f:
             f.write(script_content)
 
+    def _get_tool_version(self):
+        """
+        Identify the vitis_hls release for the cache key, the install path
+        of a release contains its version.
+        """
+        if self.tool_version is not None:
+            return self.tool_version
+        if os.environ.get("XILINX_HLS"):
+            return os.path.realpath(os.environ["XILINX_HLS"])
+        vitis_hls_path = shutil.which("vitis_hls")
+        if vitis_hls_path is not None:
+            return os.path.realpath(vitis_hls_path)
+        return "unknown"
+
+    def _get_cache_key(self, top_name, clock_period, cpp_file_list):
+        # the project and solution names and the source paths only decide
+        # where things go, the solution settings take part in the key
+        script_lines = [line.strip() for line in
+                        self._solution_tcl("solution1", clock_period).splitlines()]
+        return make_cache_key({
+            "tool": "vitis_hls",
+            "tool_version": self._get_tool_version(),
+            "part": self.part,
+            "top_name": top_name,
+            "clock_period": clock_period,
+            "cpp_sha256": [sha256_file(cpp_file) for cpp_file in cpp_file_list],
+            "script": script_lines,
+        })
+
+    def _store_in_cache(self, cache_key, project_name, solution_name="solution1", log_file_path=None):
+        solution_path = os.path.join(self.working_dir, project_name, solution_name)
+        log_file_path = self.log_file_path if log_file_path is None else log_file_path
+        files = {}
+        for sub_dir in ["verilog", "report"]:
+            for file_path in sorted(glob.glob(os.path.join(solution_path, "syn", sub_dir, "*"))):
+                if os.path.isfile(file_path):
+                    files[os.path.relpath(file_path, solution_path)] = file_path
+        if os.path.exists(log_file_path):
+            files["_log/hls_compile.log"] = log_file_path
+        self.cache.store(cache_key, files, metadata={"project_name": project_name,
+                                                     "solution_name": solution_name})
+
+    def _restore_from_cache(self, cache_key, project_name, solution_name="solution1", log_file_path=None):
+        """
+        Restore the synthesis results of a cache entry into the solution.
+
+        Returns:
+            bool: True on a cache hit
+        """
+        cache_entry = self.cache.lookup(cache_key)
+        if cache_entry is None:
+            return False
+        staging_path = self._stage_cache_entry(cache_entry, project_name, solution_name)
+        if staging_path is None:
+            return False
+        self._install_staged_entry(staging_path, project_name, solution_name, log_file_path)
+        return True
+
+    def _stage_cache_entry(self, cache_entry, project_name, solution_name="solution1"):
+        """
+        Copy a cache entry next to the projects, so that another process
+        evicting it can no longer take it away.
+
+        Returns:
+            str: The staging directory, None when the entry was evicted since the lookup
+        """
+        staging_path = os.path.join(self.working_dir, HLS_CACHE_STAGING_DIR, f"{project_name}__{solution_name}")
+        if os.path.exists(staging_path):
+            shutil.rmtree(staging_path)
+        try:
+            self.cache.restore(cache_entry, staging_path)
+        except FileNotFoundError:
+            print(f"[WARNING] HLS cache entry {cache_entry.key[:12]} was evicted during the restore, "
+                  f"synthesizing {project_name}/{solution_name}")
+            shutil.rmtree(staging_path, ignore_errors=True)
+            self._remove_staging_dir()
+            return None
+        return staging_path
+
+    def _remove_staging_dir(self):
+        try:
+            os.rmdir(os.path.join(self.working_dir, HLS_CACHE_STAGING_DIR))
+        except OSError:
+            # other entries are still staged
+            pass
+
+    def _install_staged_entry(self, staging_path, project_name, solution_name="solution1", log_file_path=None):
+        solution_path = os.path.join(self.working_dir, project_name, solution_name)
+        if os.path.exists(solution_path):
+            # same as open_solution -reset, no stale files from an earlier run
+            shutil.rmtree(solution_path)
+        staged_log_path = os.path.join(staging_path, "_log", "hls_compile.log")
+        if os.path.exists(staged_log_path):
+            shutil.move(staged_log_path, self.log_file_path if log_file_path is None else log_file_path)
+        shutil.rmtree(os.path.join(staging_path, "_log"), ignore_errors=True)
+        os.makedirs(os.path.dirname(solution_path), exist_ok=True)
+        os.rename(staging_path, solution_path)
+        self._remove_staging_dir()
+
     def compile(self, project_name="proj", top_name="", clock_period=10, cpp_file_list=[]):
         """
         Complete HLS compilation workflow: generate script, run synthesis, and collect results.
@@ -169,27 +401,43 @@ exit
                 - verilog_files: List of generated HDL files
                 - log_file: Path to compilation log
                 - project_path: Path to generated project directory
+                - cache_hit: True if the results were restored from the cache
+                - diagnostics: Log lines matching the log patterns
+                - metrics: SynthesisMetrics parsed from the csynth report, or None
                 
         Raises:
             RuntimeError: If vitis_hls is not available
             ValueError: If required parameters are invalid
             FileNotFoundError: If source files don't exist
         """
-        if not self.vitis_hls_exists:
+        if not self.vitis_hls_exists and self.cache is None:
             raise RuntimeError("vitis_hls is not available. Please install Vitis HLS and ensure it's in your PATH.")
         
+        self.last_tool_result = None
+        self.last_log_scanner = None
         try:
             # Step 1: Generate HLS script
             print(f"[INFO] Generating HLS script for project '{project_name}'")
             self._generate_hls_script(project_name, top_name, clock_period, cpp_file_list)
             
-            # Step 2: Launch HLS compilation
-            print(f"[INFO] Starting HLS synthesis...")
-            self._launch_hls_script()
+            # Step 2: Launch HLS compilation, unless the cache has the results
+            cache_hit = False
+            if self.cache is not None:
+                cache_key = self._get_cache_key(top_name, clock_period, cpp_file_list)
+                cache_hit = self._restore_from_cache(cache_key, project_name)
+                if cache_hit:
+                    print(f"[INFO] HLS cache hit {cache_key[:12]}, skipping synthesis")
+            if not cache_hit:
+                if not self.vitis_hls_exists:
+                    raise RuntimeError("vitis_hls is not available and the HLS cache has no entry for this design")
+                print(f"[INFO] Starting HLS synthesis...")
+                self._launch_hls_script()
             
             # Step 3: Collect generated files
             print(f"[INFO] Collecting generated HDL files...")
             verilog_files = self._collect_generated_verilog(project_name)
+            if self.cache is not None and not cache_hit and len(verilog_files) > 0:
+                self._store_in_cache(cache_key, project_name)
             
             project_path = os.path.join(self.working_dir, project_name)
             
@@ -198,7 +446,12 @@ exit
                 "verilog_files": verilog_files,
                 "log_file": self.log_file_path,
                 "project_path": project_path if os.path.exists(project_path) else None,
-                "script_file": self.hls_script_path
+                "script_file": self.hls_script_path,
+                "exit_info": None if cache_hit else self.last_tool_result.to_dict(),
+                "cache_hit": cache_hit,
+                "diagnostics": self._scan_log_file(self.log_file_path) if cache_hit else \
+                    self.last_log_scanner.get_diagnostics(),
+                "metrics": self.get_synthesis_metrics(project_name, top_name)
             }
             
             print(f"[INFO] Compilation completed successfully. Generated {len(verilog_files)} HDL files.")
@@ -210,10 +463,172 @@ exit
                 "success": False,
                 "error": str(e),
                 "log_file": self.log_file_path if os.path.exists(self.log_file_path) else None,
-                "script_file": self.hls_script_path if os.path.exists(self.hls_script_path) else None
+                "script_file": self.hls_script_path if os.path.exists(self.hls_script_path) else None,
+                "exit_info": self.last_tool_result.to_dict() if self.last_tool_result is not None else None,
+                "diagnostics": self.last_log_scanner.get_diagnostics() if self.last_log_scanner is not None else []
             }
             return result
 
+    def _generate_batch_script(self, job_list:List[HLSJob]):
+        """
+        Generate one TCL script synthesizing every job in a single vitis_hls session.
+        Every solution runs inside a catch, so that a failing one does not stop
+        the others, and is framed by markers to split the log per job.
+        """
+        script_content = "\n"
+        project_name_list = list(dict.fromkeys(job.project_name for job in job_list))
+        for project_name in project_name_list:
+            project_job_list = [job for job in job_list if job.project_name == project_name]
+            first_job = project_job_list[0]
+            script_content += self._project_tcl(project_name, first_job.top_name, first_job.cpp_file_list)
+            for job in project_job_list:
+                script_content += f'puts "{BATCH_BEGIN_MARKER} {job.get_tag()}"\n'
+                script_content += self._solution_tcl(job.solution_name, job.clock_period).replace(
+                    "open_solution ", "open_solution -reset ", 1)
+                script_content += "if {[catch {csynth_design} batch_error]} {\n" + \
+                    f'    puts "{BATCH_END_MARKER} {job.get_tag()} failed: $batch_error"\n' + \
+                    "} else {\n" + \
+                    f'    puts "{BATCH_END_MARKER} {job.get_tag()} done"\n' + \
+                    "}\n"
+            script_content += "close_project\n\n"
+        script_content += "exit\n"
+
+        with open(self.hls_script_path, "w") as f:
+            f.write(script_content)
+
+    def _demultiplex_batch_log(self, job_list:List[HLSJob]):
+        """
+        Split the batch log into the per-job logs.
+
+        Returns:
+            dict: job tag -> "done", "failed" or None when the job never finished
+        """
+        job_status = {job.get_tag(): None for job in job_list}
+        job_log_files = {}
+        current_tag = None
+        try:
+            with open(self.log_file_path, errors="replace") as batch_log:
+                for line in batch_log:
+                    if line.startswith(BATCH_BEGIN_MARKER + " "):
+                        current_tag = line[len(BATCH_BEGIN_MARKER) + 1:].strip()
+                        if current_tag in job_status:
+                            job = next(job for job in job_list if job.get_tag() == current_tag)
+                            job_log_files[current_tag] = open(job.log_file_path, "w")
+                    if current_tag in job_log_files:
+                        job_log_files[current_tag].write(line)
+                    if line.startswith(BATCH_END_MARKER + " ") and current_tag in job_status:
+                        tokens = line[len(BATCH_END_MARKER) + 1:].split()
+                        if len(tokens) >= 2 and tokens[0] == current_tag:
+                            job_status[current_tag] = "done" if tokens[1] == "done" else "failed"
+                        current_tag = None
+        finally:
+            for job_log_file in job_log_files.values():
+                job_log_file.close()
+        return job_status
+
+    def compile_batch(self, job_list:List[HLSJob]):
+        """
+        Synthesize several projects or solutions in one vitis_hls launch, to
+        pay the tool startup once. Jobs found in the cache are restored instead.
+        A failing solution does not stop the others, its errors are kept in
+        its diagnostics. A fatal log match that is not a solution error (a
+        design size blowup) stops the whole session, the jobs that did not
+        finish by then fail.
+
+        Args:
+            job_list: Jobs to synthesize
+
+        Returns:
+            list: One result dict per job, in the order of job_list, with the
+                  same keys as compile() plus "solution_name"
+        """
+        if not isinstance(job_list, list) or len(job_list) == 0:
+            raise ValueError("expected a non empty list of HLSJob")
+        tag_set = set()
+        project_designs = {}
+        for job in job_list:
+            if not isinstance(job, HLSJob):
+                raise TypeError(f"expected HLSJob but got {type(job)}")
+            self._check_design_args(job.project_name, job.top_name, job.clock_period, job.cpp_file_list)
+            if job.get_tag() in tag_set:
+                raise ValueError(f"duplicated batch job {job.get_tag()}")
+            tag_set.add(job.get_tag())
+            design = (job.top_name, tuple(job.cpp_file_list))
+            if project_designs.setdefault(job.project_name, design) != design:
+                raise ValueError(f"jobs of project {job.project_name} must share the top and the sources")
+            if job.log_file_path is None:
+                job.log_file_path = os.path.join(self.working_dir, f"{job.project_name}_{job.solution_name}.log")
+        if not self.vitis_hls_exists and self.cache is None:
+            raise RuntimeError("vitis_hls is not available. Please install Vitis HLS and ensure it's in your PATH.")
+
+        cache_keys = {}
+        staging_paths = {}
+        if self.cache is not None:
+            for job in job_list:
+                cache_keys[job.get_tag()] = self._get_cache_key(job.top_name, job.clock_period, job.cpp_file_list)
+                cache_entry = self.cache.lookup(cache_keys[job.get_tag()])
+                if cache_entry is not None:
+                    staging_path = self._stage_cache_entry(cache_entry, job.project_name, job.solution_name)
+                    if staging_path is not None:
+                        staging_paths[job.get_tag()] = staging_path
+        hit_job_list = [job for job in job_list if job.get_tag() in staging_paths]
+        # a project holding a job to synthesize is reset by the batch, its
+        # cached solutions are staged now and installed after the run
+        run_job_list = [job for job in job_list if job not in hit_job_list]
+
+        job_status = {job.get_tag(): "done" for job in hit_job_list}
+        batch_error = None
+        if len(run_job_list) > 0:
+            try:
+                if not self.vitis_hls_exists:
+                    raise RuntimeError("vitis_hls is not available and the HLS cache misses "
+                                       f"{len(run_job_list)} batch jobs")
+                print(f"[INFO] Generating HLS batch script for {len(run_job_list)} solutions")
+                self._generate_batch_script(run_job_list)
+                print(f"[INFO] Starting HLS batch synthesis...")
+                try:
+                    self._launch_hls_script(job_count=len(run_job_list))
+                finally:
+                    if os.path.exists(self.log_file_path):
+                        job_status.update(self._demultiplex_batch_log(run_job_list))
+            except Exception as e:
+                print(f"[ERROR] Batch compilation failed: {str(e)}")
+                batch_error = str(e)
+
+        for job in hit_job_list:
+            self._install_staged_entry(staging_paths[job.get_tag()], job.project_name, job.solution_name,
+                                       log_file_path=job.log_file_path)
+            print(f"[INFO] HLS cache hit {cache_keys[job.get_tag()][:12]} for {job.get_tag()}")
+
+        result_list = []
+        for job in job_list:
+            verilog_files = self._collect_generated_verilog(job.project_name, job.solution_name)
+            cache_hit = job in hit_job_list
+            success = job_status.get(job.get_tag()) == "done" and len(verilog_files) > 0
+            if success and self.cache is not None and not cache_hit:
+                self._store_in_cache(cache_keys[job.get_tag()], job.project_name, job.solution_name,
+                                     log_file_path=job.log_file_path)
+            project_path = os.path.join(self.working_dir, job.project_name)
+            result = {
+                "success": success,
+                "verilog_files": verilog_files,
+                "log_file": job.log_file_path if os.path.exists(job.log_file_path) else None,
+                "project_path": project_path if os.path.exists(project_path) else None,
+                "solution_name": job.solution_name,
+                "script_file": self.hls_script_path if os.path.exists(self.hls_script_path) else None,
+                "exit_info": None if cache_hit or self.last_tool_result is None else self.last_tool_result.to_dict(),
+                "cache_hit": cache_hit,
+                "diagnostics": self._scan_log_file(job.log_file_path),
+                "metrics": self.get_synthesis_metrics(job.project_name, job.top_name, job.solution_name)
+            }
+            if not success:
+                result["error"] = batch_error if batch_error is not None else \
+                    f"solution {job.get_tag()} {job_status.get(job.get_tag()) or 'did not finish'}"
+            result_list.append(result)
+        print(f"[INFO] Batch compilation finished: "
+              f"{sum(r['success'] for r in result_list)}/{len(result_list)} solutions succeeded")
+        return result_list
+
     def check_vitis_hls_availability(self):
         """
         Check if Vitis HLS is available in the system.
@@ -243,7 +658,8 @@ exit
             report_files = {
                 "synthesis_report": os.path.join(solution_path, "syn", "report", f"{project_name}_csynth.rpt"),
                 "timing_report": os.path.join(solution_path, "syn", "report", f"{project_name}_timing_report.rpt"),
-                "utilization_report": os.path.join(solution_path, "syn", "report", f"{project_name}_utilization_report.rpt")
+                "utilization_report": os.path.join(solution_path, "syn", "report", f"{project_name}_utilization_report.rpt"),
+                "synthesis_xml": os.path.join(solution_path, "syn", "report", "csynth.xml")
             }
             
             for report_name, report_path in report_files.items():
@@ -252,19 +668,61 @@ exit
         
         return reports
 
-    def clean_project(self, project_name="proj"):
+    def get_synthesis_metrics(self, project_name="proj", top_name=None, solution_name="solution1"):
+        """
+        Parse the csynth XML report of a solution.
+
+        Args:
+            project_name: Name of the HLS project
+            top_name: Name of the top-level function, to find the per-top report
+            solution_name: Name of the solution inside the project
+
+        Returns:
+            SynthesisMetrics: the report numbers, or None if there is no report
+        """
+        xml_file_path = find_csynth_xml(os.path.join(self.working_dir, project_name, solution_name), top_name)
+        if xml_file_path is None:
+            return None
+        try:
+            return parse_csynth_xml(xml_file_path)
+        except Exception as e:
+            print(f"[WARNING] Failed to parse csynth report {xml_file_path}: {str(e)}")
+            return None
+
+    def apply_retention_policy(self, project_name="proj", policy="delete"):
+        """
+        Prune a synthesized project down to what the downstream flow reads:
+        the Verilog, the csynth reports and the logs. The rest is packed,
+        compressed or deleted, see retention.apply_retention.
+        
+        Args:
+            project_name: Name of the HLS project
+            policy: One of keep, pack, compress, delete
+            
+        Returns:
+            dict: Retention report with the bytes reclaimed
+        """
+        return apply_retention(os.path.join(self.working_dir, project_name), HLS_KEEP_PATTERNS, policy)
+
+    def clean_project(self, project_name="proj", retention_policy=None):
         """
         Clean up generated project files.
         
         Args:
             project_name: Name of the HLS project to clean
+            retention_policy: Optional retention policy, the project is then
+                              pruned by apply_retention_policy instead of removed
             
         Returns:
             bool: True if cleanup was successful, False otherwise
         """
         try:
             project_path = os.path.join(self.working_dir, project_name)
-            if os.path.exists(project_path):
+            if retention_policy is not None:
+                report = self.apply_retention_policy(project_name, retention_policy)
+                print(f"[INFO] Retention '{retention_policy}' on {project_path}: "
+                      f"{report['bytes_reclaimed']} bytes reclaimed, {report['files_pruned']} files pruned")
+            elif os.path.exists(project_path):
                 shutil.rmtree(project_path)
                 print(f"[INFO] Cleaned project directory: {project_path}")
             
@@ -1,199 +1,413 @@
 import os
+import copy
 import subprocess
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+from tool_runner import ToolRunner
+from artifact_cache import make_cache_key
+from artifact_manifest import sha256_file
+from verilog_processing import property_preprocess
+
+# yosys -V output per executable, asked once per process
+_tool_version_by_path = {}
+
+
+@dataclass
+class AigerRecipe:
+    """
+    The yosys commands turning a design into an AIG: how it is read, the
+    commands elaborating it ({top} is the top module) and the bit-level
+    mapping and optimization. The word-level outputs are written between the
+    two. An ABC script is one word, +cmd;cmd with commas for blanks,
+    so its ; do not end the yosys command.
+    """
+    name : str
+    read_command : str = "read -sv"
+    front_commands : List[str] = field(default_factory=lambda: [
+        "prep -top {top}",
+        "flatten",
+        "memory -nordff",
+        "setundef -undriven -init -expose",
+    ])
+    optimize_commands : List[str] = field(default_factory=list)
+
+
+# yosys-side sweeps before ABC: constant and duplicate latches, dead logic
+_LATCH_SWEEP = ["opt -full", "opt_dff", "opt_clean"]
+
+AIGER_RECIPES = {
+    # what the benchmark flow always used, ABC on the combinational logic only
+    "fast": AigerRecipe(name="fast", optimize_commands=["techmap", "abc -fast -g AND"]),
+    # the ABC default script after the latch sweeps
+    "balanced": AigerRecipe(name="balanced", optimize_commands=["techmap"] + _LATCH_SWEEP + ["abc -g AND", "opt_clean"]),
+    # rewriting with choices and SAT sweeping, latches stay in place
+    "strong": AigerRecipe(name="strong", optimize_commands=["techmap"] + _LATCH_SWEEP + [
+        "abc -g AND -script +strash;dc2;fraig;dc2;dch,-f;map", "opt_clean"]),
+    # the latches go through ABC as well, scorr merges equivalent latches
+    "strong_seq": AigerRecipe(name="strong_seq", optimize_commands=["techmap"] + _LATCH_SWEEP + [
+        "abc -dff -g AND -script +strash;scorr;dc2;fraig;dch,-f;map", "opt_clean"]),
+    # strong_seq with retiming, the latch count and positions change
+    "strong_retime": AigerRecipe(name="strong_retime", optimize_commands=["techmap"] + _LATCH_SWEEP + [
+        "abc -dff -g AND -script +strash;scorr;dc2;dretime;strash;dch,-f;map", "opt_clean"]),
+    # the former execute_liyou script, a full synth instead of prep
+    "liyou": AigerRecipe(name="liyou", read_command="read_verilog",
+                         front_commands=["synth -top {top}", "flatten", "memory -nordff"],
+                         optimize_commands=["aigmap", "abc -fast -g AND"]),
+}
+
+
+OUTPUT_FORMATS = ["aiger", "btor", "smt2"]
+
+# word-level writers, run on the elaborated design before the bit-level mapping
+_WORD_LEVEL_WRITERS = {"btor": "write_btor", "smt2": "write_smt2"}
+
+
+def get_output_formats(output_formats) -> List[str]:
+    if isinstance(output_formats, str):
+        output_formats = [f.strip() for f in output_formats.split(",") if f.strip() != ""]
+    output_formats = list(output_formats)
+    if len(output_formats) == 0:
+        raise ValueError("at least one output format is needed")
+    for output_format in output_formats:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"unknown output format {output_format}, expected one of {OUTPUT_FORMATS}")
+    return [f for f in OUTPUT_FORMATS if f in output_formats]
+
+
+def get_output_file_paths(aiger_file_path:str, output_formats:List[str]) -> Dict[str, str]:
+    """
+    Get the files written for the output formats, named after the AIGER file:
+    miter.aig, miter.btor and miter.smt2.
+    """
+    base_path = os.path.splitext(aiger_file_path)[0]
+    return {output_format: aiger_file_path if output_format == "aiger" else f"{base_path}.{output_format}"
+            for output_format in output_formats}
+
+
+def get_aiger_map_path(aiger_file_path:str) -> str:
+    """
+    Get the port and latch map written next to the AIGER file: miter.aig.map.
+    """
+    return f"{aiger_file_path}.map"
+
+
+def get_aiger_recipe(recipe:Union[str, AigerRecipe]) -> AigerRecipe:
+    if isinstance(recipe, AigerRecipe):
+        return recipe
+    if not isinstance(recipe, str):
+        raise TypeError(f"expected str or AigerRecipe but got {type(recipe)}")
+    if recipe not in AIGER_RECIPES:
+        raise ValueError(f"unknown AIGER recipe {recipe}, expected one of {sorted(AIGER_RECIPES.keys())}")
+    return AIGER_RECIPES[recipe]
 
 class YosysCompiler:
 
-    def __init__(self):
-        self.yosys_script_path = ""
+    def __init__(self, timeout_s = None, memory_limit_mb = None, yosys_path = None, worker_pool = None,
+                 cache = None, aiger_recipe = "fast", output_formats = ("aiger",)):
+        # the yosys executable, $YOSYS or yosys on the PATH by default
+        if yosys_path is None:
+            yosys_path = os.environ.get("YOSYS", "yosys")
+        if yosys_path == "":
+            raise ValueError("yosys_path cannot be empty")
+        self.yosys_path = yosys_path
+        self.tool_runner = ToolRunner(timeout_s=timeout_s, memory_limit_mb=memory_limit_mb)
+        # an optional YosysWorkerPool running the sessions instead of a fresh yosys
+        self.worker_pool = worker_pool
+        # an optional ArtifactCache of the yosys outputs
+        self.cache = cache
+        self.last_cache_hit = False
+        # the mapping and optimization commands of the AIGER export
+        self.aiger_recipe = get_aiger_recipe(aiger_recipe)
+        # what the AIGER session writes, word-level formats from the same elaborated design
+        self.output_formats = get_output_formats(output_formats)
+        self.last_tool_result = None
+        # commands of the current session, run by run_session in one launch
+        self.session_commands = None
+        self.log_file_path = ""
         self.aiger_file_path = ""
         self.verilog_output_file_path = ""
+        self.working_dir = ""
 
-    def _generate_script_content_flatten(self,
-        working_dir:str = "",
-        verilog_file_path:str = "",
-        top_name:str = "",
-        flattened_file_path:str= ""):
-        if not os.path.isdir(working_dir):
-            raise FileNotFoundError()
-        if not os.path.exists(verilog_file_path):
-            raise FileNotFoundError()
-        if top_name == "":
-            raise ValueError()
-        if flattened_file_path == "":
-            raise ValueError()
-        
-        yosys_script = [
-            f"read -sv {verilog_file_path}",
-            f"prep -top {top_name}",
-            "flatten",
-            f"write_verilog -noattr -noparallelcase -simple-lhs {flattened_file_path}"
-        ]
+    def _path_in_script(self, file_path:str, working_dir:str):
+        # yosys runs inside working_dir, paths in the script are relative to it
+        # so that the same inputs give byte-identical scripts on any machine.
+        # The pool workers serve every working dir and get absolute paths.
+        if self.worker_pool is not None:
+            return os.path.abspath(file_path)
+        return os.path.relpath(os.path.abspath(file_path), os.path.abspath(working_dir))
 
-        yosys_script_content = "\n".join(yosys_script)
-        
-        self.yosys_script_path = os.path.join(working_dir, "flatten_verilog.ys")
-        with open(self.yosys_script_path, "w") as f:
-            f.write(yosys_script_content)
-
-    def _generate_script_content_to_aiger(self, 
-        working_dir:str = "",
-        verilog_file_path:str = "",
-        top_name:str = "",
-        is_ascii:bool = True,
-        has_symbol:bool = True,
-        aiger_file_path = ""):
+    def fork(self):
+        """
+        Get a compiler with the same settings, worker pool and cache but its
+        own session, to run sessions on another thread.
+        """
+        forked = copy.copy(self)
+        forked.session_commands = None
+        forked.last_tool_result = None
+        forked.last_cache_hit = False
+        return forked
+
+    def begin_session(self, working_dir:str):
+        """
+        Start collecting the commands of one yosys run. Every design added to
+        the session is processed from a clean state, the whole session is a
+        single yosys launch.
+        """
         if not os.path.isdir(working_dir):
-            raise FileNotFoundError()
-        if not os.path.exists(verilog_file_path):
-            raise FileNotFoundError()
-        if top_name == "":
-            raise ValueError()
-        
-        if is_ascii:
-            if not self.aiger_file_path.endswith(".aag"):
-                raise ValueError(f"ascii aiger should ends with .aag"+\
-                    f" but got {self.aiger_file_path}")
-        else:
-            if not self.aiger_file_path.endswith(".aig"):
-                raise ValueError(f"binary aiger should ends with .aig"+\
-                    f" but got {self.aiger_file_path}")
-        
-        write_aiger_ascii_option = " -ascii " if is_ascii else ""
-        symbol_option = " -symbols " if has_symbol else ""
+            raise FileNotFoundError(f"working directory not found: {working_dir}")
+        self.working_dir = working_dir
+        self.session_commands = []
 
+    def _add_design(self, command_list):
+        if self.session_commands is None:
+            raise ValueError("no yosys session, call begin_session first")
+        if len(self.session_commands) > 0:
+            self.session_commands.append("design -reset")
+        self.session_commands.extend(command_list)
 
-        yosys_script = [
-            f"read -sv {verilog_file_path}",
+    def _flatten_commands(self, source:str, output:str, top_name:str):
+        return [
+            f"read -sv {source}",
             f"prep -top {top_name}",
             "flatten",
-            "memory -nordff",
-            "setundef -undriven -init -expose",
-            # f"sim -clock ap_clk -reset _setup -rstlen 1 -n 1 -w {top_name}",
-            # f"sim -clock ap_clk -n 1 -w {top_name}",
-            # "delete -output",
-            "techmap",
-            "abc -fast -g AND",
-            f"write_aiger -zinit {symbol_option} {write_aiger_ascii_option} {aiger_file_path}"
+            f"write_verilog -noattr -noparallelcase -simple-lhs {output}"
         ]
 
-        yosys_script_content = "\n".join(yosys_script)
-        
-        self.yosys_script_path = os.path.join(working_dir, "miter_to_aiger.ys")
-        with open(self.yosys_script_path, "w") as f:
-            f.write(yosys_script_content)
-
-    def _generate_script_content_to_aiger_liyou(self, 
-        working_dir:str = "",
-        verilog_file_path:str = "",
-        top_name:str = "",
-        is_ascii:bool = True,
-        has_symbol:bool = True,
-        aiger_file_path = ""):
-        if not os.path.isdir(working_dir):
-            raise FileNotFoundError()
+    def _aiger_write_command(self, output:str, is_ascii:bool, has_symbol:bool, has_map:bool = False):
+        option_list = ["-zinit"]
+        if has_symbol:
+            option_list.append("-symbols")
+        if has_map:
+            option_list.append(f"-map {get_aiger_map_path(output)}")
+        if is_ascii:
+            option_list.append("-ascii")
+        return f"write_aiger {' '.join(option_list)} {output}"
+
+    def _aiger_commands(self, source:str, output:str, top_name:str,
+                        is_ascii:bool = False, has_symbol:bool = False, recipe = None,
+                        has_map:bool = False, read_command:Optional[str] = None):
+        recipe = self.aiger_recipe if recipe is None else get_aiger_recipe(recipe)
+        output_paths = get_output_file_paths(output, self.output_formats)
+        read_command = recipe.read_command if read_command is None else read_command
+        command_list = [f"{read_command} {source}"] + \
+            [command.format(top=top_name) for command in recipe.front_commands]
+        word_level_formats = [f for f in self.output_formats if f in _WORD_LEVEL_WRITERS]
+        if word_level_formats:
+            # the word-level writers need plain synchronous flip-flops, the
+            # AIGER export continues from the design as elaborated
+            if "aiger" in self.output_formats:
+                command_list.append("design -save aiger_front")
+            command_list += ["async2sync", "dffunmap"]
+            command_list += [f"{_WORD_LEVEL_WRITERS[f]} {output_paths[f]}" for f in word_level_formats]
+            if "aiger" in self.output_formats:
+                # the assertion is for the word-level checkers, the AIGER keeps the output only
+                command_list += ["design -load aiger_front", "chformal -assert -remove"]
+        if "aiger" in self.output_formats:
+            command_list += recipe.optimize_commands + [self._aiger_write_command(output, is_ascii, has_symbol, has_map)]
+        return command_list
+
+    def _check_design_args(self, verilog_file_path:str, output_file_path:str, top_name:str):
         if not os.path.exists(verilog_file_path):
-            raise FileNotFoundError()
+            raise FileNotFoundError(f"verilog file not found: {verilog_file_path}")
         if top_name == "":
-            raise ValueError()
-        
+            raise ValueError("top_name cannot be empty")
+        if output_file_path == "":
+            raise ValueError("output file path cannot be empty")
+
+    def _check_aiger_path(self, aiger_file_path:str, is_ascii:bool):
         if is_ascii:
-            if not self.aiger_file_path.endswith(".aag"):
-                raise ValueError(f"ascii aiger should ends with .aag"+\
-                    f" but got {self.aiger_file_path}")
+            if not aiger_file_path.endswith(".aag"):
+                raise ValueError(f"ascii aiger should ends with .aag but got {aiger_file_path}")
         else:
-            if not self.aiger_file_path.endswith(".aig"):
-                raise ValueError(f"binary aiger should ends with .aig"+\
-                    f" but got {self.aiger_file_path}")
-        
-        write_aiger_ascii_option = " -ascii " if is_ascii else ""
-        symbol_option = " -symbols " if has_symbol else ""
+            if not aiger_file_path.endswith(".aig"):
+                raise ValueError(f"binary aiger should ends with .aig but got {aiger_file_path}")
 
+    def add_flatten(self, verilog_file_path:str, verilog_output_file_path:str, top_name:str = "top"):
+        self._check_design_args(verilog_file_path, verilog_output_file_path, top_name)
+        self.verilog_output_file_path = verilog_output_file_path
+        self._add_design(self._flatten_commands(
+            self._path_in_script(verilog_file_path, self.working_dir),
+            self._path_in_script(verilog_output_file_path, self.working_dir),
+            top_name))
 
-        yosys_script = [
-            f"read_verilog {verilog_file_path}",
-            f"synth -top {top_name}",
-            "flatten",
-            "memory -nordff",
-            "aigmap",
-            "abc -fast -g AND",
-            f"write_aiger -zinit {symbol_option} {write_aiger_ascii_option} {aiger_file_path}"
-        ]
+    def add_to_aiger(self, verilog_file_path:str, aiger_file_path:str, top_name:str = "top",
+                     is_ascii:bool = False, has_symbol:bool = False, recipe = None,
+                     has_map:bool = False):
+        self._check_design_args(verilog_file_path, aiger_file_path, top_name)
+        self._check_aiger_path(aiger_file_path, is_ascii)
+        self.aiger_file_path = aiger_file_path
+        read_command = None
+        if any(f in _WORD_LEVEL_WRITERS for f in self.output_formats):
+            # BTOR2 and SMT2 carry the miter property as an assertion, a bad
+            # state resp. an assert of the model. The assertion is SVA, read
+            # with -sv whatever the recipe reads with
+            property_file_path = os.path.splitext(aiger_file_path)[0] + "_property.v"
+            if property_preprocess(verilog_file_path, property_file_path):
+                verilog_file_path = property_file_path
+                read_command = "read -sv"
+        self._add_design(self._aiger_commands(
+            self._path_in_script(verilog_file_path, self.working_dir),
+            self._path_in_script(aiger_file_path, self.working_dir),
+            top_name, is_ascii, has_symbol, recipe, has_map, read_command))
 
-        yosys_script_content = "\n".join(yosys_script)
-        
-        self.yosys_script_path = os.path.join(working_dir, "miter_to_aiger.ys")
-        with open(self.yosys_script_path, "w") as f:
-            f.write(yosys_script_content)
-
-    def _execute_compile(self, yosys_path = ""):
-        if self.yosys_script_path == "":
-            raise ValueError("yosys script path is empty")
-        if not os.path.exists(self.yosys_script_path):
-            raise FileNotFoundError()
-        print(f"[INFO] run yosys which script {self.yosys_script_path}")
-        yosys_call = "yosys"
-        if yosys_path != "":
-            yosys_call = yosys_path
+    def get_tool_version(self):
+        """
+        Get the yosys -V output, "unknown" if yosys cannot tell.
+        """
+        if self.yosys_path not in _tool_version_by_path:
+            try:
+                completed = subprocess.run([self.yosys_path, "-V"], capture_output=True,
+                                           text=True, timeout=60)
+                version = completed.stdout.strip() if completed.returncode == 0 else ""
+            except (OSError, subprocess.TimeoutExpired):
+                version = ""
+            _tool_version_by_path[self.yosys_path] = version if version != "" else "unknown"
+        return _tool_version_by_path[self.yosys_path]
+
+    def get_cache_key(self, stage:str, verilog_file_path:str, top_name:str, **key_parts):
+        """
+        Get the cache key of a flatten or aiger run. The key holds the yosys
+        version, the input content and the script with placeholder paths, so
+        the location of a design does not matter.
+
+        Args:
+            stage: flatten or aiger
+            verilog_file_path: Input of the run
+            top_name: Top module
+            key_parts: More json-serializable parts of the key
+
+        Returns:
+            str: The cache key
+        """
+        command_builder = {"flatten": self._flatten_commands, "aiger": self._aiger_commands}[stage]
+        return make_cache_key(dict(key_parts, **{
+            "tool": "yosys",
+            "tool_version": self.get_tool_version(),
+            "stage": stage,
+            "top_name": top_name,
+            "input_sha256": sha256_file(verilog_file_path),
+            "script": command_builder("<input>", "<output>", top_name),
+        }))
+
+    def restore_from_cache(self, cache_key:str, output_files:Dict[str, str],
+                           log_file_path:Optional[str] = None):
+        """
+        Copy the files of a cache entry to their destinations.
+
+        Args:
+            cache_key: Key from get_cache_key
+            output_files: Name in the entry -> destination path
+            log_file_path: Destination of the log of the cached run
+
+        Returns:
+            bool: True on a cache hit
+        """
+        self.last_cache_hit = False
+        if self.cache is None:
+            return False
+        cache_entry = self.cache.lookup(cache_key)
+        if cache_entry is None or any(name not in cache_entry.files for name in output_files):
+            return False
+        dest_paths = dict(output_files)
+        if log_file_path is not None and "_log/yosys.log" in cache_entry.files:
+            dest_paths["_log/yosys.log"] = log_file_path
         try:
-            result = subprocess.run(
-            [yosys_call, "-S", self.yosys_script_path],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            self.cache.restore_files(cache_entry, dest_paths)
+        except FileNotFoundError:
+            print(f"[WARNING] yosys cache entry {cache_key[:12]} was evicted during the restore, running yosys")
+            return False
+        self.last_cache_hit = True
+        print(f"[INFO] yosys cache hit {cache_key[:12]}, skipping the run")
+        return True
+
+    def store_in_cache(self, cache_key:str, output_files:Dict[str, str],
+                       log_file_path:Optional[str] = None):
+        if self.cache is None:
+            return
+        files = dict(output_files)
+        if log_file_path is not None and os.path.exists(log_file_path):
+            files["_log/yosys.log"] = log_file_path
+        self.cache.store(cache_key, files)
+
+    def get_session_script(self):
+        return "; ".join(self.session_commands or [])
+
+    def run_session(self, log_file_path:str):
+        """
+        Run the commands of the session in one yosys launch. The script is
+        passed with -p, no script file is written. With a worker pool the
+        session runs on a pool worker instead.
+
+        Args:
+            log_file_path: File receiving the yosys output
+        """
+        if not self.session_commands:
+            raise ValueError("the yosys session has no commands")
+        self.log_file_path = log_file_path
+        script = self.get_session_script()
+        command_list = self.session_commands
+        self.session_commands = None
+        print(f"[INFO] run yosys in {self.working_dir}, log {log_file_path}")
+        if self.worker_pool is not None:
+            from yosys_worker import YosysJob
+            self.last_tool_result = self.worker_pool.submit(
+                YosysJob(command_list=command_list, log_file_path=log_file_path)).result()
+        else:
+            self.last_tool_result = self.tool_runner.run(
+                [self.yosys_path, "-p", script],
+                cwd=self.working_dir,
+                log_file_path=log_file_path
             )
-        except subprocess.CalledProcessError as e: 
-            raise RuntimeError(f"Yosys compilation failed:\n{e.stderr}") from e
-        
-        # check output aiger exists
-        # if not os.path.exists(self.aiger_file_path):
-        #     raise FileNotFoundError()
+        if not self.last_tool_result.success:
+            reason = "timed out" if self.last_tool_result.timed_out else \
+                f"exit code {self.last_tool_result.return_code}"
+            raise RuntimeError(f"Yosys compilation failed ({reason}):\n{self.last_tool_result.log_tail()}")
         print("[INFO] compile success, generated")
 
     def execute_flatten(self, verilog_file_path:str, 
                 working_dir:str,
                 verilog_output_file_path:str,
                 top_name:str = "top"):
-        self.verilog_output_file_path = verilog_output_file_path
-        self._generate_script_content_flatten(
-            working_dir=working_dir,
-            top_name=top_name,
-            verilog_file_path=verilog_file_path,
-            flattened_file_path=verilog_output_file_path
-        )
-        print(f"[INFO] generated script at {self.yosys_script_path}")
-        self._execute_compile(yosys_path="/home/x/xiaofeng-zhou/oss_cad/oss_cad_2025/oss-cad-suite/bin/yosys")
+        self.begin_session(working_dir)
+        self.add_flatten(verilog_file_path, verilog_output_file_path, top_name=top_name)
+        self.run_session(os.path.splitext(verilog_output_file_path)[0] + "_yosys.log")
         
     def execute(self, verilog_file_path:str, 
                 working_dir:str,
                 aiger_file_path:str,
-                top_name:str = "top"):
-        self.aiger_file_path = aiger_file_path
-        self._generate_script_content_to_aiger(
-            verilog_file_path=verilog_file_path,
-            working_dir=working_dir,
-            top_name=top_name,
-            is_ascii=False, has_symbol=False,
-            aiger_file_path=aiger_file_path
-        )
-        print(f"[INFO] generated script at {self.yosys_script_path}")
-        self._execute_compile()
+                top_name:str = "top",
+                has_symbol:bool = False,
+                has_map:bool = False):
+        log_file_path = os.path.splitext(aiger_file_path)[0] + "_yosys.log"
+        cache_files = {"design.aig" if output_format == "aiger" else f"design.{output_format}": file_path
+                       for output_format, file_path in
+                       get_output_file_paths(aiger_file_path, self.output_formats).items()}
+        # the map names the AIGER inputs and latches after the miter ports
+        has_map = has_map and "aiger" in self.output_formats
+        if has_map:
+            cache_files["design.aig.map"] = get_aiger_map_path(aiger_file_path)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.get_cache_key("aiger", verilog_file_path, top_name,
+                                           **({"has_symbol": True} if has_symbol else {}),
+                                           **({"has_map": True} if has_map else {}))
+            if self.restore_from_cache(cache_key, cache_files, log_file_path):
+                self.log_file_path = log_file_path
+                return
+        self.begin_session(working_dir)
+        self.add_to_aiger(verilog_file_path, aiger_file_path, top_name=top_name, has_symbol=has_symbol,
+                          has_map=has_map)
+        self.run_session(log_file_path)
+        if cache_key is not None:
+            self.store_in_cache(cache_key, cache_files, log_file_path)
 
     def execute_liyou(self, verilog_file_path:str, 
                 working_dir:str,
                 aiger_file_path:str,
                 top_name:str = "top"):
-        self.aiger_file_path = aiger_file_path
-        self._generate_script_content_to_aiger_liyou(
-            verilog_file_path=verilog_file_path,
-            working_dir=working_dir,
-            top_name=top_name,
-            is_ascii=False, has_symbol=False,
-            aiger_file_path=aiger_file_path
-        )
-        print(f"[INFO] generated script at {self.yosys_script_path}")
-        self._execute_compile()
-        
-        
-    
-    
\ No newline at end of file
+        recipe = self.aiger_recipe
+        self.aiger_recipe = get_aiger_recipe("liyou")
+        try:
+            self.execute(verilog_file_path, working_dir, aiger_file_path, top_name)
+        finally:
+            self.aiger_recipe = recipe
@@ -0,0 +1,214 @@
+import os
+import uuid
+import time
+import queue
+import signal
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+from tool_runner import ToolResult, with_memory_limit
+
+
+@dataclass
+class YosysJob:
+    """
+    Commands of one yosys session, with absolute file paths since a worker
+    serves jobs of every working directory.
+    """
+    command_list : List[str]
+    log_file_path : str
+
+
+@dataclass
+class YosysJobResult(ToolResult):
+    # the worker died during the job and was restarted for the next one
+    crashed : bool = False
+    error : Optional[str] = None
+
+
+class YosysWorker:
+    """
+    A long-lived yosys reading its commands from stdin. Every job starts from
+    design -reset and ends with a log marker, the output up to the marker
+    goes to the job log. A worker that dies or times out is killed and
+    started again for the next job.
+    """
+
+    def __init__(self, yosys_path:str = "yosys", timeout_s:Optional[float] = None,
+                 memory_limit_mb:Optional[int] = None):
+        if yosys_path == "":
+            raise ValueError("yosys_path cannot be empty")
+        if timeout_s is not None and timeout_s <= 0:
+            raise ValueError(f"illegal timeout {timeout_s}")
+        if memory_limit_mb is not None and memory_limit_mb <= 0:
+            raise ValueError(f"illegal memory limit {memory_limit_mb}")
+        self.yosys_path = yosys_path
+        self.timeout_s = timeout_s
+        self.memory_limit_mb = memory_limit_mb
+        self.process = None
+        self.line_queue = None
+        self.start_count = 0
+        self.job_count = 0
+
+    def _read_lines(self, process, line_queue):
+        for line in iter(process.stdout.readline, ""):
+            line_queue.put(line)
+        # None marks the end of the output, the worker exited
+        line_queue.put(None)
+
+    def start(self):
+        self.process = subprocess.Popen(
+            with_memory_limit([self.yosys_path, "-Q"], self.memory_limit_mb),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            start_new_session=True
+        )
+        self.line_queue = queue.Queue()
+        threading.Thread(target=self._read_lines, args=(self.process, self.line_queue),
+                         daemon=True).start()
+        self.start_count += 1
+
+    def stop(self):
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.process.wait()
+        self.process = None
+
+    def _is_marker_line(self, line:str, marker:str):
+        # the shell may echo the log command itself, only its output counts
+        tokens = line.split()
+        return tokens[-2:] == [marker, "done"] and "log" not in tokens
+
+    def run_job(self, job:YosysJob) -> YosysJobResult:
+        """
+        Run one job on the worker, starting the worker if it is not running.
+
+        Returns:
+            YosysJobResult: Exit information of the job, return code 0 on success
+        """
+        if self.process is None or self.process.poll() is not None:
+            self.stop()
+            self.start()
+        self.job_count += 1
+        marker = f"job_{uuid.uuid4().hex}"
+        result = YosysJobResult(command=list(job.command_list), cwd=os.getcwd(),
+                                log_file_path=job.log_file_path)
+        start_time = time.perf_counter()
+        with open(job.log_file_path, "w") as log_file:
+            try:
+                self.process.stdin.write("\n".join(["design -reset"] + job.command_list +
+                                                   [f"log {marker} done"]) + "\n")
+                self.process.stdin.flush()
+            except BrokenPipeError:
+                pass
+            while True:
+                remaining_s = None if self.timeout_s is None else \
+                    self.timeout_s - (time.perf_counter() - start_time)
+                try:
+                    line = self.line_queue.get(timeout=remaining_s) if remaining_s is None or remaining_s > 0 \
+                        else self.line_queue.get_nowait()
+                except queue.Empty:
+                    result.timed_out = True
+                    result.error = f"timed out after {self.timeout_s}s"
+                    print(f"[WARNING] yosys worker timed out after {self.timeout_s}s, restarting it")
+                    self.stop()
+                    break
+                if line is None:
+                    result.crashed = True
+                    result.error = f"yosys worker exited with code {self.process.wait()}"
+                    print(f"[WARNING] {result.error} during a job, restarting it")
+                    self.stop()
+                    break
+                if self._is_marker_line(line, marker):
+                    break
+                log_file.write(line)
+                if line.startswith("ERROR:") and result.error is None:
+                    result.error = line.strip()
+        result.elapsed_s = round(time.perf_counter() - start_time, 3)
+        result.return_code = 0 if result.error is None else 1
+        return result
+
+
+class YosysWorkerPool:
+    """
+    A fixed number of YosysWorker processes serving a queue of jobs, so that
+    a corpus pays the yosys startup once per worker instead of once per
+    session.
+    """
+
+    def __init__(self, worker_count:int = 1, yosys_path:Optional[str] = None,
+                 timeout_s:Optional[float] = None, memory_limit_mb:Optional[int] = None):
+        if worker_count < 1:
+            raise ValueError(f"illegal worker count {worker_count}")
+        if yosys_path is None:
+            yosys_path = os.environ.get("YOSYS", "yosys")
+        self.worker_list = [YosysWorker(yosys_path=yosys_path, timeout_s=timeout_s,
+                                        memory_limit_mb=memory_limit_mb)
+                            for _ in range(worker_count)]
+        self.idle_workers = queue.Queue()
+        for worker in self.worker_list:
+            self.idle_workers.put(worker)
+        self.executor = ThreadPoolExecutor(max_workers=worker_count)
+        self.job_timings = []
+        self.timing_lock = threading.Lock()
+
+    def _run_on_idle_worker(self, job:YosysJob):
+        worker = self.idle_workers.get()
+        try:
+            result = worker.run_job(job)
+        finally:
+            self.idle_workers.put(worker)
+        with self.timing_lock:
+            self.job_timings.append((job.log_file_path, result.elapsed_s, result.success))
+        return result
+
+    def submit(self, job:YosysJob) -> Future:
+        return self.executor.submit(self._run_on_idle_worker, job)
+
+    def run_jobs(self, job_list:List[YosysJob]) -> List[YosysJobResult]:
+        """
+        Run the jobs on the workers, the results are in job order.
+        """
+        return [future.result() for future in [self.submit(job) for job in job_list]]
+
+    def get_stats(self, since:Optional[dict] = None):
+        """
+        Get the job counts and timings of the pool, the pool lives for the
+        whole process. With since, an earlier get_stats() snapshot, only
+        what happened after it is counted.
+        """
+        with self.timing_lock:
+            elapsed_list = [elapsed_s for _, elapsed_s, _ in self.job_timings]
+            failed = sum(1 for _, _, success in self.job_timings if not success)
+        stats = {
+            "workers": len(self.worker_list),
+            "worker_starts": sum(worker.start_count for worker in self.worker_list),
+            "jobs": len(elapsed_list),
+            "failed_jobs": failed,
+            "job_elapsed_s": round(sum(elapsed_list), 3),
+        }
+        if since is not None:
+            for name in ["worker_starts", "jobs", "failed_jobs", "job_elapsed_s"]:
+                stats[name] = round(stats[name] - since[name], 3)
+        return stats
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        for worker in self.worker_list:
+            if worker.process is not None:
+                try:
+                    worker.process.stdin.close()
+                except BrokenPipeError:
+                    pass
+            worker.stop()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Synthesis-profile benchmark.
+Generates a few designs and synthesizes each of them with every Vitis HLS
+synthesis profile, then compares the vitis_hls wall time per design.
+Needs vitis_hls on the PATH.
+
+Usage:
+    python test/bench_hls_profiles.py [--designs N] [--seed S] [--profiles default,fast] [--keep]
+"""
+
+import sys
+import os
+import shutil
+import argparse
+import statistics
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from random_graph_manager import RandomGraphManager
+from vitis_hls_compiler import VitisHLSCompiler, SYNTHESIS_PROFILES
+
+
+def generate_designs(output_dir, design_count, first_seed):
+    """
+    Dump one C++ design per seed into output_dir.
+
+    Returns:
+        list: paths of the generated C++ files
+    """
+    cpp_file_list = []
+    for seed in range(first_seed, first_seed + design_count):
+        graph_manager = RandomGraphManager(seed=seed)
+        graph_manager.generate_random_graph()
+        cpp_file = os.path.join(output_dir, f"design_{seed}.cpp")
+        graph_manager.dump_cpp_std(cpp_file)
+        cpp_file_list.append(cpp_file)
+    return cpp_file_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vitis HLS synthesis profile benchmark')
+    parser.add_argument('--designs', type=int, default=5, help='Number of designs (default: 5)')
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the first design (default: 1)')
+    parser.add_argument('--profiles', type=str, default=",".join(SYNTHESIS_PROFILES.keys()),
+                        help='Comma separated profiles to compare (default: all)')
+    parser.add_argument('--clock-period', type=int, default=10, help='Clock period in nanoseconds (default: 10)')
+    parser.add_argument('--keep', action='store_true', help='Keep the synthesis projects')
+    args = parser.parse_args()
+
+    if shutil.which("vitis_hls") is None:
+        print("[ERROR] vitis_hls not found in PATH, cannot benchmark the synthesis profiles")
+        return 1
+    profile_list = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    for profile in profile_list:
+        if profile not in SYNTHESIS_PROFILES:
+            print(f"[ERROR] Unknown profile {profile}")
+            return 1
+
+    output_dir = tempfile.mkdtemp(prefix="bench_hls_profiles_")
+    cpp_file_list = generate_designs(output_dir, args.designs, args.seed)
+
+    wall_times = {profile: [] for profile in profile_list}
+    failures = {profile: 0 for profile in profile_list}
+    # settings of a profile the installed release rejected, the profile does not fully apply
+    skipped_settings = {profile: set() for profile in profile_list}
+    for cpp_file in cpp_file_list:
+        design_name = os.path.splitext(os.path.basename(cpp_file))[0]
+        for profile in profile_list:
+            compile_dir = os.path.join(output_dir, profile, design_name)
+            hls_compiler = VitisHLSCompiler(working_dir=compile_dir, profile=profile)
+            result = hls_compiler.compile(project_name="proj", top_name="top",
+                                          clock_period=args.clock_period, cpp_file_list=[cpp_file])
+            if result["success"]:
+                wall_times[profile].append(result["exit_info"]["elapsed_s"])
+            else:
+                failures[profile] += 1
+            skipped_settings[profile].update(d["line"].split(":", 1)[0].split(" ", 1)[1]
+                                             for d in result["diagnostics"]
+                                             if d["pattern_name"] == "profile_setting_skipped")
+
+    print()
+    print(f"{'profile':<12} {'designs':>8} {'failed':>7} {'median (s)':>11} {'mean (s)':>9} {'total (s)':>10}")
+    for profile in profile_list:
+        times = wall_times[profile]
+        if len(times) == 0:
+            print(f"{profile:<12} {0:>8} {failures[profile]:>7} {'-':>11} {'-':>9} {'-':>10}")
+            continue
+        print(f"{profile:<12} {len(times):>8} {failures[profile]:>7} {statistics.median(times):>11.1f} "
+              f"{statistics.mean(times):>9.1f} {sum(times):>10.1f}")
+
+    for profile in profile_list:
+        for setting in sorted(skipped_settings[profile]):
+            print(f"[WARNING] profile {profile}: setting '{setting}' was not applied, see the logs")
+
+    if args.keep:
+        print(f"[INFO] Projects kept in {output_dir}")
+    else:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
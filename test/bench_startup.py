@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the generator CLI.
+Measures the wall time of fresh interpreter launches for the common short
+invocations, and which modules each of them ends up importing.
+
+Usage:
+    python test/bench_startup.py [--repeat N]
+"""
+
+import sys
+import os
+import time
+import argparse
+import subprocess
+import statistics
+import tempfile
+import shutil
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+HEAVY_MODULES = ["matplotlib", "numpy", "networkx"]
+
+GENERATION_OUTPUT_DIR = tempfile.mkdtemp(prefix="bench_startup_")
+
+CASES = [
+    ("bare interpreter", ["-c", "pass"]),
+    ("import main", ["-c", "import main"]),
+    ("main.py --help", [os.path.join(SRC_DIR, "main.py"), "--help"]),
+    ("import random_graph_manager", ["-c", "import random_graph_manager"]),
+    ("main.py --skip-compilation", [os.path.join(SRC_DIR, "main.py"), "--skip-compilation",
+                                    "--output-dir", GENERATION_OUTPUT_DIR]),
+]
+
+
+def time_case(argv, repeat):
+    """
+    Launch a fresh interpreter `repeat` times and return the wall times in seconds.
+    """
+    wall_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + argv, cwd=SRC_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wall_times.append(time.perf_counter() - start)
+    return wall_times
+
+
+def loaded_heavy_modules(argv):
+    """
+    Return the heavy modules that are imported by the given invocation.
+    """
+    probe = ("import sys, runpy\n"
+             f"sys.argv = {argv!r}\n"
+             "try:\n"
+             "    runpy.run_path(sys.argv[0], run_name='__main__') if sys.argv[0].endswith('.py') "
+             "else exec(sys.argv[1])\n"
+             "except SystemExit:\n"
+             "    pass\n"
+             f"print('HEAVY:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n")
+    result = subprocess.run([sys.executable, "-c", probe], cwd=SRC_DIR, check=True,
+                            capture_output=True, text=True)
+    heavy_lines = [l for l in result.stdout.splitlines() if l.startswith("HEAVY:")]
+    return heavy_lines[-1][len("HEAVY:"):] if heavy_lines else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI startup-time benchmark')
+    parser.add_argument('--repeat', type=int, default=10, help='Launches per case (default: 10)')
+    args = parser.parse_args()
+
+    print(f"{'case':<32} {'median (ms)':>12} {'min (ms)':>10}  heavy modules loaded")
+    for name, argv in CASES:
+        wall_times = time_case(argv, args.repeat)
+        heavy = loaded_heavy_modules(argv)
+        print(f"{name:<32} {statistics.median(wall_times) * 1000:>12.1f} "
+              f"{min(wall_times) * 1000:>10.1f}  {heavy if heavy else '-'}")
+    shutil.rmtree(GENERATION_OUTPUT_DIR, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Stand-in tools and random graphs shared by the test scripts.
+"""
+
+import sys
+import os
+import stat
+import contextlib
+
+import numpy as np
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aiger import Aiger, LATCH_UNINITIALIZED
+
+# answers -V, copies the input of the last read to the output of every write
+FAKE_YOSYS = """#!/bin/sh
+if [ "$1" = "-V" ]; then echo "Yosys {version} (fake)"; exit 0; fi
+{on_start}echo "$2" | tr ';' '\\n' | awk '$1 ~ /^read/ {{input = $NF}} $1 ~ /^write/ {{system("cp " input " " $NF)}}'
+{on_end}echo "fake yosys done"
+"""
+
+# the long-lived yosys shell reading its commands from stdin:
+# read copies to the following write, crash exits, hang sleeps
+FAKE_YOSYS_WORKER = """#!{python}
+import sys, time, shutil
+with open({starts_file!r}, "a") as f:
+    f.write("start\\n")
+source = None
+for line in sys.stdin:
+    tokens = line.split()
+    if not tokens:
+        continue
+    if tokens[0] == "read":
+        source = tokens[-1]
+    elif tokens[0] == "write_verilog":
+        shutil.copyfile(source, tokens[-1])
+    elif tokens[0] == "crash":
+        sys.exit(1)
+    elif tokens[0] == "hang":
+        time.sleep(60)
+    elif tokens[0] == "bad":
+        print("ERROR: bad command")
+    elif tokens[0] == "log":
+        print(" ".join(tokens[1:]))
+    sys.stdout.flush()
+"""
+
+# synthesizes every solution of a single or a batch script, the Verilog
+# names the clock and the sources. FAKE_VITIS_HLS_COUNTER counts the
+# launches, FAKE_VITIS_HLS_FAIL lists the project/solution that fail and
+# FAKE_VITIS_HLS_REJECT the profile settings the tool does not know
+FAKE_VITIS_HLS = """#!{python}
+import os, re, sys, time, hashlib
+failing = os.environ.get("FAKE_VITIS_HLS_FAIL", "").split(",")
+rejected = os.environ.get("FAKE_VITIS_HLS_REJECT", "").split(",")
+if "FAKE_VITIS_HLS_COUNTER" in os.environ:
+    with open(os.environ["FAKE_VITIS_HLS_COUNTER"], "a") as f:
+        f.write("run\\n")
+project = solution = clock = None
+sources = hashlib.sha256()
+for line in open(sys.argv[2]):
+    tokens = line.split()
+    batch = line.startswith("if {{[catch {{csynth_design}}")
+    if line.startswith("open_project"):
+        project = tokens[-1]
+    elif line.startswith("add_files"):
+        with open(tokens[-1], "rb") as f:
+            sources.update(f.read())
+    elif line.startswith("open_solution"):
+        solution = re.search(r'"(.*)"', line).group(1)
+    elif line.startswith("create_clock"):
+        clock = tokens[2]
+    elif line.startswith("if {{[catch {{config_"):
+        setting = line.split("{{")[2].split("}}")[0]
+        if setting in rejected:
+            print(f"@@HLS_PROFILE_SKIPPED {{setting}}: unknown option")
+    elif line.startswith("puts") and "BEGIN" in line:
+        print(line.split('"')[1])
+    elif (batch or line.strip() == "csynth_design") and f"{{project}}/{{solution}}" in failing:
+        print("ERROR: [HLS 214-124] fake synthesis failure", flush=True)
+        # leave the runner time to stop the session on the error
+        time.sleep(1)
+        if not batch:
+            sys.exit(1)
+        print(f"@@HLS_BATCH_END {{project}}/{{solution}} failed: fake")
+    elif batch or line.strip() == "csynth_design":
+        syn_dir = os.path.join(project, solution, "syn")
+        os.makedirs(os.path.join(syn_dir, "verilog"), exist_ok=True)
+        os.makedirs(os.path.join(syn_dir, "report"), exist_ok=True)
+        with open(os.path.join(syn_dir, "verilog", "top.v"), "w") as f:
+            f.write(f"// clock {{clock}}\\n// sources {{sources.hexdigest()}}\\nmodule top(); endmodule\\n")
+        with open(os.path.join(syn_dir, "report", "top_csynth.rpt"), "w") as f:
+            f.write("latency 1\\n")
+        print(f"synthesizing {{project}}/{{solution}}")
+        print("fake synthesis done")
+        if batch:
+            print(f"@@HLS_BATCH_END {{project}}/{{solution}} done")
+"""
+
+
+def write_executable(file_path, content):
+    with open(file_path, "w") as f:
+        f.write(content)
+    os.chmod(file_path, os.stat(file_path).st_mode | stat.S_IEXEC)
+    return file_path
+
+
+def write_fake_yosys(file_path, version="", invocations_file=None, events_file=None, sleep_s=0):
+    """
+    Write the fake yosys of the -p scripts.
+
+    Args:
+        file_path: Path of the executable
+        version: Version answered to yosys -V
+        invocations_file: Optional file, relative to the run directory, the scripts are appended to
+        events_file: Optional file the start and the end of every launch are appended to
+        sleep_s: Seconds every launch takes
+    """
+    on_start = "" if invocations_file is None else f'echo "$2" >> {invocations_file}\n'
+    on_end = "" if sleep_s == 0 else f"sleep {sleep_s}\n"
+    if events_file is not None:
+        on_start += f'echo "start $$" >> {events_file}\n'
+        on_end += f'echo "end $$" >> {events_file}\n'
+    return write_executable(file_path, FAKE_YOSYS.format(version=version, on_start=on_start, on_end=on_end))
+
+
+def write_fake_yosys_worker(work_dir):
+    """
+    Write the fake yosys shell of the workers, its starts go to starts.txt.
+    """
+    return write_executable(os.path.join(work_dir, "fake_yosys"), FAKE_YOSYS_WORKER.format(
+        python=sys.executable, starts_file=os.path.join(work_dir, "starts.txt")))
+
+
+def write_fake_vitis_hls(file_path):
+    return write_executable(file_path, FAKE_VITIS_HLS.format(python=sys.executable))
+
+
+@contextlib.contextmanager
+def fake_vitis_hls_on_path(work_dir):
+    """
+    Put the fake vitis_hls first on the PATH, counting its launches.
+
+    Yields:
+        str: Path of the launch counter file
+    """
+    bin_dir = os.path.join(work_dir, "bin")
+    os.makedirs(bin_dir)
+    write_fake_vitis_hls(os.path.join(bin_dir, "vitis_hls"))
+    old_path = os.environ["PATH"]
+    os.environ["PATH"] = bin_dir + os.pathsep + old_path
+    os.environ["FAKE_VITIS_HLS_COUNTER"] = os.path.join(work_dir, "runs")
+    try:
+        yield os.environ["FAKE_VITIS_HLS_COUNTER"]
+    finally:
+        os.environ["PATH"] = old_path
+        os.environ.pop("FAKE_VITIS_HLS_COUNTER", None)
+        os.environ.pop("FAKE_VITIS_HLS_FAIL", None)
+        os.environ.pop("FAKE_VITIS_HLS_REJECT", None)
+
+
+def get_run_count(counter_path):
+    if not os.path.exists(counter_path):
+        return 0
+    with open(counter_path) as f:
+        return len(f.read().splitlines())
+
+
+def random_aiger(seed, input_count=6, latch_count=3, and_count=200, shuffled=True, named=False):
+    """
+    A random graph with two outputs, a bad state and a dangling last AND.
+
+    Args:
+        seed: Seed of the graph
+        input_count: Number of inputs
+        latch_count: Number of latches, at most 3
+        and_count: Number of ANDs
+        shuffled: Shuffle the variable numbering as an ascii file may
+        named: Name the inputs port_<i>[0] and the latches state_<i>[0]
+    """
+    rng = np.random.default_rng(seed)
+    max_var = input_count + latch_count + and_count + 1
+    variables = np.arange(1, max_var + 1)
+    if shuffled:
+        variables = rng.permutation(variables)
+    defined = [2 * v for v in variables[:input_count + latch_count]]
+    ands = []
+    for v in variables[input_count + latch_count:]:
+        rhs0, rhs1 = rng.choice(defined, 2) ^ rng.integers(0, 2, 2)
+        ands.append((2 * v, int(rhs0), int(rhs1)))
+        defined.append(2 * v)
+    latches = np.array([[2 * v, rng.choice(defined[-20:]) ^ 1] for v in variables[input_count:input_count + latch_count]])
+    symbols = {}
+    if named:
+        symbols = {("i", i): f"port_{i}[0]" for i in range(input_count)}
+        symbols.update({("l", i): f"state_{i}[0]" for i in range(latch_count)})
+    return Aiger(max_var=max_var,
+                 inputs=2 * variables[:input_count].astype(np.int64),
+                 latches=latches.astype(np.int64),
+                 latch_init=np.array([0, 1, LATCH_UNINITIALIZED][:latch_count], dtype=np.int64),
+                 outputs=np.array(defined[-3:-1], dtype=np.int64),
+                 ands=np.array(ands, dtype=np.int64),
+                 bad=np.array([defined[-2] ^ 1], dtype=np.int64),
+                 symbols=symbols)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the structural hash of an AIG, the yosys map file naming
+its inputs and the dedupe index of the corpus.
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aiger import Aiger, LATCH_UNINITIALIZED, read_aiger, read_aiger_map
+from aig_dedupe import AigDedupeIndex
+from yosys_compiler import YosysCompiler
+from helpers import random_aiger
+
+# named inputs and latches in topological numbering
+NAMED_GRAPH = dict(input_count=5, latch_count=2, and_count=60, shuffled=False, named=True)
+
+
+def relabel(aig, seed):
+    # the same graph with shuffled variables, input, latch and AND order and fanin order
+    rng = np.random.default_rng(seed)
+    var_map = np.concatenate([[0], 1 + rng.permutation(aig.max_var)])
+    remap = lambda literals: 2 * var_map[literals >> 1] + (literals & 1)
+    input_order = rng.permutation(len(aig.inputs))
+    latch_order = rng.permutation(len(aig.latches))
+    ands = remap(aig.ands)[rng.permutation(len(aig.ands))]
+    ands[:, 1:] = np.where(rng.integers(0, 2, (len(ands), 1)) == 1, ands[:, 1:], ands[:, :0:-1])
+    symbols = {("i", new): aig.symbols[("i", int(old))] for new, old in enumerate(input_order)}
+    symbols.update({("l", new): aig.symbols[("l", int(old))] for new, old in enumerate(latch_order)})
+    symbols.update({key: name for key, name in aig.symbols.items() if key[0] not in "il"})
+    return Aiger(max_var=aig.max_var, inputs=remap(aig.inputs)[input_order], latches=remap(aig.latches)[latch_order],
+                 latch_init=aig.latch_init[latch_order], outputs=remap(aig.outputs), ands=ands, bad=remap(aig.bad),
+                 symbols=symbols)
+
+
+def test_structural_hash():
+    aig = random_aiger(1, **NAMED_GRAPH)
+    structural_hash = aig.structural_hash()
+    for seed in range(5):
+        assert relabel(aig, seed).structural_hash() == structural_hash
+
+    # one complemented fanin of the output, or a swap of two input names, is another graph
+    changed = random_aiger(1, **NAMED_GRAPH)
+    changed.ands[-2, 1] ^= 1
+    assert changed.structural_hash() != structural_hash
+    swapped = random_aiger(1, **NAMED_GRAPH)
+    swapped.symbols[("i", 0)], swapped.symbols[("i", 1)] = swapped.symbols[("i", 1)], swapped.symbols[("i", 0)]
+    assert swapped.structural_hash() != structural_hash
+    # a dangling AND and an unused input are not part of the structure
+    padded = random_aiger(1, **NAMED_GRAPH)
+    padded.max_var += 2
+    padded.inputs = np.append(padded.inputs, 2 * padded.max_var - 2)
+    padded.symbols[("i", len(padded.inputs) - 1)] = "unused[0]"
+    padded.ands = np.vstack([padded.ands, [[2 * padded.max_var, 2 * padded.max_var - 2, 2]]])
+    assert padded.structural_hash() == structural_hash
+    print("✓ structural hash: PASSED")
+    return True
+
+
+def test_aiger_map():
+    with tempfile.TemporaryDirectory() as work_dir:
+        aiger_path = os.path.join(work_dir, "and.aag")
+        with open(aiger_path, "w") as f:
+            f.write("aag 3 2 0 1 1\n2\n4\n6\n6 2 4\n")
+        map_path = os.path.join(work_dir, "and.aag.map")
+        with open(map_path, "w") as f:
+            f.write("input 0 0 a\ninput 1 3 data_in\noutput 0 0 unsafe_signal\ninit 2 0 r\n")
+        assert read_aiger_map(map_path) == {("i", 0): "a[0]", ("i", 1): "data_in[3]", ("o", 0): "unsafe_signal[0]",
+                                            ("i", 2): "init:r[0]"}
+
+        # the inputs are matched by name, not by position
+        aig = read_aiger(aiger_path)
+        aig.symbols.update(read_aiger_map(map_path))
+        swapped = read_aiger(aiger_path)
+        swapped.inputs = swapped.inputs[::-1].copy()
+        swapped.symbols.update({("i", 0): "data_in[3]", ("i", 1): "a[0]"})
+        assert aig.structural_hash() == swapped.structural_hash()
+
+    yosys_compiler = YosysCompiler(yosys_path="yosys")
+    assert yosys_compiler._aiger_commands("in.v", "out/miter.aig", "top", has_map=True)[-1] == \
+        "write_aiger -zinit -map out/miter.aig.map out/miter.aig"
+    print("✓ AIGER map file: PASSED")
+    return True
+
+
+def test_init_inputs_by_latch_name():
+    """
+    The -zinit init inputs are named after their latch, reordered latches
+    and inputs give the same hash, latches without a reset value included.
+    """
+    aig = random_aiger(2, input_count=5, latch_count=3, and_count=60, shuffled=False)
+    assert aig.latch_init.tolist()[-1] == LATCH_UNINITIALIZED
+    map_lines = [f"input {i} 0 port_{i}\n" for i in range(3)] + \
+        [f"init {i} 0 state_{i - 2}\n" for i in (3, 4)] + [f"latch {j} 0 state_{j}\n" for j in range(3)]
+    with tempfile.TemporaryDirectory() as work_dir:
+        map_path = os.path.join(work_dir, "miter.aig.map")
+        with open(map_path, "w") as f:
+            f.writelines(map_lines)
+        aig.symbols = read_aiger_map(map_path)
+    assert aig.symbols[("i", 4)] == "init:state_2[0]"
+    structural_hash = aig.structural_hash()
+    for seed in range(5):
+        assert relabel(aig, seed).structural_hash() == structural_hash
+    print("✓ init inputs by latch name: PASSED")
+    return True
+
+
+def test_dedupe_index():
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = os.path.join(work_dir, "dedupe.db")
+        dedupe_index = AigDedupeIndex(db_path)
+        stats = {"inputs": 5, "latches": 2, "ands": 60}
+        assert dedupe_index.register("h1", "seed_1", "miter_1_2", stats=stats) is None
+        assert dedupe_index.register("h2", "seed_1", "miter_1_3") is None
+        representative = dedupe_index.register("h1", "seed_2", "miter_1_2", drop_duplicate=True)
+        assert (representative["benchmark"], representative["miter"]) == ("seed_1", "miter_1_2")
+        dedupe_index.close()
+
+        # a re-run keeps its place, another process sees the same index
+        dedupe_index = AigDedupeIndex(db_path)
+        assert dedupe_index.register("h1", "seed_1", "miter_1_2", stats=stats) is None
+        assert dedupe_index.register("h1", "seed_3", "miter_1_2") is not None
+        clusters = dedupe_index.get_clusters()
+        assert len(clusters) == 1 and clusters[0]["count"] == 3
+        assert [(m["benchmark"], m["duplicate_of"], m["dropped"]) for m in clusters[0]["members"]] == \
+            [("seed_1", None, 0), ("seed_2", "seed_1/miter_1_2", 1), ("seed_3", "seed_1/miter_1_2", 0)]
+        report = dedupe_index.get_report()
+        assert (report["miters"], report["unique"], report["duplicates"], report["dropped"]) == (4, 2, 2, 1)
+        dedupe_index.close()
+    print("✓ dedupe index: PASSED")
+    return True
+
+
+def main():
+    test_structural_hash()
+    test_aiger_map()
+    test_init_inputs_by_latch_name()
+    test_dedupe_index()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
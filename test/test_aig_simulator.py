@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the bit-parallel AIG simulator on hand-built AIGs, and for
+the screen miter exposing the valid of both sides.
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aiger import Aiger, read_aiger
+from aig_simulator import AigSimulator, find_output_literal
+from random_graph_manager import RandomGraphManager
+from reference_rtl import ReferenceRTLGenerator
+from verilog_processing import VerilogFile, kairos_transform, kairos_construct, BOTH_VALID_SIGNAL_NAME
+
+
+def counter_aiger(bit_count):
+    # a free-running counter of latches 1..n with an input x, outputs
+    # unsafe = all ones & x and valid = all ones
+    latch_vars = list(range(2, bit_count + 2))
+    next_var = bit_count + 2
+    ands, next_literals = [], []
+    carry = 1
+    for var in latch_vars:
+        # next = var xor carry = !(var & carry) & !(!var & !carry)
+        a, b, c = next_var, next_var + 1, next_var + 2
+        ands += [(2 * a, 2 * var, carry), (2 * b, 2 * var + 1, carry ^ 1), (2 * c, 2 * a + 1, 2 * b + 1)]
+        next_literals.append(2 * c)
+        carry = 2 * a
+        next_var += 3
+    all_ones = 2 * latch_vars[0]
+    for var in latch_vars[1:]:
+        ands.append((2 * next_var, 2 * var, all_ones))
+        all_ones = 2 * next_var
+        next_var += 1
+    ands.append((2 * next_var, all_ones, 2))
+    return Aiger(max_var=next_var,
+                 inputs=np.array([2], dtype=np.int64),
+                 latches=np.array([[2 * v, n] for v, n in zip(latch_vars, next_literals)], dtype=np.int64),
+                 latch_init=np.zeros(bit_count, dtype=np.int64),
+                 outputs=np.array([2 * next_var, all_ones], dtype=np.int64),
+                 ands=np.array(ands, dtype=np.int64))
+
+
+def test_counter():
+    aig = counter_aiger(3)
+    unsafe_literal, valid_literal = aig.outputs.tolist()
+    simulator = AigSimulator(aig, word_count=2, seed=1)
+    assert len(simulator.level_list) == aig.get_depth()
+
+    # the counter reaches 7 at cycle 7 in every stream, x fires the unsafe output then
+    report = simulator.run(20, unsafe_literal, valid_literal)
+    assert report.first_failing_cycle == 7 and report.cycles == 8
+    assert report.first_valid_cycle == 7 and report.valid_reached_fraction == 1.0
+    assert 0 < report.failing_streams < report.streams == 128
+
+    # the complemented valid literal is 1 from the start, the counter never fires before 7
+    report = simulator.run(7, unsafe_literal, valid_literal ^ 1)
+    assert not report.failed and report.first_valid_cycle == 0 and report.cycles == 7
+
+    # a stream count and seed give the same report
+    assert AigSimulator(aig, seed=5).run(20, unsafe_literal, stop_on_failure=False).to_dict() == \
+        AigSimulator(aig, seed=5).run(20, unsafe_literal, stop_on_failure=False).to_dict()
+    print("✓ counter simulation: PASSED")
+    return True
+
+
+def test_find_output_literal():
+    with tempfile.TemporaryDirectory() as work_dir:
+        file_path = os.path.join(work_dir, "and.aag")
+        with open(file_path, "w") as f:
+            f.write("aag 3 2 0 2 1\n2\n4\n6\n7\n6 2 4\no0 unsafe_signal\no1 both_valid\n")
+        aig = read_aiger(file_path)
+        assert find_output_literal(aig, "both_valid") == 7
+        try:
+            find_output_literal(aig, "missing")
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+    print("✓ output symbols: PASSED")
+    return True
+
+
+def test_screen_miter_exposes_valid():
+    graph_manager = RandomGraphManager(seed=3)
+    graph_manager.generate_random_graph()
+    verilog = ReferenceRTLGenerator(graph_manager).generate_verilog()
+    with tempfile.TemporaryDirectory() as work_dir:
+        source_path = os.path.join(work_dir, "top.v")
+        with open(source_path, "w") as f:
+            f.write(verilog)
+        middle = kairos_transform(source_path)
+        miter_path = os.path.join(work_dir, "miter.v")
+        screen_path = os.path.join(work_dir, "miter_screen.v")
+        top = kairos_construct(middle, middle, miter_path, fast_slow_mode=True)
+        assert kairos_construct(middle, middle, screen_path, fast_slow_mode=True, expose_valid=True) == top
+        miter, screen = VerilogFile(), VerilogFile()
+        miter.read_from_file(miter_path)
+        screen.read_from_file(screen_path)
+        assert f"output {BOTH_VALID_SIGNAL_NAME};" in screen.raw_lines
+        assert not any(BOTH_VALID_SIGNAL_NAME in line for line in miter.raw_lines)
+        # only the port list and the new output differ
+        assert len(screen.raw_lines) == len(miter.raw_lines) + 2
+    print("✓ screen miter: PASSED")
+    return True
+
+
+def main():
+    test_counter()
+    test_find_output_literal()
+    test_screen_miter_exposes_valid()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test script for the AIGER reader and writer, on the examples of the AIGER
+format description and on a random graph round trip.
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aiger import Aiger, LATCH_UNINITIALIZED, read_aiger, write_aiger, _decode_varints, _encode_varints
+from helpers import random_aiger
+
+
+def write_bytes(file_path, content):
+    with open(file_path, "wb") as f:
+        f.write(content)
+    return file_path
+
+
+def test_format_examples():
+    with tempfile.TemporaryDirectory() as work_dir:
+        # an AND gate, binary and ascii
+        binary = read_aiger(write_bytes(os.path.join(work_dir, "and.aig"),
+                                        b"aig 3 2 0 1 1\n6\n\x02\x02i0 x\ni1 y\no0 o\nc\nand gate\n"))
+        ascii = read_aiger(write_bytes(os.path.join(work_dir, "and.aag"), b"aag 3 2 0 1 1\n2\n4\n6\n6 2 4\n"))
+        assert binary.ands.tolist() == [[6, 4, 2]] and ascii.ands.tolist() == [[6, 2, 4]]
+        assert binary.inputs.tolist() == ascii.inputs.tolist() == [2, 4]
+        assert binary.symbols == {("i", 0): "x", ("i", 1): "y", ("o", 0): "o"}
+        assert binary.comments == ["and gate"]
+        assert binary.get_stats()["depth"] == 1
+
+        # a toggle flip-flop with an uninitialized second latch and a bad state
+        toggle = read_aiger(write_bytes(os.path.join(work_dir, "toggle.aag"),
+                                        b"aag 2 0 2 0 0 1\n2 3\n4 5 4\n2\n"))
+        stats = toggle.get_stats()
+        assert stats["latches"] == 2 and stats["bad"] == 1 and stats["ands"] == 0
+        assert stats["latch_init"] == {"zero": 1, "one": 0, "uninitialized": 1}
+        assert toggle.latch_init.tolist() == [0, LATCH_UNINITIALIZED]
+        write_aiger(toggle, os.path.join(work_dir, "toggle.aig"))
+        with open(os.path.join(work_dir, "toggle.aig"), "rb") as f:
+            assert f.read() == b"aig 2 0 2 0 0 1\n3\n5 4\n2\n"
+    print("✓ AIGER format examples: PASSED")
+    return True
+
+
+def test_varints():
+    values = np.array([0, 1, 127, 128, 16383, 16384, 2 ** 35 + 5], dtype=np.int64)
+    encoded = _encode_varints(values)
+    assert encoded[:4] == bytes([0x00, 0x01, 0x7f, 0x80]) and encoded[4] == 0x01
+    decoded, used = _decode_varints(np.frombuffer(encoded + b"i0 a\n", dtype=np.uint8), len(values))
+    assert decoded.tolist() == values.tolist() and used == len(encoded)
+    print("✓ varints: PASSED")
+    return True
+
+
+def test_canonical_round_trip():
+    with tempfile.TemporaryDirectory() as work_dir:
+        aig = random_aiger(7)
+        assert not aig.is_binary_ordered()
+        try:
+            write_aiger(aig, os.path.join(work_dir, "unordered.aig"))
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        ascii_path = write_aiger(aig, os.path.join(work_dir, "random.aag"))
+        reread = read_aiger(ascii_path)
+        assert np.array_equal(reread.ands, aig.ands) and np.array_equal(reread.latch_init, aig.latch_init)
+
+        canonical = aig.canonical()
+        assert canonical.is_binary_ordered()
+        # the last AND is only read by nothing and is dropped
+        assert len(canonical.ands) < len(aig.ands)
+        assert canonical.get_stats()["depth"] == aig.get_stats()["depth"]
+        binary_path = write_aiger(canonical, os.path.join(work_dir, "random.aig"))
+        binary = read_aiger(binary_path)
+        for name in ["inputs", "latches", "latch_init", "outputs", "ands", "bad"]:
+            assert np.array_equal(getattr(binary, name), getattr(canonical, name)), name
+
+        # the encoding of an already canonical graph does not change
+        write_aiger(binary.canonical(), os.path.join(work_dir, "again.aig"))
+        with open(binary_path, "rb") as f, open(os.path.join(work_dir, "again.aig"), "rb") as g:
+            assert f.read() == g.read()
+    print("✓ canonical round trip: PASSED")
+    return True
+
+
+def simulate_outputs(aig, input_trace):
+    # output and bad values of every cycle, uninitialized latches start at 0
+    values = {0: 0}
+    for var, init in zip((aig.latches[:, 0] >> 1).tolist(), aig.latch_init.tolist()):
+        values[var] = max(init, 0)
+    value = lambda literal: values[literal >> 1] ^ (literal & 1)
+    trace = []
+    for input_values in input_trace:
+        values.update(zip((aig.inputs >> 1).tolist(), input_values))
+        for i in aig._topological_and_order().tolist():
+            lhs, rhs0, rhs1 = aig.ands[i].tolist()
+            values[lhs >> 1] = value(rhs0) & value(rhs1)
+        trace.append([value(literal) for literal in aig.outputs.tolist() + aig.bad.tolist()])
+        next_values = [value(literal) for literal in aig.latches[:, 1].tolist()]
+        values.update(zip((aig.latches[:, 0] >> 1).tolist(), next_values))
+    return trace
+
+
+def test_reduce():
+    # x y z inputs, l1 stuck at 0, l2 = x & l1 stuck at 0, l3 feeds nothing,
+    # l4 a toggle flip-flop, g = x & y twice, out = l4 & g, bad = g & l2
+    # and a dangling constant x & !x
+    with tempfile.TemporaryDirectory() as work_dir:
+        aig = read_aiger(write_bytes(os.path.join(work_dir, "reduce.aag"), b"""aag 15 3 4 1 8 1
+2
+4
+6
+8 8
+10 24
+12 4
+14 15
+28
+26
+16 2 4
+18 4 2
+20 2 3
+22 16 18
+24 2 8
+26 22 10
+28 14 22
+30 28 20
+i0 x
+i2 z
+l3 toggle
+o0 out
+"""))
+        reduced, report = aig.reduce()
+        assert report["before"] == {"inputs": 3, "latches": 4, "ands": 8, "outputs": 1, "bad": 1}
+        assert report["after"] == {"inputs": 2, "latches": 1, "ands": 2, "outputs": 1, "bad": 1}
+        assert report["constant_latches"] == 2
+        assert reduced.bad.tolist() == [0] and reduced.is_binary_ordered()
+        assert reduced.symbols == {("i", 0): "x", ("l", 0): "toggle", ("o", 0): "out"}
+
+        kept, _ = aig.reduce(keep_inputs=True)
+        assert len(kept.inputs) == 3
+        random_trace = np.random.default_rng(3).integers(0, 2, (20, 3)).tolist()
+        assert simulate_outputs(kept, random_trace) == simulate_outputs(aig, random_trace)
+
+        aig = random_aiger(11)
+        reduced, report = aig.reduce(keep_inputs=True)
+        assert report["after"]["ands"] <= len(aig.canonical().ands)
+        random_trace = np.random.default_rng(5).integers(0, 2, (30, 6)).tolist()
+        assert simulate_outputs(reduced, random_trace) == simulate_outputs(aig, random_trace)
+    print("✓ AIG reduction: PASSED")
+    return True
+
+
+def test_illegal_files():
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name, content in [("truncated.aig", b"aig 3 2 0 1 1\n6\n\x82"),
+                              ("range.aag", b"aag 1 1 0 1 0\n2\n9\n"),
+                              ("empty.aig", b"")]:
+            try:
+                read_aiger(write_bytes(os.path.join(work_dir, name), content))
+                assert False, f"expected ValueError for {name}"
+            except ValueError:
+                pass
+    print("✓ illegal AIGER files: PASSED")
+    return True
+
+
+def main():
+    test_format_examples()
+    test_varints()
+    test_canonical_round_trip()
+    test_reduce()
+    test_illegal_files()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
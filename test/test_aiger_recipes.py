@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test script for the AIGER recipes and word-level output formats of
+YosysCompiler and the AIGER header reading used to report the size of a
+miter.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from yosys_compiler import YosysCompiler, AigerRecipe, AIGER_RECIPES, get_aiger_recipe, get_output_formats
+from artifact_cache import ArtifactCache
+
+from aiger import read_aiger_header
+from helpers import write_fake_yosys
+
+
+def test_fast_recipe_is_the_former_script():
+    yosys_compiler = YosysCompiler(yosys_path="yosys")
+    assert yosys_compiler._aiger_commands("in.v", "out.aig", "miter") == [
+        "read -sv in.v",
+        "prep -top miter",
+        "flatten",
+        "memory -nordff",
+        "setundef -undriven -init -expose",
+        "techmap",
+        "abc -fast -g AND",
+        "write_aiger -zinit out.aig",
+    ]
+    liyou_commands = yosys_compiler._aiger_commands("in.v", "out.aig", "miter", recipe="liyou")
+    assert liyou_commands[:2] == ["read_verilog in.v", "synth -top miter"]
+    print("✓ fast and liyou recipes: PASSED")
+    return True
+
+
+def test_recipes_change_the_script_and_cache_key():
+    with tempfile.TemporaryDirectory() as work_dir:
+        verilog_file = os.path.join(work_dir, "miter.v")
+        with open(verilog_file, "w") as f:
+            f.write("module top(input a, output b); assign b = a; endmodule\n")
+        cache_keys = set()
+        for name in AIGER_RECIPES:
+            yosys_compiler = YosysCompiler(yosys_path="yosys", aiger_recipe=name)
+            script = yosys_compiler._aiger_commands("in.v", "out.aig", "top")
+            assert script[-1] == "write_aiger -zinit out.aig"
+            # an ABC script must stay one yosys command
+            assert all(" " not in command.split("-script ")[-1] for command in script if "-script" in command)
+            cache_keys.add(yosys_compiler.get_cache_key("aiger", verilog_file, "top"))
+        assert len(cache_keys) == len(AIGER_RECIPES)
+
+    custom = AigerRecipe(name="custom", optimize_commands=["abc -g AND"])
+    assert get_aiger_recipe(custom) is custom
+    for bad_recipe, error_type in [("slowest", ValueError), (3, TypeError)]:
+        try:
+            YosysCompiler(yosys_path="yosys", aiger_recipe=bad_recipe)
+            assert False, f"expected {error_type.__name__}"
+        except error_type:
+            pass
+    print("✓ recipe scripts and cache keys: PASSED")
+    return True
+
+
+def test_word_level_formats():
+    yosys_compiler = YosysCompiler(yosys_path="yosys", output_formats="smt2,aiger,btor")
+    assert yosys_compiler.output_formats == ["aiger", "btor", "smt2"]
+    script = yosys_compiler._aiger_commands("in.v", "out/miter.aig", "miter")
+    # one elaboration, the word-level files are written before the bit-blasting
+    assert script.count("read -sv in.v") == 1 and script.count("prep -top miter") == 1
+    save = script.index("design -save aiger_front")
+    assert script[save:save + 6] == ["design -save aiger_front", "async2sync", "dffunmap",
+                                     "write_btor out/miter.btor", "write_smt2 out/miter.smt2",
+                                     "design -load aiger_front"]
+    assert script.index("techmap") > save and script[-1] == "write_aiger -zinit out/miter.aig"
+
+    btor_only = YosysCompiler(yosys_path="yosys", output_formats=["btor"])._aiger_commands("in.v", "miter.aig", "top")
+    assert btor_only[-1] == "write_btor miter.btor"
+    assert not any(command.startswith(("design", "techmap", "abc")) for command in btor_only)
+    for bad_formats in ["", "aiger,vcd"]:
+        try:
+            get_output_formats(bad_formats)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        yosys_path = write_fake_yosys(os.path.join(work_dir, "fake_yosys"), invocations_file="invocations.txt")
+        verilog_file = os.path.join(work_dir, "miter.v")
+        with open(verilog_file, "w") as f:
+            f.write("module top(input a, output b); assign b = a; endmodule\n")
+        cache = ArtifactCache(os.path.join(work_dir, "cache"))
+        for run_dir in ["run_1", "run_2"]:
+            os.makedirs(os.path.join(work_dir, run_dir))
+            yosys_compiler = YosysCompiler(yosys_path=yosys_path, cache=cache, output_formats="aiger,btor")
+            yosys_compiler.execute(verilog_file, os.path.join(work_dir, run_dir),
+                                   os.path.join(work_dir, run_dir, "miter.aig"))
+            for extension in ["aig", "btor"]:
+                assert os.path.exists(os.path.join(work_dir, run_dir, f"miter.{extension}"))
+        # the second run is restored from the cache, btor included
+        assert yosys_compiler.last_cache_hit
+        with open(os.path.join(work_dir, "run_1", "invocations.txt")) as f:
+            assert len(f.read().splitlines()) == 1
+        assert not os.path.exists(os.path.join(work_dir, "run_2", "invocations.txt"))
+        assert YosysCompiler(yosys_path=yosys_path).get_cache_key("aiger", verilog_file, "top") != \
+            yosys_compiler.get_cache_key("aiger", verilog_file, "top")
+    print("✓ word-level output formats: PASSED")
+    return True
+
+
+def test_word_level_property():
+    with tempfile.TemporaryDirectory() as work_dir:
+        miter_file = os.path.join(work_dir, "miter.v")
+        with open(miter_file, "w") as f:
+            f.write("module top(a, unsafe_signal);\ninput a;\noutput unsafe_signal;\n"
+                    "assign unsafe_signal = a;\nendmodule\n")
+        yosys_compiler = YosysCompiler(yosys_path="yosys", output_formats="aiger,btor,smt2")
+        yosys_compiler.begin_session(work_dir)
+        yosys_compiler.add_to_aiger(miter_file, os.path.join(work_dir, "miter.aig"), top_name="top")
+        script = yosys_compiler.session_commands
+        # the word-level writers see the assertion, the AIGER export does not
+        assert script[0] == "read -sv miter_property.v"
+        assert script.index("write_btor miter.btor") < script.index("chformal -assert -remove") < \
+            script.index("write_aiger -zinit miter.aig")
+        with open(os.path.join(work_dir, "miter_property.v")) as f:
+            lines = f.read().splitlines()
+        assert lines[-2:] == ["assert property ( !unsafe_signal );", "endmodule"]
+
+        # no word-level format, or no miter output, reads the source as it is
+        for output_formats, source in [("aiger", miter_file), ("btor", os.path.join(work_dir, "plain.v"))]:
+            with open(os.path.join(work_dir, "plain.v"), "w") as f:
+                f.write("module top(a, b);\ninput a;\noutput b;\nassign b = a;\nendmodule\n")
+            yosys_compiler = YosysCompiler(yosys_path="yosys", output_formats=output_formats)
+            yosys_compiler.begin_session(work_dir)
+            yosys_compiler.add_to_aiger(source, os.path.join(work_dir, "out.aig"), top_name="top")
+            assert yosys_compiler.session_commands[0] == f"read -sv {os.path.basename(source)}"
+            assert "chformal -assert -remove" not in yosys_compiler.session_commands
+
+        # liyou reads with plain read_verilog, the property file still needs -sv
+        yosys_path = write_fake_yosys(os.path.join(work_dir, "fake_yosys"), invocations_file="invocations.txt")
+        liyou_dir = os.path.join(work_dir, "liyou")
+        os.makedirs(liyou_dir)
+        yosys_compiler = YosysCompiler(yosys_path=yosys_path, output_formats="btor,smt2")
+        yosys_compiler.execute_liyou(miter_file, liyou_dir, os.path.join(liyou_dir, "miter.aig"))
+        with open(os.path.join(liyou_dir, "invocations.txt")) as f:
+            script = [command.strip() for command in f.read().split(";")]
+        assert script[0] == "read -sv miter_property.v"
+        assert "synth -top top" in script
+        for extension in ["btor", "smt2"]:
+            assert os.path.exists(os.path.join(liyou_dir, f"miter.{extension}"))
+    print("✓ word-level property: PASSED")
+    return True
+
+
+def test_read_aiger_header():
+    with tempfile.TemporaryDirectory() as work_dir:
+        ascii_path = os.path.join(work_dir, "and.aag")
+        with open(ascii_path, "w") as f:
+            f.write("aag 3 2 0 1 1\n2\n4\n6\n6 2 4\n")
+        header = read_aiger_header(ascii_path)
+        assert header.is_ascii
+        assert (header.max_var, header.inputs, header.latches, header.outputs, header.ands) == (3, 2, 0, 1, 1)
+        assert header.bad == 0
+
+        binary_path = os.path.join(work_dir, "miter.aig")
+        with open(binary_path, "wb") as f:
+            f.write(b"aig 5 1 2 0 2 1\n4\n6 1\n")
+            f.write(bytes([0x02, 0x04, 0x81, 0x02]))
+        header = read_aiger_header(binary_path)
+        assert not header.is_ascii
+        assert header.to_dict()["latches"] == 2 and header.bad == 1 and header.ands == 2
+
+        bad_path = os.path.join(work_dir, "bad.aig")
+        with open(bad_path, "w") as f:
+            f.write("module top; endmodule\n")
+        try:
+            read_aiger_header(bad_path)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+    print("✓ AIGER header: PASSED")
+    return True
+
+
+def main():
+    test_fast_recipe_is_the_former_script()
+    test_recipes_change_the_script_and_cache_key()
+    test_word_level_formats()
+    test_word_level_property()
+    test_read_aiger_header()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the content-addressed artifact cache and the HLS results cache.
+A stand-in vitis_hls on the PATH records how often synthesis really ran.
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from artifact_cache import ArtifactCache, make_cache_key
+from random_graph_manager import RandomGraphManager
+from vitis_hls_compiler import VitisHLSCompiler
+from helpers import fake_vitis_hls_on_path, get_run_count
+
+
+def write_file(file_path, content):
+    with open(file_path, "w") as f:
+        f.write(content)
+    return file_path
+
+
+def test_store_restore_and_lru():
+    with tempfile.TemporaryDirectory() as work_dir:
+        cache = ArtifactCache(os.path.join(work_dir, "cache"), max_bytes=2500)
+        key_1 = make_cache_key({"design": 1})
+        assert cache.lookup(key_1) is None
+        cache.store(key_1, {"a/out.v": write_file(os.path.join(work_dir, "out.v"), "x" * 1000)})
+        entry = cache.lookup(key_1)
+        assert entry is not None
+        restored = cache.restore(entry, os.path.join(work_dir, "restored"))
+        assert restored == [os.path.join(work_dir, "restored", "a", "out.v")]
+
+        key_2 = make_cache_key({"design": 2})
+        key_3 = make_cache_key({"design": 3})
+        cache.store(key_2, {"out.v": os.path.join(work_dir, "out.v")})
+        time.sleep(0.01)
+        cache.lookup(key_1)  # key_1 is now more recently used than key_2
+        time.sleep(0.01)
+        cache.store(key_3, {"out.v": os.path.join(work_dir, "out.v")})
+        assert cache.lookup(key_2) is None
+        assert cache.lookup(key_1) is not None and cache.lookup(key_3) is not None
+        assert cache.stats["evictions"] == 1
+        assert cache.stats["stores"] == 3
+        # the running total matches the entries left
+        assert cache.total_bytes == sum(cache._dir_size(d) for d in cache._entry_dir_list())
+
+
+class EvictingCache(ArtifactCache):
+    # another process evicts every entry right after it was looked up
+    def lookup(self, key):
+        entry = super().lookup(key)
+        if entry is not None:
+            shutil.rmtree(entry.entry_dir)
+        return entry
+
+
+def test_evicted_entry_is_a_miss():
+    with tempfile.TemporaryDirectory() as work_dir:
+        cache = EvictingCache(os.path.join(work_dir, "cache"))
+        key = make_cache_key({"design": 1})
+        cache.store(key, {"out.v": write_file(os.path.join(work_dir, "out.v"), "x")})
+        entry = cache.lookup(key)
+        try:
+            cache.restore(entry, os.path.join(work_dir, "restored"))
+            assert False, "expected FileNotFoundError"
+        except FileNotFoundError:
+            pass
+        assert cache.stats["hits"] == 0 and cache.stats["misses"] == 1
+
+
+def test_hls_cache_hit_skips_synthesis():
+    """
+    The same design under another project name is restored from the cache
+    and gives the same result dict, a changed clock period misses.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        with fake_vitis_hls_on_path(work_dir) as counter_path:
+            graph_manager = RandomGraphManager(seed=8)
+            graph_manager.generate_random_graph()
+            cpp_file = os.path.join(work_dir, "benchmark.cpp")
+            graph_manager.dump_cpp_std(cpp_file)
+
+            cache = ArtifactCache(os.path.join(work_dir, "cache"))
+            results = []
+            for i, clock_period in [(1, 10), (2, 10), (3, 5)]:
+                compile_dir = os.path.join(work_dir, f"compile_{i}")
+                hls_compiler = VitisHLSCompiler(working_dir=compile_dir, cache=cache, tool_version="test")
+                results.append(hls_compiler.compile(project_name=f"proj_{i}", top_name="top",
+                                                    clock_period=clock_period, cpp_file_list=[cpp_file]))
+
+        assert get_run_count(counter_path) == 2
+        assert [r["cache_hit"] for r in results] == [False, True, False]
+        assert all(r["success"] for r in results)
+        assert [os.path.relpath(v, os.path.join(work_dir, "compile_2", "proj_2")) for v in results[1]["verilog_files"]] == \
+            [os.path.relpath(v, os.path.join(work_dir, "compile_1", "proj_1")) for v in results[0]["verilog_files"]]
+        with open(results[1]["log_file"]) as f:
+            assert "fake synthesis done" in f.read()
+        assert cache.stats["hits"] == 1 and cache.stats["misses"] == 2
+
+
+def test_hls_evicted_entry_is_synthesized():
+    with tempfile.TemporaryDirectory() as work_dir:
+        with fake_vitis_hls_on_path(work_dir) as counter_path:
+            cpp_file = write_file(os.path.join(work_dir, "benchmark.cpp"), "void top() {}\n")
+            cache = EvictingCache(os.path.join(work_dir, "cache"))
+            results = []
+            for i in (1, 2):
+                hls_compiler = VitisHLSCompiler(working_dir=os.path.join(work_dir, f"compile_{i}"), cache=cache,
+                                                tool_version="test")
+                results.append(hls_compiler.compile(project_name=f"proj_{i}", top_name="top",
+                                                    clock_period=10, cpp_file_list=[cpp_file]))
+
+        assert get_run_count(counter_path) == 2
+        assert all(r["success"] and not r["cache_hit"] for r in results)
+        assert not os.path.exists(os.path.join(work_dir, "compile_2", "_hls_cache_staging"))
+
+
+def main():
+    test_store_restore_and_lru()
+    test_evicted_entry_is_a_miss()
+    test_hls_cache_hit_skips_synthesis()
+    test_hls_evicted_entry_is_synthesized()
+    print("✓ artifact cache tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
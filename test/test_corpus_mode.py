@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the corpus mode of main.py.
+Every seed gets its own shard and a failing benchmark must not abort the corpus.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main as benchmark_main
+from artifact_manifest import sha256_file
+
+
+def test_parse_seed_range():
+    assert benchmark_main.parse_seed_range("3..6") == [3, 4, 5, 6]
+    assert benchmark_main.parse_seed_range("7") == [7]
+    for illegal in ["6..3", "1..2..3"]:
+        try:
+            benchmark_main.parse_seed_range(illegal)
+            assert False, f"expected ValueError for {illegal}"
+        except ValueError:
+            pass
+
+
+def test_corpus_shards_and_summary():
+    """
+    The shards of a parallel corpus match the single benchmark runs, and a
+    failing benchmark is recorded in the summary.
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        args = benchmark_main.build_arg_parser().parse_args(
+            ["--output-dir", output_dir, "--skip-compilation", "--graph-formats", "none", "--jobs", "2"])
+        assert benchmark_main.run_corpus(args, [1, 2, 3]) == 0
+
+        single_dir = os.path.join(output_dir, "single")
+        single_args = benchmark_main.build_arg_parser().parse_args(
+            ["--output-dir", single_dir, "--skip-compilation", "--graph-formats", "none", "--seed", "2"])
+        assert benchmark_main.run_benchmark(single_args) == 0
+        assert sha256_file(os.path.join(single_dir, "benchmark_1.cpp")) == \
+            sha256_file(os.path.join(output_dir, "seed_2", "benchmark_1.cpp"))
+
+        with open(os.path.join(output_dir, "corpus_summary.json")) as f:
+            summary = json.load(f)
+        assert [result["seed"] for result in summary["results"]] == [1, 2, 3]
+        assert summary["status_counts"] == {"success": 3}
+
+        # an unknown pair makes every benchmark raise in its worker
+        args.pairs = "1-9"
+        assert benchmark_main.run_corpus(args, [4, 5]) == 1
+        with open(os.path.join(output_dir, "corpus_summary.json")) as f:
+            summary = json.load(f)
+        assert summary["status_counts"] == {"error": 2}
+        assert all("ValueError" in result["error"] for result in summary["results"])
+
+
+def main():
+    test_parse_seed_range()
+    test_corpus_shards_and_summary()
+    print("✓ corpus mode tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
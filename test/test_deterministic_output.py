@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for deterministic artifacts.
+The same seed and configuration must give byte-identical artifacts, wherever
+the output directory lives, so that content-addressed caches can hit.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from random_graph_manager import RandomGraphManager
+from vitis_hls_compiler import VitisHLSCompiler
+from artifact_manifest import ArtifactManifest, sha256_file
+
+
+def generate_variants(seed, output_dir):
+    """
+    Generate the two C++ variants and their HLS scripts into output_dir.
+
+    Returns:
+        list: paths of the generated files
+    """
+    graph_manager = RandomGraphManager(seed=seed)
+    graph_manager.generate_random_graph()
+    cpp_file_list = [os.path.join(output_dir, f"benchmark_{i}.cpp") for i in (1, 2)]
+    graph_manager.dump_cpp_variants(cpp_file_list)
+
+    generated_files = list(cpp_file_list)
+    for i, cpp_file in enumerate(cpp_file_list, 1):
+        compile_dir = os.path.join(output_dir, f"compile_{i}")
+        hls_compiler = VitisHLSCompiler(
+            working_dir=compile_dir,
+            hls_script_path=os.path.join(compile_dir, f"hls_script_{i}.tcl"),
+            log_file_path=os.path.join(compile_dir, f"hls_compile_{i}.log")
+        )
+        hls_compiler._generate_hls_script(f"hls_benchmark_{i}", "top", 10, [cpp_file])
+        generated_files.append(hls_compiler.hls_script_path)
+    return generated_files
+
+
+def test_same_seed_gives_identical_bytes():
+    """
+    Two runs with the same seed, in different directories, give identical files.
+    """
+    with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b:
+        files_a = generate_variants(seed=21, output_dir=dir_a)
+        files_b = generate_variants(seed=21, output_dir=dir_b)
+        for file_a, file_b in zip(files_a, files_b):
+            assert os.path.relpath(file_a, dir_a) == os.path.relpath(file_b, dir_b)
+            assert sha256_file(file_a) == sha256_file(file_b), f"{file_a} differs from {file_b}"
+
+
+def test_manifest_records_hashes():
+    """
+    The manifest keeps the provenance and the content hash of every artifact.
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        files = generate_variants(seed=21, output_dir=output_dir)
+        manifest = ArtifactManifest(output_dir)
+        manifest.set_config({"seed": 21})
+        for file_path in files:
+            manifest.add_artifact("generation", file_path)
+        manifest.write()
+
+        with open(manifest.manifest_path) as f:
+            manifest_dict = json.load(f)
+        assert manifest_dict["config"] == {"seed": 21}
+        assert "created_at" in manifest_dict["provenance"]
+        recorded = manifest_dict["artifacts"]["generation"]
+        assert sorted(recorded.keys()) == sorted(os.path.relpath(p, output_dir) for p in files)
+        for file_path in files:
+            assert recorded[os.path.relpath(file_path, output_dir)]["sha256"] == sha256_file(file_path)
+
+
+def main():
+    test_same_seed_gives_identical_bytes()
+    test_manifest_records_hashes()
+    print("✓ deterministic output tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the program graph exports.
+DOT and GraphML are the cheap default exports, the PNG picture is opt-in.
+"""
+
+import sys
+import os
+import tempfile
+import networkx as nx
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from random_graph_manager import RandomGraphManager
+
+
+def test_graphml_round_trip():
+    """
+    The streamed GraphML should read back with the same nodes and edges.
+    """
+    graph_manager = RandomGraphManager(seed=11)
+    graph_manager.generate_random_graph()
+    with tempfile.TemporaryDirectory() as output_dir:
+        graph_file = graph_manager.export_graph(output_dir, ["graphml"])[0]
+        graph = nx.read_graphml(graph_file)
+        assert graph.number_of_nodes() == graph_manager.program_graph.number_of_nodes()
+        assert graph.number_of_edges() == graph_manager.program_graph.number_of_edges()
+        for node in graph_manager._get_op_node_list():
+            assert graph.nodes[node.name]["op_type"] == node.op_type.value
+
+
+def test_dot_export_and_no_default_png():
+    """
+    Dumping the C++ variants no longer renders a picture, the DOT export lists every edge.
+    """
+    graph_manager = RandomGraphManager(seed=11)
+    graph_manager.generate_random_graph()
+    with tempfile.TemporaryDirectory() as output_dir:
+        cwd = os.getcwd()
+        os.chdir(output_dir)
+        try:
+            graph_manager.dump_cpp_variants(["benchmark_1.cpp", "benchmark_2.cpp"])
+            assert not os.path.exists("output_graph.png")
+            graph_file = graph_manager.export_graph(output_dir, ["dot"])[0]
+        finally:
+            os.chdir(cwd)
+        with open(graph_file) as f:
+            lines = f.read().splitlines()
+        assert lines[0] == "digraph program_graph {" and lines[-1] == "}"
+        assert sum(" -> " in l for l in lines) == graph_manager.program_graph.number_of_edges()
+
+
+def test_layered_layout():
+    """
+    Every node gets a position, no node sits above one of its predecessors.
+    """
+    graph_manager = RandomGraphManager(seed=11)
+    graph_manager.generate_random_graph()
+    pos = graph_manager._layered_layout()
+    assert len(pos) == graph_manager.program_graph.number_of_nodes()
+    for u, v in graph_manager.program_graph.edges():
+        assert pos[u][1] > pos[v][1]
+
+
+def main():
+    test_graphml_round_trip()
+    test_dot_export_and_no_default_png()
+    test_layered_layout()
+    print("✓ graph export tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-session HLS batch compile.
+A stand-in vitis_hls walks the batch script, fakes csynth_design for every
+solution and counts its launches.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from random_graph_manager import RandomGraphManager
+from vitis_hls_compiler import VitisHLSCompiler, HLSJob
+from artifact_cache import ArtifactCache
+from helpers import fake_vitis_hls_on_path, get_run_count
+import main as benchmark_main
+
+
+def test_batch_compile_in_one_session():
+    """
+    Three solutions in two projects are synthesized by one launch, every
+    caller gets its own Verilog and log, a rerun is served by the cache.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        with fake_vitis_hls_on_path(work_dir) as counter_path:
+            graph_manager = RandomGraphManager(seed=4)
+            graph_manager.generate_random_graph()
+            cpp_file_list = [os.path.join(work_dir, f"benchmark_{i}.cpp") for i in (1, 2)]
+            graph_manager.dump_cpp_variants(cpp_file_list)
+
+            def make_jobs():
+                return [HLSJob("proj_1", "top", 10, [cpp_file_list[0]], solution_name="solution1"),
+                        HLSJob("proj_1", "top", 5, [cpp_file_list[0]], solution_name="solution2"),
+                        HLSJob("proj_2", "top", 10, [cpp_file_list[1]], solution_name="solution3")]
+
+            cache = ArtifactCache(os.path.join(work_dir, "cache"))
+            compile_dir = os.path.join(work_dir, "compile_batch")
+            hls_compiler = VitisHLSCompiler(working_dir=compile_dir, cache=cache, tool_version="test")
+            results = hls_compiler.compile_batch(make_jobs())
+            assert get_run_count(counter_path) == 1
+
+            assert all(r["success"] and not r["cache_hit"] for r in results)
+            for result, clock in zip(results, [10, 5, 10]):
+                assert len(result["verilog_files"]) == 1
+                assert os.path.basename(os.path.dirname(os.path.dirname(os.path.dirname(
+                    result["verilog_files"][0])))) == result["solution_name"]
+                with open(result["verilog_files"][0]) as f:
+                    assert f.readline().strip() == f"// clock {clock}"
+                with open(result["log_file"]) as f:
+                    log_lines = f.read().splitlines()
+                assert log_lines[0].endswith(result["solution_name"])
+                assert sum(line.startswith("synthesizing") for line in log_lines) == 1
+
+            results_again = hls_compiler.compile_batch(make_jobs())
+            assert get_run_count(counter_path) == 1
+            assert all(r["success"] and r["cache_hit"] for r in results_again)
+            assert [r["verilog_files"] for r in results_again] == [r["verilog_files"] for r in results]
+
+
+def test_failing_solution_does_not_stop_the_batch():
+    with tempfile.TemporaryDirectory() as work_dir:
+        with fake_vitis_hls_on_path(work_dir):
+            os.environ["FAKE_VITIS_HLS_FAIL"] = "proj/solution2"
+            cpp_file = os.path.join(work_dir, "benchmark.cpp")
+            open(cpp_file, "w").close()
+            hls_compiler = VitisHLSCompiler(working_dir=os.path.join(work_dir, "compile_batch"))
+            results = hls_compiler.compile_batch(
+                [HLSJob("proj", "top", 10, [cpp_file], solution_name=f"solution{i}") for i in (1, 2, 3)])
+            assert [r["success"] for r in results] == [True, False, True]
+            assert not hls_compiler.last_tool_result.stopped_early
+            assert results[1]["error"] == "solution proj/solution2 failed"
+            assert [d["pattern_name"] for d in results[1]["diagnostics"]] == ["hls_error"]
+            assert results[2]["diagnostics"] == []
+
+
+def test_batch_rejects_inconsistent_project():
+    with tempfile.TemporaryDirectory() as work_dir:
+        cpp_1 = os.path.join(work_dir, "a.cpp")
+        cpp_2 = os.path.join(work_dir, "b.cpp")
+        for cpp_file in (cpp_1, cpp_2):
+            open(cpp_file, "w").close()
+        hls_compiler = VitisHLSCompiler(working_dir=work_dir)
+        try:
+            hls_compiler.compile_batch([HLSJob("proj", "top", 10, [cpp_1], solution_name="s1"),
+                                        HLSJob("proj", "top", 10, [cpp_2], solution_name="s2")])
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+
+def test_only_paired_variants_are_compiled():
+    """
+    --variants 4 --pairs 1-2 compiles the first two variants only, one by
+    one or in a batch.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        with fake_vitis_hls_on_path(work_dir) as counter_path:
+            cpp_file_list = [os.path.join(work_dir, f"benchmark_{i}.cpp") for i in range(1, 5)]
+            for i, cpp_file in enumerate(cpp_file_list, 1):
+                with open(cpp_file, "w") as f:
+                    f.write(f"void top() {{}} // {i}\n")
+            args = benchmark_main.build_arg_parser().parse_args(
+                ["--output-dir", work_dir, "--variants", "4", "--pairs", "1-2"])
+            results, success = benchmark_main.compile_variants(args, cpp_file_list, compile_indices=[1, 2])
+            assert success and [r["compile_index"] for r in results] == [1, 2]
+            assert get_run_count(counter_path) == 2
+            results, success = benchmark_main.compile_variants_batch(args, cpp_file_list, compile_indices=[1, 2])
+            assert success and [r["compile_index"] for r in results] == [1, 2]
+            assert [os.path.basename(r["cpp_file"]) for r in results] == ["benchmark_1.cpp", "benchmark_2.cpp"]
+            assert get_run_count(counter_path) == 3
+
+
+def test_rejected_profile_setting_is_logged():
+    """
+    A fast profile setting the release does not know is skipped and shows
+    up in the diagnostics instead of being swallowed.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        with fake_vitis_hls_on_path(work_dir):
+            os.environ["FAKE_VITIS_HLS_REJECT"] = "config_export -vivado_report_level 0"
+            cpp_file = os.path.join(work_dir, "benchmark.cpp")
+            open(cpp_file, "w").close()
+            hls_compiler = VitisHLSCompiler(working_dir=os.path.join(work_dir, "compile"), profile="fast")
+            result = hls_compiler.compile(project_name="proj", top_name="top", clock_period=10,
+                                          cpp_file_list=[cpp_file])
+            assert result["success"]
+            assert [(d["pattern_name"], d["severity"]) for d in result["diagnostics"]] == \
+                [("profile_setting_skipped", "warning")]
+            assert "config_export -vivado_report_level 0: unknown option" in result["diagnostics"][0]["line"]
+            with open(result["script_file"]) as f:
+                script = f.read()
+            assert "catch {config_export -rtl verilog}" in script
+
+
+def main():
+    test_batch_compile_in_one_session()
+    test_failing_solution_does_not_stop_the_batch()
+    test_batch_rejects_inconsistent_project()
+    test_only_paired_variants_are_compiled()
+    test_rejected_profile_setting_is_logged()
+    print("✓ HLS batch tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the live HLS log scanning.
+A stand-in vitis_hls reports an error and then hangs, the compile must stop
+at the error instead of waiting for the tool.
+"""
+
+import sys
+import os
+import stat
+import time
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from log_scanner import LogScanner, LogPattern, VITIS_HLS_LOG_PATTERNS
+from vitis_hls_compiler import VitisHLSCompiler
+
+HANGING_VITIS_HLS = """#!/bin/sh
+echo "INFO: [HLS 200-10] Analyzing design file 'benchmark.cpp' ..."
+echo "WARNING: [XFORM 203-503] Cannot unroll loop 'loop_1' completely: variable loop bound."
+echo "ERROR: [HLS 207-3776] use of undeclared identifier 'x'"
+sleep 60
+"""
+
+
+def test_scanner_matches():
+    log_scanner = LogScanner(VITIS_HLS_LOG_PATTERNS)
+    assert not log_scanner.feed_line("INFO: [HLS 200-10] Analyzing design file")
+    assert not log_scanner.feed_line("WARNING: [XFORM 203-503] Cannot unroll loop 'l' completely")
+    assert log_scanner.feed_line("WARNING: [HLS 200-1995] There were 2,000,000 instructions in the design")
+    assert [m.pattern_name for m in log_scanner.matches] == ["cannot_unroll", "design_size_blowup"]
+    assert log_scanner.fatal_match.line_number == 3
+
+    custom_scanner = LogScanner([LogPattern(name="any_warning", regex=r"^WARNING", severity="warning")])
+    assert not custom_scanner.feed_line("WARNING: [HLS 200-1995] There were 2,000,000 instructions")
+    assert custom_scanner.fatal_match is None
+
+
+def test_fatal_line_stops_compile():
+    old_path = os.environ["PATH"]
+    with tempfile.TemporaryDirectory() as work_dir:
+        bin_dir = os.path.join(work_dir, "bin")
+        os.makedirs(bin_dir)
+        vitis_hls_path = os.path.join(bin_dir, "vitis_hls")
+        with open(vitis_hls_path, "w") as f:
+            f.write(HANGING_VITIS_HLS)
+        os.chmod(vitis_hls_path, os.stat(vitis_hls_path).st_mode | stat.S_IEXEC)
+        cpp_file = os.path.join(work_dir, "benchmark.cpp")
+        open(cpp_file, "w").close()
+        os.environ["PATH"] = bin_dir + os.pathsep + old_path
+        try:
+            hls_compiler = VitisHLSCompiler(working_dir=os.path.join(work_dir, "compile"), timeout_s=120)
+            start_time = time.perf_counter()
+            result = hls_compiler.compile(project_name="proj", top_name="top", cpp_file_list=[cpp_file])
+        finally:
+            os.environ["PATH"] = old_path
+
+        assert time.perf_counter() - start_time < 30
+        assert not result["success"]
+        assert result["exit_info"]["stopped_early"]
+        assert [d["pattern_name"] for d in result["diagnostics"]] == ["cannot_unroll", "hls_error"]
+        assert result["diagnostics"][1]["line_number"] == 3
+        assert "hls_error" in result["error"]
+
+
+def main():
+    test_scanner_matches()
+    test_fatal_line_stops_compile()
+    print("✓ log scanner tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
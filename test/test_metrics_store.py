@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the csynth report parsing and the metrics store.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from csynth_report import parse_csynth_xml, find_csynth_xml
+from metrics_store import MetricsStore
+
+CSYNTH_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<profile>
+  <ReportVersion><Version>2023.1</Version></ReportVersion>
+  <UserAssignments>
+    <unit>ns</unit><ProductFamily>zynq</ProductFamily><Part>xc7z020-clg484-1</Part>
+    <TopModelName>top</TopModelName><TargetClockPeriod>10.00</TargetClockPeriod>
+  </UserAssignments>
+  <PerformanceEstimates>
+    <SummaryOfTimingAnalysis><unit>ns</unit><EstimatedClockPeriod>{clock}</EstimatedClockPeriod></SummaryOfTimingAnalysis>
+    <SummaryOfOverallLatency>
+      <unit>clock cycles</unit><Best-caseLatency>{latency_min}</Best-caseLatency>
+      <Worst-caseLatency>{latency_max}</Worst-caseLatency>
+      <Interval-min>{interval}</Interval-min><Interval-max>{interval}</Interval-max>
+    </SummaryOfOverallLatency>
+    <SummaryOfLoopLatency>
+      <loop_2>
+        <TripCount>8</TripCount><Latency>16</Latency><PipelineII>2</PipelineII><PipelineDepth>3</PipelineDepth>
+        <loop_3><TripCount>4</TripCount><Latency>undef</Latency></loop_3>
+      </loop_2>
+    </SummaryOfLoopLatency>
+  </PerformanceEstimates>
+  <AreaEstimates>
+    <Resources><BRAM_18K>0</BRAM_18K><DSP>1</DSP><FF>{ff}</FF><LUT>220</LUT><URAM>0</URAM></Resources>
+  </AreaEstimates>
+</profile>
+"""
+
+
+def write_report(solution_path, **values):
+    report_dir = os.path.join(solution_path, "syn", "report")
+    os.makedirs(report_dir, exist_ok=True)
+    with open(os.path.join(report_dir, "csynth.xml"), "w") as f:
+        f.write(CSYNTH_XML.format(**values))
+    return find_csynth_xml(solution_path, "top")
+
+
+def test_parse_csynth_xml():
+    with tempfile.TemporaryDirectory() as work_dir:
+        xml_file_path = write_report(os.path.join(work_dir, "solution1"), clock="3.254", latency_min=17,
+                                     latency_max=33, interval=34, ff=120)
+        metrics = parse_csynth_xml(xml_file_path)
+        assert (metrics.top_name, metrics.part, metrics.tool_version) == ("top", "xc7z020-clg484-1", "2023.1")
+        assert (metrics.target_clock_ns, metrics.estimated_clock_ns) == (10.0, 3.254)
+        assert (metrics.latency_min, metrics.latency_max, metrics.interval_min) == (17, 33, 34)
+        assert (metrics.ff, metrics.lut, metrics.dsp, metrics.bram_18k) == (120, 220, 1, 0)
+        assert [loop.name for loop in metrics.loops] == ["loop_2", "loop_2/loop_3"]
+        assert (metrics.loops[0].trip_count, metrics.loops[0].pipeline_ii) == (8, 2)
+        assert metrics.loops[1].latency_max is None
+
+
+def test_trip_count_range():
+    # a variable trip count is reported as a range, the maximum is kept
+    with tempfile.TemporaryDirectory() as work_dir:
+        xml_file_path = write_report(os.path.join(work_dir, "solution1"), clock="3.254", latency_min=17,
+                                     latency_max=33, interval=34, ff=120)
+        with open(xml_file_path) as f:
+            content = f.read()
+        with open(xml_file_path, "w") as f:
+            f.write(content.replace("<TripCount>8</TripCount><Latency>16</Latency>",
+                                    "<TripCount>\n          <range><min>1</min><max>8</max></range>\n"
+                                    "        </TripCount>\n        <Latency>\n"
+                                    "          <range><min>2</min><max>16</max></range>\n        </Latency>"))
+        loop = parse_csynth_xml(xml_file_path).loops[0]
+        assert (loop.name, loop.trip_count, loop.latency_min, loop.latency_max) == ("loop_2", 8, 2, 16)
+
+
+def test_store_and_query():
+    with tempfile.TemporaryDirectory() as work_dir:
+        metrics_store = MetricsStore(os.path.join(work_dir, "metrics.db"))
+        for seed, latency, ff in [(1, 40, 300), (2, 10, 900), (3, 25, 100)]:
+            for variant in (1, 2):
+                xml_file_path = write_report(os.path.join(work_dir, f"s{seed}_{variant}"), clock="5.0",
+                                             latency_min=latency, latency_max=latency * variant,
+                                             interval=latency + 1, ff=ff + variant)
+                metrics_store.add_metrics(f"seed_{seed}", variant, parse_csynth_xml(xml_file_path), seed=seed)
+        # storing a variant again replaces it
+        metrics_store.add_metrics("seed_3", 2, parse_csynth_xml(xml_file_path), seed=3)
+
+        rows = metrics_store.query(order_by="latency_max", limit=3)
+        assert [(r["benchmark"], r["variant"]) for r in rows] == [("seed_2", 1), ("seed_2", 2), ("seed_3", 1)]
+        rows = metrics_store.query(where="ff < ?", params=(500,), order_by="ff", descending=True)
+        assert [r["ff"] for r in rows] == [302, 301, 102, 101]
+        assert len(metrics_store.query()) == 6
+        assert [l["loop_name"] for l in metrics_store.get_loops("seed_1", 2)] == ["loop_2", "loop_2/loop_3"]
+        metrics_store.close()
+
+
+def main():
+    test_parse_csynth_xml()
+    test_trip_count_range()
+    test_store_and_query()
+    print("✓ metrics store tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
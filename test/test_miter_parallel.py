@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the parallel preprocessing of the two miter sides, with a
+fake yosys that copies its input and sleeps, so the sides must overlap.
+"""
+
+import sys
+import os
+import filecmp
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from miter_generator import MiterGenerator
+from random_graph_manager import RandomGraphManager
+from reference_rtl import ReferenceRTLGenerator
+from verilog_processing import kairos_preprocess
+from yosys_compiler import YosysCompiler
+from helpers import write_fake_yosys
+
+
+def test_parallel_sides():
+    with tempfile.TemporaryDirectory() as work_dir:
+        # the two sides must have the same interface, they differ in a comment
+        graph_manager = RandomGraphManager(seed=3)
+        graph_manager.generate_random_graph()
+        verilog = ReferenceRTLGenerator(graph_manager).generate_verilog()
+        verilog_files = []
+        for side in (1, 2):
+            verilog_files.append(os.path.join(work_dir, f"top_{side}.v"))
+            with open(verilog_files[-1], "w") as f:
+                f.write(f"// side {side}\n" + verilog)
+        yosys_compiler = YosysCompiler(yosys_path=write_fake_yosys(
+            os.path.join(work_dir, "fake_yosys"), events_file=os.path.join(work_dir, "events.txt"), sleep_s=0.5))
+
+        miter_dirs = {}
+        for mode, parallel_sides in [("sequential", False), ("parallel", True)]:
+            miter_dirs[mode] = os.path.join(work_dir, mode)
+            os.makedirs(miter_dirs[mode])
+            if os.path.exists(os.path.join(work_dir, "events.txt")):
+                os.remove(os.path.join(work_dir, "events.txt"))
+            miter_generator = MiterGenerator([verilog_files[0]], [verilog_files[1]], miter_dirs[mode], "top",
+                                             yosys_compiler=yosys_compiler, parallel_sides=parallel_sides)
+            miter_generator.generate_miter()
+            with open(os.path.join(work_dir, "events.txt")) as f:
+                events = [line.split()[0] for line in f.read().splitlines()]
+            if parallel_sides:
+                # both sides started before either ended
+                assert events[:2] == ["start", "start"], events
+                assert sorted(os.path.basename(p) for p in miter_generator.yosys_log_file_path_list) == \
+                    ["merged_1_flatten_yosys.log", "merged_2_flatten_yosys.log"]
+            else:
+                assert events == ["start", "end"]
+                assert miter_generator.yosys_log_file_path_list == [miter_generator.flatten_log_file_path]
+
+        for file_name in ["merged_1_proc.v", "merged_2_proc.v", "miter.v"]:
+            assert filecmp.cmp(os.path.join(miter_dirs["sequential"], file_name),
+                               os.path.join(miter_dirs["parallel"], file_name), shallow=False)
+
+        # the split transform and construct give what kairos_preprocess gives
+        reference_miter = os.path.join(work_dir, "reference_miter.v")
+        kairos_preprocess(os.path.join(miter_dirs["parallel"], "merged_1_proc.v"),
+                          os.path.join(miter_dirs["parallel"], "merged_2_proc.v"),
+                          reference_miter, fast_slow_mode=True)
+        assert filecmp.cmp(reference_miter, os.path.join(miter_dirs["parallel"], "miter.v"), shallow=False)
+
+
+def main():
+    test_parallel_sides()
+    print("✓ parallel miter tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
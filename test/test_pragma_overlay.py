@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for pragma overlays.
+The comparison variants must share the program graph and only differ in the
+per-loop pragmas recorded in their overlays.
+"""
+
+import sys
+import os
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from random_graph_manager import RandomGraphManager
+from node import LoopNode, OperationType, ResultDataType
+
+
+def build_graph_with_loops(seed, loop_count=4):
+    """
+    Build a small graph with a few loops, the random generator does not add loops yet.
+
+    Args:
+        seed: The seed used for the manager
+        loop_count: Number of loop nodes to add
+
+    Returns:
+        RandomGraphManager: the manager holding the graph
+    """
+    graph_manager = RandomGraphManager(seed=seed)
+    graph_manager._reset_all()
+    input_0 = graph_manager.add_op_node(op_type=OperationType.ADD, predecessor_list=[],
+                                        result_type=ResultDataType.AP_INT, result_width=8)
+    input_1 = graph_manager.add_op_node(op_type=OperationType.ADD, predecessor_list=[],
+                                        result_type=ResultDataType.AP_INT, result_width=8)
+    for i in range(loop_count):
+        loop_node = graph_manager.add_loop_node(start_index=0, end_index=7 + i, step=1)
+        graph_manager.add_op_node(op_type=OperationType.ADD, predecessor_list=[input_0, input_1],
+                                  result_type=ResultDataType.AP_INT, result_width=8,
+                                  loop_node=loop_node)
+    return graph_manager
+
+
+def test_overlays_share_graph():
+    """
+    The overlays should cover every loop, leave the shared loop nodes untouched
+    and produce different C++ for the two variants.
+    """
+    graph_manager = build_graph_with_loops(seed=3)
+    loop_nodes = [n for n in graph_manager.program_graph.nodes() if isinstance(n, LoopNode)]
+    pragmas_before = [n.get_pragma() for n in loop_nodes]
+    node_ids_before = [id(n) for n in graph_manager.program_graph.nodes()]
+
+    assert graph_manager.generate_cmp_graphs()
+
+    overlay_1 = graph_manager.pragma_overlays[0]
+    overlay_2 = graph_manager.pragma_overlays[1]
+    assert sorted(overlay_1.loop_pragmas.keys()) == sorted(n.name for n in loop_nodes)
+    assert sorted(overlay_2.loop_pragmas.keys()) == sorted(n.name for n in loop_nodes)
+    assert 1 <= overlay_1.clock_period <= 10
+    assert 1 <= overlay_2.clock_period <= 10
+
+    # the shared graph is neither copied nor modified
+    assert [id(n) for n in graph_manager.program_graph.nodes()] == node_ids_before
+    assert [n.get_pragma() for n in loop_nodes] == pragmas_before
+
+    cpp_code_1 = graph_manager._dump_cp_1_cpp()
+    cpp_code_2 = graph_manager._dump_cp_2_cpp()
+    assert overlay_1.loop_pragmas != overlay_2.loop_pragmas
+    assert cpp_code_1 != cpp_code_2
+
+
+def test_overlays_are_reproducible():
+    """
+    The same seed should produce the same overlays.
+    """
+    graph_manager_a = build_graph_with_loops(seed=5)
+    graph_manager_b = build_graph_with_loops(seed=5)
+    graph_manager_a.generate_cmp_graphs()
+    graph_manager_b.generate_cmp_graphs()
+    assert graph_manager_a.pragma_overlays[0] == graph_manager_b.pragma_overlays[0]
+    assert graph_manager_a.pragma_overlays[1] == graph_manager_b.pragma_overlays[1]
+
+
+def test_k_variant_overlays():
+    """
+    K variants should give K overlays, the first two match the comparison pair.
+    """
+    graph_manager = build_graph_with_loops(seed=3)
+    graph_manager.generate_cmp_graphs()
+    cmp_overlays = list(graph_manager.pragma_overlays)
+
+    assert graph_manager.generate_variant_overlays(variant_count=4)
+    assert len(graph_manager.pragma_overlays) == 4
+    assert graph_manager.pragma_overlays[:2] == cmp_overlays
+    cpp_codes = [graph_manager._dump_variant_cpp(i) for i in range(1, 5)]
+    assert len(cpp_codes) == 4
+
+    # the derived seeds of neighbouring seeds do not collide
+    for stream in ("pragma", "clock"):
+        derived_seeds = [RandomGraphManager(seed=seed)._get_variant_seed(i, stream)
+                         for seed in (3, 4) for i in range(1, 5)]
+        assert len(set(derived_seeds)) == len(derived_seeds)
+    assert RandomGraphManager(seed=3)._get_variant_seed(2, "clock") == 11
+
+
+def main():
+    test_overlays_share_graph()
+    test_overlays_are_reproducible()
+    test_k_variant_overlays()
+    print("✓ pragma overlay tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the retention policies applied to finished HLS projects.
+"""
+
+import sys
+import os
+import tarfile
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from retention import apply_retention, HLS_KEEP_PATTERNS
+from artifact_manifest import ArtifactManifest
+from vitis_hls_compiler import VitisHLSCompiler
+
+PROJECT_FILES = {
+    "solution1/syn/verilog/top.v": "module top(); endmodule\n",
+    "solution1/syn/report/top_csynth.xml": "<profile/>\n",
+    "solution1/syn/report/top_csynth.rpt": "latency 1\n",
+    "solution1/solution1.log": "log\n",
+    "solution1/.autopilot/db/top.bc": "x" * 4000,
+    "solution1/impl/misc/drivers.c": "y" * 2000,
+    "hls.app": "<project/>\n",
+}
+
+KEPT_FILES = [
+    "solution1/syn/verilog/top.v",
+    "solution1/syn/report/top_csynth.xml",
+    "solution1/syn/report/top_csynth.rpt",
+    "solution1/solution1.log",
+]
+
+
+def make_project(work_dir):
+    project_path = os.path.join(work_dir, "proj")
+    for rel_path, content in PROJECT_FILES.items():
+        file_path = os.path.join(project_path, rel_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as f:
+            f.write(content)
+    return project_path
+
+
+def list_files(root_dir):
+    file_list = []
+    for dir_path, _, file_names in os.walk(root_dir):
+        for file_name in file_names:
+            file_list.append(os.path.relpath(os.path.join(dir_path, file_name), root_dir))
+    return sorted(file_list)
+
+
+def test_keep_policy():
+    with tempfile.TemporaryDirectory() as work_dir:
+        project_path = make_project(work_dir)
+        report = apply_retention(project_path, HLS_KEEP_PATTERNS, "keep")
+        assert report["bytes_reclaimed"] == 0
+        assert list_files(project_path) == sorted(PROJECT_FILES)
+
+
+def test_delete_policy():
+    with tempfile.TemporaryDirectory() as work_dir:
+        project_path = make_project(work_dir)
+        report = apply_retention(project_path, HLS_KEEP_PATTERNS, "delete")
+        assert list_files(project_path) == sorted(KEPT_FILES)
+        assert not os.path.exists(os.path.join(project_path, "solution1", ".autopilot"))
+        assert report["files_pruned"] == 3
+        assert report["bytes_reclaimed"] == report["bytes_before"] - report["bytes_after"]
+        assert report["bytes_reclaimed"] > 6000
+
+
+def test_pack_and_compress_policies():
+    for policy, archive_file in [("pack", "pruned_artifacts.tar"), ("compress", "pruned_artifacts.tar.gz")]:
+        with tempfile.TemporaryDirectory() as work_dir:
+            project_path = make_project(work_dir)
+            report = apply_retention(project_path, HLS_KEEP_PATTERNS, policy)
+            assert list_files(project_path) == sorted(KEPT_FILES + [archive_file])
+            assert report["archive"] == os.path.join(project_path, archive_file)
+            with tarfile.open(report["archive"]) as archive:
+                assert sorted(archive.getnames()) == \
+                    sorted(["hls.app", "solution1/.autopilot/db/top.bc", "solution1/impl/misc/drivers.c"])
+            if policy == "compress":
+                assert report["bytes_reclaimed"] > 5000
+            # a second pass leaves the archive alone
+            report = apply_retention(project_path, HLS_KEEP_PATTERNS, policy)
+            assert report["files_pruned"] == 0
+            # a re-run into the same project gets its own archive
+            make_project(work_dir)
+            report = apply_retention(project_path, HLS_KEEP_PATTERNS, policy)
+            assert report["files_pruned"] == 3
+            assert report["archive"] == os.path.join(project_path, archive_file.replace(".tar", "_1.tar"))
+            assert list_files(project_path) == sorted(KEPT_FILES + [archive_file, os.path.basename(report["archive"])])
+
+
+def test_clean_project_and_manifest():
+    """
+    clean_project with a policy prunes through the compiler, the manifest
+    keeps the pruned files marked as pruned.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        project_path = make_project(work_dir)
+        manifest = ArtifactManifest(work_dir)
+        for rel_path in ["solution1/syn/verilog/top.v", "hls.app"]:
+            manifest.add_artifact("hls_compile_1", os.path.join(project_path, rel_path))
+        hls_compiler = VitisHLSCompiler(working_dir=work_dir)
+        assert hls_compiler.clean_project("proj", retention_policy="compress")
+        assert list_files(project_path) == sorted(KEPT_FILES + ["pruned_artifacts.tar.gz"])
+        assert manifest.mark_pruned() == 1
+        artifacts = manifest.artifacts["hls_compile_1"]
+        assert artifacts[os.path.join("proj", "hls.app")]["pruned"]
+        assert "pruned" not in artifacts[os.path.join("proj", "solution1", "syn", "verilog", "top.v")]
+        assert manifest.mark_pruned() == 0
+
+
+def test_illegal_policy():
+    with tempfile.TemporaryDirectory() as work_dir:
+        project_path = make_project(work_dir)
+        try:
+            apply_retention(project_path, HLS_KEEP_PATTERNS, "zip")
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+
+def main():
+    test_keep_policy()
+    test_delete_policy()
+    test_pack_and_compress_policies()
+    test_clean_project_and_manifest()
+    test_illegal_policy()
+    print("All retention tests passed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
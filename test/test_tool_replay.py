@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the record/replay stand-ins of vitis_hls and yosys. Fake
+"real" tools are recorded once, then replayed with the fakes removed.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from random_graph_manager import RandomGraphManager
+from tool_replay import install_tool_shims, REPLAY_MISS_EXIT_CODE
+from vitis_hls_compiler import VitisHLSCompiler
+from yosys_compiler import YosysCompiler
+from helpers import write_fake_vitis_hls, write_fake_yosys
+
+
+def compile_design(work_dir, cpp_file):
+    hls_compiler = VitisHLSCompiler(working_dir=os.path.join(work_dir, "compile"))
+    return hls_compiler.compile(project_name="proj", top_name="top", clock_period=10,
+                                cpp_file_list=[cpp_file])
+
+
+def test_record_then_replay():
+    with tempfile.TemporaryDirectory() as work_dir:
+        real_bin_dir = os.path.join(work_dir, "real_bin")
+        os.makedirs(real_bin_dir)
+        real_tools = {"vitis_hls": write_fake_vitis_hls(os.path.join(real_bin_dir, "vitis_hls")),
+                      "yosys": write_fake_yosys(os.path.join(real_bin_dir, "yosys"))}
+        fixture_dir = os.path.join(work_dir, "fixtures")
+        graph_manager = RandomGraphManager(seed=5)
+        graph_manager.generate_random_graph()
+        cpp_file = os.path.join(work_dir, "benchmark.cpp")
+        graph_manager.dump_cpp_std(cpp_file)
+        verilog_file = os.path.join(work_dir, "design.v")
+        with open(verilog_file, "w") as f:
+            f.write("module top(input a, output b); assign b = a; endmodule\n")
+
+        old_path = os.environ["PATH"]
+        try:
+            record_shims = install_tool_shims(os.path.join(work_dir, "record_bin"), "record", fixture_dir,
+                                              real_tools=real_tools)
+            os.environ["PATH"] = os.path.dirname(record_shims["vitis_hls"]) + os.pathsep + old_path
+            recorded = compile_design(work_dir, cpp_file)
+            assert recorded["success"]
+            with open(recorded["verilog_files"][0]) as f:
+                recorded_verilog = f.read()
+            YosysCompiler(yosys_path=record_shims["yosys"]).execute_flatten(
+                verilog_file, work_dir, os.path.join(work_dir, "flat.v"))
+
+            # replay with the real tools gone and the outputs removed
+            for file_path in list(real_tools.values()) + [os.path.join(work_dir, "flat.v")]:
+                os.remove(file_path)
+            os.remove(recorded["verilog_files"][0])
+            replay_shims = install_tool_shims(os.path.join(work_dir, "replay_bin"), "replay", fixture_dir)
+            os.environ["PATH"] = os.path.dirname(replay_shims["vitis_hls"]) + os.pathsep + old_path
+            replayed = compile_design(work_dir, cpp_file)
+            assert replayed["success"]
+            with open(replayed["verilog_files"][0]) as f:
+                assert f.read() == recorded_verilog
+            with open(replayed["log_file"]) as f:
+                assert "fake synthesis done" in f.read()
+            yosys_compiler = YosysCompiler(yosys_path=replay_shims["yosys"])
+            yosys_compiler.execute_flatten(verilog_file, work_dir, os.path.join(work_dir, "flat.v"))
+            with open(os.path.join(work_dir, "flat.v")) as f, open(verilog_file) as g:
+                assert f.read() == g.read()
+
+            # a re-run into the used directories, with the outputs of the
+            # earlier runs still in place, replays as well
+            assert compile_design(work_dir, cpp_file)["success"]
+            yosys_compiler.execute_flatten(verilog_file, work_dir, os.path.join(work_dir, "flat.v"))
+            assert yosys_compiler.last_tool_result.success
+
+            # a changed design is not replayed from a stale fixture
+            with open(cpp_file, "a") as f:
+                f.write("// changed\n")
+            changed = compile_design(work_dir, cpp_file)
+            assert not changed["success"]
+            assert changed["exit_info"]["return_code"] == REPLAY_MISS_EXIT_CODE
+        finally:
+            os.environ["PATH"] = old_path
+
+
+def main():
+    test_record_then_replay()
+    print("✓ tool replay tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the tool runner.
+Runs keep their own cwd, stream to a log file, and a timeout kills the whole
+process group of the tool.
+"""
+
+import sys
+import os
+import time
+import asyncio
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tool_runner import ToolRunner, with_memory_limit
+
+
+def test_cwd_and_log_streaming():
+    """
+    Concurrent runs keep their own cwd and the process cwd is untouched.
+    """
+    cwd_before = os.getcwd()
+    with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b:
+        runner = ToolRunner(timeout_s=30)
+
+        async def run_both():
+            return await asyncio.gather(
+                runner.run_async(["sh", "-c", "pwd; echo err >&2; exit 3"], dir_a,
+                                 os.path.join(dir_a, "tool.log")),
+                runner.run_async(["sh", "-c", "pwd"], dir_b, os.path.join(dir_b, "tool.log")))
+
+        result_a, result_b = asyncio.run(run_both())
+        assert os.getcwd() == cwd_before
+        assert result_a.return_code == 3 and not result_a.success
+        assert result_b.success
+        with open(result_a.log_file_path) as f:
+            assert f.read().split() == [os.path.realpath(dir_a), "err"]
+        assert result_b.log_tail().strip() == os.path.realpath(dir_b)
+
+
+def test_timeout_kills_process_group():
+    """
+    A timed out tool is killed together with the children it started.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        pid_file = os.path.join(work_dir, "child.pid")
+        runner = ToolRunner(timeout_s=0.5, kill_grace_s=1)
+        start_time = time.perf_counter()
+        result = runner.run(["sh", "-c", f"sleep 60 & echo $! > {pid_file}; wait"], work_dir,
+                            os.path.join(work_dir, "tool.log"))
+        assert time.perf_counter() - start_time < 10
+        assert result.timed_out and not result.success
+        with open(pid_file) as f:
+            child_pid = int(f.read())
+        time.sleep(0.2)
+        # a killed child may stay a zombie until init reaps it
+        stat_path = f"/proc/{child_pid}/stat"
+        alive = False
+        if os.path.exists(stat_path):
+            with open(stat_path) as f:
+                alive = f.read().rsplit(")", 1)[1].split()[0] not in ("Z", "X")
+        assert not alive, "the child of the tool survived the timeout"
+
+
+def test_memory_limit():
+    """
+    The tool, not the runner, gets the address space limit, the recorded
+    command is the one of the caller.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        runner = ToolRunner(timeout_s=30, memory_limit_mb=512)
+        result = runner.run(["sh", "-c", "ulimit -v"], work_dir,
+                            os.path.join(work_dir, "tool.log"))
+        assert result.success
+        assert result.log_tail().strip() == str(512 * 1024)
+        assert result.command == ["sh", "-c", "ulimit -v"]
+    assert with_memory_limit(["no_such_tool"], 512) == ["no_such_tool"]
+    assert with_memory_limit(["sh"], None) == ["sh"]
+
+
+def main():
+    test_cwd_and_log_streaming()
+    test_timeout_kills_process_group()
+    test_memory_limit()
+    print("✓ tool runner tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the yosys output cache. A fake yosys copies every read
+design to the following write, a second miter of the same designs must
+not launch it again.
+"""
+
+import sys
+import os
+import filecmp
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from artifact_cache import ArtifactCache
+from miter_generator import MiterGenerator
+from random_graph_manager import RandomGraphManager
+from reference_rtl import ReferenceRTLGenerator
+from yosys_compiler import YosysCompiler
+from helpers import write_fake_yosys
+
+
+def write_versioned_yosys(work_dir, version):
+    return write_fake_yosys(os.path.join(work_dir, f"yosys_{version}"), version=version,
+                            invocations_file=os.path.join(work_dir, "launches.txt"))
+
+
+def get_launches(work_dir):
+    with open(os.path.join(work_dir, "launches.txt")) as f:
+        return f.read().splitlines()
+
+
+def build_miter(work_dir, miter_name, yosys_compiler, verilog_file):
+    miter_dir = os.path.join(work_dir, miter_name)
+    os.makedirs(miter_dir)
+    miter_generator = MiterGenerator([verilog_file], [verilog_file], miter_dir, "top",
+                                     yosys_compiler=yosys_compiler)
+    kairos_top = miter_generator.generate_miter()
+    yosys_compiler.execute(miter_generator.miter_verilog_file_path, miter_dir,
+                           os.path.join(miter_dir, "miter.aig"), top_name=kairos_top)
+    return miter_generator
+
+
+def test_cached_miter_stages():
+    with tempfile.TemporaryDirectory() as work_dir:
+        graph_manager = RandomGraphManager(seed=3)
+        graph_manager.generate_random_graph()
+        verilog_file = ReferenceRTLGenerator(graph_manager).dump_verilog(os.path.join(work_dir, "top.v"))
+        cache = ArtifactCache(os.path.join(work_dir, "cache"))
+        yosys_compiler = YosysCompiler(yosys_path=write_versioned_yosys(work_dir, "1.0"), cache=cache)
+
+        # one launch flattens both sides, one writes the AIGER
+        first = build_miter(work_dir, "miter_a", yosys_compiler, verilog_file)
+        assert len(get_launches(work_dir)) == 2
+        second = build_miter(work_dir, "miter_b", yosys_compiler, verilog_file)
+        assert len(get_launches(work_dir)) == 2
+        assert yosys_compiler.last_cache_hit
+        for file_name in ["merged_1_flatten.v", "merged_2_proc.v", "miter.v", "miter.aig", "miter_yosys.log"]:
+            assert filecmp.cmp(os.path.join(first.working_dir, file_name),
+                               os.path.join(second.working_dir, file_name), shallow=False)
+        assert not os.path.exists(second.flatten_log_file_path)
+
+        # another yosys version misses
+        new_compiler = YosysCompiler(yosys_path=write_versioned_yosys(work_dir, "2.0"), cache=cache)
+        build_miter(work_dir, "miter_c", new_compiler, verilog_file)
+        assert len(get_launches(work_dir)) == 4
+        assert not new_compiler.last_cache_hit
+
+        # the key does not depend on where the design is
+        moved_file = os.path.join(work_dir, "moved.v")
+        with open(verilog_file) as f, open(moved_file, "w") as g:
+            g.write(f.read())
+        assert yosys_compiler.get_cache_key("flatten", verilog_file, "top") == \
+            yosys_compiler.get_cache_key("flatten", moved_file, "top")
+        assert yosys_compiler.get_cache_key("flatten", verilog_file, "top") != \
+            yosys_compiler.get_cache_key("flatten", verilog_file, "other_top")
+
+
+def main():
+    test_cached_miter_stages()
+    print("✓ yosys cache tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
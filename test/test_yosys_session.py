@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the yosys sessions. A fake yosys logs its invocations, two
+flattens and their AIGER export must not need more than one launch each.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from yosys_compiler import YosysCompiler
+from kairos_pre_processor import KairosPreprocessor
+from helpers import write_fake_yosys
+
+
+def test_two_flattens_in_one_launch():
+    with tempfile.TemporaryDirectory() as work_dir:
+        yosys_path = write_fake_yosys(os.path.join(work_dir, "fake_yosys"), invocations_file="invocations.txt")
+        for i in (1, 2):
+            with open(os.path.join(work_dir, f"design_{i}.v"), "w") as f:
+                f.write(f"module top(input a, output b); assign b = {'a' if i == 1 else '~~a'}; endmodule\n")
+
+        yosys_compiler = YosysCompiler(yosys_path=yosys_path)
+        yosys_compiler.begin_session(work_dir)
+        for i in (1, 2):
+            yosys_compiler.add_flatten(os.path.join(work_dir, f"design_{i}.v"),
+                                       os.path.join(work_dir, f"flat_{i}.v"))
+        script = yosys_compiler.get_session_script()
+        yosys_compiler.run_session(os.path.join(work_dir, "flatten_yosys.log"))
+
+        assert script.count("design -reset") == 1
+        assert script.startswith("read -sv design_1.v; prep -top top; flatten;")
+        with open(os.path.join(work_dir, "invocations.txt")) as f:
+            assert f.read().splitlines() == [script]
+        for i in (1, 2):
+            with open(os.path.join(work_dir, f"flat_{i}.v")) as f, \
+                    open(os.path.join(work_dir, f"design_{i}.v")) as g:
+                assert f.read() == g.read()
+        assert not any(file_name.endswith(".ys") for file_name in os.listdir(work_dir))
+
+        # the session is consumed by the run
+        try:
+            yosys_compiler.run_session(os.path.join(work_dir, "again.log"))
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+
+def test_aiger_script():
+    with tempfile.TemporaryDirectory() as work_dir:
+        verilog_file = os.path.join(work_dir, "miter.v")
+        with open(verilog_file, "w") as f:
+            f.write("module top(input a, output b); assign b = a; endmodule\n")
+        yosys_compiler = YosysCompiler(yosys_path="yosys")
+        yosys_compiler.begin_session(work_dir)
+        yosys_compiler.add_to_aiger(verilog_file, os.path.join(work_dir, "miter.aig"), top_name="kairos_top")
+        assert yosys_compiler.get_session_script().split("; ") == [
+            "read -sv miter.v", "prep -top kairos_top", "flatten", "memory -nordff",
+            "setundef -undriven -init -expose", "techmap", "abc -fast -g AND",
+            "write_aiger -zinit miter.aig"]
+        try:
+            yosys_compiler.add_to_aiger(verilog_file, os.path.join(work_dir, "miter.aag"))
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+
+def test_preprocessor_in_session():
+    with tempfile.TemporaryDirectory() as work_dir:
+        verilog_file = os.path.join(work_dir, "merged_1.v")
+        with open(verilog_file, "w") as f:
+            f.write("module top(input a, output b); assign b = a; endmodule\n")
+        yosys_compiler = YosysCompiler(yosys_path="yosys")
+        kpp = KairosPreprocessor(verilog_file, os.path.join(work_dir, "merged_1_proc.v"),
+                                 work_dir, "top", yosys_compiler=yosys_compiler)
+        yosys_compiler.begin_session(work_dir)
+        kpp.add_flatten(yosys_compiler)
+        assert "write_verilog -noattr -noparallelcase -simple-lhs merged_1_flatten.v" in \
+            yosys_compiler.get_session_script()
+
+
+def main():
+    test_two_flattens_in_one_launch()
+    test_aiger_script()
+    test_preprocessor_in_session()
+    print("✓ yosys session tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
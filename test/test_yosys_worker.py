@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the long-lived yosys workers, run against a fake yosys
+shell reading its commands from stdin.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the src directory to Python path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from yosys_compiler import YosysCompiler
+from yosys_worker import YosysJob, YosysWorker, YosysWorkerPool
+from helpers import write_fake_yosys_worker
+
+
+def get_start_count(work_dir):
+    with open(os.path.join(work_dir, "starts.txt")) as f:
+        return len(f.read().splitlines())
+
+
+def flatten_job(work_dir, i):
+    return YosysJob(command_list=[f"read -sv {work_dir}/design_{i}.v", "prep -top top", "flatten",
+                                  f"write_verilog -noattr {work_dir}/flat_{i}.v"],
+                    log_file_path=os.path.join(work_dir, f"job_{i}.log"))
+
+
+def test_pool_reuses_workers():
+    with tempfile.TemporaryDirectory() as work_dir:
+        yosys_path = write_fake_yosys_worker(work_dir)
+        for i in range(6):
+            with open(os.path.join(work_dir, f"design_{i}.v"), "w") as f:
+                f.write(f"module top; // {i}\nendmodule\n")
+        pool = YosysWorkerPool(worker_count=2, yosys_path=yosys_path)
+        try:
+            results = pool.run_jobs([flatten_job(work_dir, i) for i in range(6)])
+            assert all(result.success for result in results)
+            for i in range(6):
+                with open(os.path.join(work_dir, f"flat_{i}.v")) as f:
+                    assert f"// {i}" in f.read()
+            stats = pool.get_stats()
+            assert stats["jobs"] == 6 and stats["failed_jobs"] == 0
+            assert stats["worker_starts"] <= 2
+            assert get_start_count(work_dir) == stats["worker_starts"]
+            # a later benchmark of the same worker process only counts its own jobs
+            since_stats = pool.get_stats(since=stats)
+            assert since_stats["workers"] == 2 and since_stats["jobs"] == 0 and since_stats["job_elapsed_s"] == 0
+            pool.run_jobs([flatten_job(work_dir, 0)])
+            assert pool.get_stats(since=stats)["jobs"] == 1 and pool.get_stats()["jobs"] == 7
+
+            # a YosysCompiler session runs on the pool with absolute paths
+            yosys_compiler = YosysCompiler(worker_pool=pool)
+            yosys_compiler.begin_session(work_dir)
+            yosys_compiler.add_flatten(os.path.join(work_dir, "design_0.v"), os.path.join(work_dir, "flat_s.v"))
+            assert os.path.join(work_dir, "design_0.v") in yosys_compiler.get_session_script()
+            yosys_compiler.run_session(os.path.join(work_dir, "session.log"))
+            assert os.path.exists(os.path.join(work_dir, "flat_s.v"))
+            assert get_start_count(work_dir) == pool.get_stats()["worker_starts"]
+        finally:
+            pool.close()
+
+
+def test_worker_recovers():
+    with tempfile.TemporaryDirectory() as work_dir:
+        yosys_path = write_fake_yosys_worker(work_dir)
+        with open(os.path.join(work_dir, "design_0.v"), "w") as f:
+            f.write("module top; endmodule\n")
+        worker = YosysWorker(yosys_path=yosys_path, timeout_s=2)
+        try:
+            bad = worker.run_job(YosysJob(["bad"], os.path.join(work_dir, "bad.log")))
+            assert not bad.success and bad.error == "ERROR: bad command" and not bad.crashed
+            crashed = worker.run_job(YosysJob(["crash"], os.path.join(work_dir, "crash.log")))
+            assert not crashed.success and crashed.crashed
+            hung = worker.run_job(YosysJob(["hang"], os.path.join(work_dir, "hang.log")))
+            assert not hung.success and hung.timed_out
+            recovered = worker.run_job(flatten_job(work_dir, 0))
+            assert recovered.success and recovered.elapsed_s < 2
+            assert worker.start_count == 3
+        finally:
+            worker.stop()
+
+
+def main():
+    test_pool_reuses_workers()
+    test_worker_recovers()
+    print("✓ yosys worker tests: PASSED")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())